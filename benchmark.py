@@ -0,0 +1,701 @@
+"""
+Benchmarks do sistema de tarefas.
+Rodam sem interface gráfica, sempre sobre bancos temporários.
+
+Uso:
+    python benchmark.py memoria [--tarefas 100000]
+    python benchmark.py inicio [--tarefas 10000] [--repeticoes 5]
+    python benchmark.py servidor [--tarefas 10000] [--conexoes 16] [--requisicoes 500] [--pipeline 1]
+    python benchmark.py logs [--tarefas 100000]
+    python benchmark.py grupo [--tarefas 10000] [--clientes 16] [--operacoes 200] [--perfil safe]
+    python benchmark.py residente [--tarefas 100000] [--operacoes 500]
+    python benchmark.py busca [--tarefas 1000000] [--operacoes 200] [--dados DIR]
+    python benchmark.py suite [--tamanhos 1000 100000 1000000] [--rodadas 3] [--dados DIR]
+                              [--salvar base.json] [--comparar base.json] [--tolerancia 0.25]
+
+A suíte termina com código 1 quando --comparar aponta regressões.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import logging.handlers
+import queue
+import os
+import random
+import re
+import shutil
+import signal
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+import config
+import controller
+import logs
+import model
+
+logger = logging.getLogger(__name__)
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+# Módulos acompanhados no tempo de importação de main.py
+MODULOS_INICIO = ('main', 'tkinter', 'controller', 'model', 'executor', 'sqlite3', 'ttkthemes')
+
+# Vocabulário dos textos sintéticos, para a busca textual ter termos com frequências variadas
+PALAVRAS = ("comprar pagar enviar revisar agendar ligar organizar estudar limpar consertar "
+            "relatório contas email reunião mercado projeto cliente documento código banco "
+            "pão leite carro casa escola médico viagem planilha apresentação contrato "
+            "amanhã urgente semanal mensal equipe financeiro pessoal trabalho").split()
+TAMANHOS_PADRAO = (1000, 100000, 1000000)
+
+def _tarefas_sinteticas(total: int, semente: int = 42) -> Iterator[tuple]:
+    """Gera (título, descrição) determinísticos para `total` tarefas."""
+    aleatorio = random.Random(semente)
+    for i in range(total):
+        yield (f"{' '.join(aleatorio.choices(PALAVRAS, k=3)).capitalize()} {i}",
+               " ".join(aleatorio.choices(PALAVRAS, k=8)))
+
+def _gerar_banco(total: int) -> None:
+    """Popula o banco atual do model com `total` tarefas sintéticas."""
+    model.criar_tabela()
+    model.adicionar_tarefas_em_lote(_tarefas_sinteticas(total))
+    model.atualizar_status_em_lote(range(1, total + 1, 3), model.Status.CONCLUIDA)
+    with model.conectar() as conn:
+        # Espalha as datas de criação por um minuto entre tarefas, como num uso real
+        conn.execute("UPDATE tarefas SET data_criacao = datetime('now', '-' || (? - id) || ' minutes')",
+                     (total,))
+        conn.commit()
+    # O histórico da geração não interessa a nenhum benchmark
+    model.podar_mudancas(0)
+
+@contextmanager
+def banco_temporario(total: int, nome: str = "bench.db", dados: Optional[str] = None) -> Iterator[str]:
+    """Cria um banco temporário com `total` tarefas sintéticas e aponta o model para ele.
+
+    Com `dados`, o banco gerado é guardado nesse diretório e reaproveitado
+    (copiado) nas próximas execuções, o que poupa minutos no banco de 1M.
+    """
+    diretorio = tempfile.mkdtemp(prefix="tarefas-bench-")
+    caminho = os.path.join(diretorio, nome)
+    salvo = os.path.join(dados, f"tarefas-{total}.db") if dados else None
+    db_original = model.DB_NAME
+    model.DB_NAME = caminho
+    try:
+        if salvo and os.path.exists(salvo):
+            shutil.copyfile(salvo, caminho)
+        else:
+            _gerar_banco(total)
+            if salvo:
+                # Fecha o pool para o WAL ser consolidado no arquivo antes da cópia
+                model.fechar_conexoes()
+                os.makedirs(dados, exist_ok=True)
+                shutil.copyfile(caminho, salvo)
+        yield caminho
+    finally:
+        model.fechar_conexoes()
+        model.DB_NAME = db_original
+        shutil.rmtree(diretorio, ignore_errors=True)
+
+def _memoria_retida(carregar: Callable[[], list]) -> int:
+    """Bytes alocados e ainda retidos pelo resultado de `carregar`."""
+    tracemalloc.start()
+    try:
+        resultado = carregar()
+        retidos, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return retidos
+
+def medir_memoria(total: int) -> dict:
+    """Compara a memória de uma listagem completa como sqlite3.Row e como Tarefa."""
+    with banco_temporario(total) as caminho:
+        def carregar_rows() -> list:
+            conn = sqlite3.connect(caminho)
+            conn.row_factory = sqlite3.Row
+            try:
+                return conn.execute(
+                    f"SELECT {model.COLUNAS_TAREFA} FROM tarefas ORDER BY data_criacao DESC, id DESC"
+                ).fetchall()
+            finally:
+                conn.close()
+
+        bytes_rows = _memoria_retida(carregar_rows)
+        bytes_tarefas = _memoria_retida(model.listar_tarefas)
+
+    por_100k = 100000 / total
+    return {
+        'tarefas': total,
+        'sqlite3.Row_bytes_por_100k': round(bytes_rows * por_100k),
+        'Tarefa_bytes_por_100k': round(bytes_tarefas * por_100k),
+        'reducao': round(1 - bytes_tarefas / bytes_rows, 3),
+    }
+
+def _tempos_importacao() -> Dict[str, float]:
+    """Tempo cumulativo de importação (ms) dos módulos de MODULOS_INICIO, via -X importtime."""
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                              cwd=DIRETORIO, capture_output=True, text=True)
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:"):
+            continue
+        partes = linha[len("import time:"):].split("|")
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue
+        modulo = partes[2].strip()
+        if modulo in MODULOS_INICIO:
+            tempos[modulo] = int(partes[1]) / 1000
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar main: {processo.stderr.strip().splitlines()[-1]}")
+    return tempos
+
+def _marcos_janela(caminho: str) -> Dict[str, float]:
+    """Abre a interface sobre o banco em `caminho` e devolve os marcos da inicialização."""
+    ambiente = dict(os.environ, TAREFAS_MEDIR_INICIO="1",
+                    PYTHONPATH=os.pathsep.join(filter(None, [DIRETORIO, os.environ.get("PYTHONPATH")])))
+    inicio = time.perf_counter()
+    # model.DB_NAME é relativo ao diretório de trabalho
+    processo = subprocess.run([sys.executable, os.path.join(DIRETORIO, "main.py")],
+                              cwd=os.path.dirname(caminho), env=ambiente,
+                              capture_output=True, text=True, timeout=60)
+    total = (time.perf_counter() - inicio) * 1000
+    linhas = processo.stdout.strip().splitlines()
+    if processo.returncode != 0 or not linhas:
+        raise RuntimeError(f"Falha ao abrir a interface: {processo.stderr.strip()}")
+    marcos = json.loads(linhas[-1])
+    marcos['processo'] = round(total, 1)
+    return marcos
+
+def _mediana(medicoes: list) -> Dict[str, float]:
+    return {chave: round(statistics.median(m[chave] for m in medicoes), 3)
+            for chave in medicoes[0] if all(chave in m for m in medicoes)}
+
+def medir_inicio(total: int, repeticoes: int) -> dict:
+    """Mediana do tempo de importação e, com display, dos marcos até a primeira página."""
+    resultado = {'repeticoes': repeticoes,
+                 'importacao_ms': _mediana([_tempos_importacao() for _ in range(repeticoes)])}
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        resultado['janela_ms'] = None
+        resultado['aviso'] = "sem DISPLAY: tempo até a primeira pintura não medido"
+        return resultado
+    # Mesmo nome que a aplicação usa, no diretório de trabalho do processo filho
+    with banco_temporario(total, os.path.basename(model.DB_NAME)) as caminho:
+        # Fecha o pool para o WAL ser consolidado antes de o processo filho abrir o banco
+        model.fechar_conexoes()
+        resultado['tarefas'] = total
+        resultado['janela_ms'] = _mediana([_marcos_janela(caminho) for _ in range(repeticoes)])
+    return resultado
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+def _requisicoes_carga(total_tarefas: int, quantidade: int, semente: int) -> list:
+    """Mistura de requisições: listagem, leitura por id, contagem e inserção."""
+    aleatorio = random.Random(semente)
+    requisicoes = []
+    for _ in range(quantidade):
+        sorteio = aleatorio.random()
+        if sorteio < 0.5:
+            requisicoes.append(("GET", "/tarefas?limite=50", b""))
+        elif sorteio < 0.8:
+            requisicoes.append(("GET", f"/tarefas/{aleatorio.randint(1, total_tarefas)}", b""))
+        elif sorteio < 0.9:
+            requisicoes.append(("GET", "/contagem", b""))
+        else:
+            requisicoes.append(("POST", "/tarefas", b'{"titulo": "Tarefa de carga"}'))
+    return requisicoes
+
+async def _cliente_carga(porta: int, requisicoes: list, pipeline: int, latencias: list) -> None:
+    """Envia as requisições por uma conexão persistente, `pipeline` de cada vez."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+    try:
+        for inicio in range(0, len(requisicoes), pipeline):
+            lote = requisicoes[inicio:inicio + pipeline]
+            enviado = time.perf_counter()
+            writer.write(b"".join(
+                f"{metodo} {alvo} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(corpo)}\r\n\r\n".encode()
+                + corpo for metodo, alvo, corpo in lote))
+            await writer.drain()
+            for _ in lote:
+                cabecalho = await reader.readuntil(b"\r\n\r\n")
+                if not cabecalho.startswith((b"HTTP/1.1 2")):
+                    raise RuntimeError(f"Resposta inesperada: {cabecalho.splitlines()[0]!r}")
+                tamanho = int(re.search(rb"Content-Length: (\d+)", cabecalho).group(1))
+                await reader.readexactly(tamanho)
+                latencias.append(time.perf_counter() - enviado)
+    finally:
+        writer.close()
+
+async def _gerar_carga(porta: int, total_tarefas: int, conexoes: int, por_conexao: int,
+                       pipeline: int) -> dict:
+    latencias: list = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _cliente_carga(porta, _requisicoes_carga(total_tarefas, por_conexao, semente), pipeline, latencias)
+        for semente in range(conexoes)))
+    duracao = time.perf_counter() - inicio
+    return {
+        'requisicoes': len(latencias),
+        'requisicoes_por_segundo': round(len(latencias) / duracao, 1),
+        'p50_ms': round(_percentil(latencias, 0.50) * 1000, 2),
+        'p99_ms': round(_percentil(latencias, 0.99) * 1000, 2),
+    }
+
+def medir_servidor(total: int, conexoes: int, por_conexao: int, pipeline: int) -> dict:
+    """Teste de carga do servidor HTTP, rodando em outro processo sobre um banco temporário."""
+    with banco_temporario(total) as caminho:
+        model.fechar_conexoes()
+        processo = subprocess.Popen(
+            [sys.executable, os.path.join(DIRETORIO, "servidor.py"), "--banco", caminho, "--porta", "0"],
+            stdout=subprocess.PIPE, text=True)
+        try:
+            # A primeira linha da saída padrão anuncia o endereço; os logs vão para stderr
+            linha = processo.stdout.readline()
+            encontrado = re.search(r":(\d+)$", linha.strip())
+            if encontrado is None:
+                raise RuntimeError("Servidor não iniciou")
+            resultado = asyncio.run(_gerar_carga(int(encontrado.group(1)), total, conexoes,
+                                                 por_conexao, pipeline))
+        finally:
+            processo.send_signal(signal.SIGINT if os.name == "posix" else signal.SIGTERM)
+            processo.wait(timeout=30)
+    return {'tarefas': total, 'conexoes': conexoes, 'pipeline': pipeline, **resultado}
+
+# Operação -> função equivalente em cada camada
+OPERACOES = {
+    'model': {
+        'obter': model.buscar_tarefa_por_id,
+        'listar': model.listar_tarefas_pagina,
+        'listar_profunda': model.listar_tarefas_pagina,
+        'buscar': model.buscar_tarefas,
+        'atualizar': model.atualizar_tarefa,
+        'inserir': model.adicionar_tarefa,
+        'deletar': model.deletar_tarefa,
+    },
+    'controller': {
+        'obter': controller.buscar_tarefa,
+        'listar': controller.listar_pagina,
+        'listar_cache': controller.listar_pagina,
+        'listar_profunda': controller.listar_pagina,
+        'buscar': controller.buscar_tarefas,
+        'atualizar': controller.editar_tarefa,
+        'inserir': controller.adicionar_tarefa,
+        'deletar': controller.deletar,
+    },
+}
+
+def _paginas(quantidade: int, tamanho_pagina: int) -> List[tuple]:
+    """Argumentos de `quantidade` páginas seguidas da listagem, cada uma com o
+    cursor devolvido pela anterior; no fim da listagem recomeça do topo."""
+    paginas, apos = [], None
+    for _ in range(quantidade):
+        paginas.append((tamanho_pagina, apos))
+        _, apos = model.listar_tarefas_pagina(tamanho_pagina, apos)
+    return paginas
+
+def _argumentos(total: int, operacoes: int, semente: int) -> Dict[str, List[tuple]]:
+    """Argumentos determinísticos de cada operação sobre um banco de `total` tarefas.
+
+    As exclusões vêm por último na execução e usam IDs que nenhuma outra
+    operação toca, para todas encontrarem as tarefas que procuram.
+    """
+    aleatorio = random.Random(semente)
+    n = min(operacoes, max(1, total // 4))
+    deletar = aleatorio.sample(range(1, total + 1), n)
+    restantes = set(deletar)
+    ids = [id for id in (aleatorio.randint(1, total) for _ in range(4 * n)) if id not in restantes][:n]
+    por_id = {tarefa.id: tarefa for tarefa in model.buscar_tarefas_por_ids(ids)}
+    cursores = [(por_id[id].data_criacao, id) for id in ids]
+    tamanho_pagina = config.DATABASE_CONFIG['page_size']
+    return {
+        'obter': [(id,) for id in ids],
+        'listar': _paginas(n, tamanho_pagina),
+        'listar_profunda': [(tamanho_pagina, cursor) for cursor in cursores],
+        'buscar': [(aleatorio.choice(PALAVRAS),) for _ in range(n)],
+        'atualizar': [(id, *texto) for id, texto in zip(ids, _tarefas_sinteticas(n, semente + 1))],
+        'inserir': list(_tarefas_sinteticas(n, semente + 2)),
+        'deletar': [(id,) for id in deletar],
+    }
+
+def _medir(funcao: Callable, argumentos: List[tuple]) -> dict:
+    """Vazão e latência de chamadas sequenciais de `funcao`."""
+    latencias = []
+    inicio = time.perf_counter()
+    for args in argumentos:
+        antes = time.perf_counter()
+        funcao(*args)
+        latencias.append(time.perf_counter() - antes)
+    duracao = time.perf_counter() - inicio
+    return {
+        'operacoes': len(latencias),
+        'ops_por_segundo': round(len(latencias) / duracao, 1),
+        'p50_ms': round(_percentil(latencias, 0.50) * 1000, 3),
+        'p99_ms': round(_percentil(latencias, 0.99) * 1000, 3),
+    }
+
+def _medir_camada(caminho: str, total: int, camada: str, operacoes: int, semente: int) -> Dict[str, dict]:
+    """Mede todas as operações de uma camada sobre uma cópia nova do banco em `caminho`."""
+    copia = os.path.join(os.path.dirname(caminho), f"{camada}.db")
+    shutil.copyfile(caminho, copia)
+    controller.usar_banco(copia)
+    try:
+        argumentos = _argumentos(total, operacoes, semente)
+        # Aquece conexões do pool e cache de páginas do SQLite com algumas leituras
+        for op in ('obter', 'listar_profunda', 'buscar'):
+            for args in argumentos[op][:10]:
+                OPERACOES['model'][op](*args)
+        # Só as páginas que cabem no cache, repetidas: cada chamada é um acerto
+        cabem = argumentos['listar'][:config.CACHE_CONFIG['max_pages']]
+        argumentos['listar_cache'] = [cabem[i % len(cabem)] for i in range(len(argumentos['listar']))]
+        medidas = {}
+        for op, funcao in OPERACOES[camada].items():
+            if op == 'listar':
+                # Sem o cache do controller, toda página vem do banco
+                controller.configurar_cache(False)
+                try:
+                    medidas[op] = _medir(funcao, argumentos[op])
+                finally:
+                    controller.configurar_cache(config.CACHE_CONFIG['enabled'])
+                continue
+            if op == 'listar_cache':
+                for args in cabem:
+                    funcao(*args)
+            medidas[op] = _medir(funcao, argumentos[op])
+        return medidas
+    finally:
+        controller.finalizar()
+        os.remove(copia)
+
+def executar_suite(tamanhos: List[int], operacoes: int, rodadas: int, semente: int,
+                   dados: Optional[str]) -> dict:
+    """Mede cada operação em cada camada e tamanho de banco.
+
+    Cada rodada começa de uma cópia nova do banco sintético; o resultado de
+    cada métrica é a mediana das rodadas, o que reduz bastante o ruído.
+    """
+    resultados = {}
+    for total in tamanhos:
+        with banco_temporario(total, dados=dados) as caminho:
+            model.fechar_conexoes()
+            resultados[str(total)] = por_camada = {}
+            for camada in OPERACOES:
+                medidas = [_medir_camada(caminho, total, camada, operacoes, semente) for _ in range(rodadas)]
+                por_camada[camada] = {op: _mediana([medida[op] for medida in medidas])
+                                      for op in OPERACOES[camada]}
+    return {
+        'ambiente': {
+            'python': sys.version.split()[0],
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': sys.platform,
+            'perfil_armazenamento': config.DATABASE_CONFIG['storage_profile'],
+            'cache': config.CACHE_CONFIG['enabled'],
+            'semente': semente,
+            'rodadas': rodadas,
+        },
+        'resultados': resultados,
+    }
+
+def comparar(atual: dict, base: dict, tolerancia: float) -> tuple:
+    """Compara dois resultados da suíte.
+
+    Retorna a razão atual/base de cada métrica e a lista de regressões:
+    vazão abaixo ou latência mediana acima da base por mais que `tolerancia`.
+    O p99 é comparado mas não aponta regressão: com poucas centenas de
+    chamadas ele oscila demais entre execuções.
+    """
+    comparacao, regressoes = {}, []
+    for total, camadas in atual['resultados'].items():
+        for camada, operacoes in camadas.items():
+            for op, medida in operacoes.items():
+                anterior = base.get('resultados', {}).get(total, {}).get(camada, {}).get(op)
+                if not anterior:
+                    continue
+                razoes = {metrica: round(medida[metrica] / anterior[metrica], 3) if anterior[metrica] else 1.0
+                          for metrica in ('ops_por_segundo', 'p50_ms', 'p99_ms')}
+                comparacao.setdefault(total, {}).setdefault(camada, {})[op] = razoes
+                if razoes['ops_por_segundo'] < 1 - tolerancia or razoes['p50_ms'] > 1 + tolerancia:
+                    regressoes.append(f"{total}/{camada}/{op}: vazão x{razoes['ops_por_segundo']:.2f}, "
+                                      f"p50 x{razoes['p50_ms']:.2f}")
+    return comparacao, regressoes
+
+# Modos de log comparados: (nível da raiz, fila?, mensagens no formato antigo?)
+MODOS_LOG = {
+    # Como antes: f-strings em INFO a cada operação, escritas na thread que chama
+    'antigo_fstring_info': (logging.INFO, False, True),
+    # Mensagens por operação em DEBUG com argumentos %, nível INFO: nada é formatado
+    'atual_info': (logging.INFO, True, False),
+    # Atual com DEBUG ligado: cada operação é registrada, mas a escrita vai para a fila
+    'atual_debug_fila': (logging.DEBUG, True, False),
+}
+
+@contextmanager
+def _modo_log(nivel: int, fila: bool, caminho: str) -> Iterator[None]:
+    """Troca temporariamente os handlers da raiz por um arquivo, direto ou via fila."""
+    raiz = logging.getLogger()
+    handlers, nivel_original = raiz.handlers[:], raiz.level
+    destino = logging.FileHandler(caminho, encoding="utf-8")
+    destino.setFormatter(logging.Formatter(config.LOGGING_CONFIG['format']))
+    ouvinte = None
+    if fila:
+        fila_registros = queue.SimpleQueue()
+        ouvinte = logging.handlers.QueueListener(fila_registros, destino)
+        ouvinte.start()
+        novo = logging.handlers.QueueHandler(fila_registros)
+    else:
+        novo = destino
+    raiz.handlers = [novo]
+    raiz.setLevel(nivel)
+    try:
+        yield
+    finally:
+        if ouvinte is not None:
+            ouvinte.stop()
+        destino.close()
+        raiz.handlers = handlers
+        raiz.setLevel(nivel_original)
+
+def _inserir_com_log_antigo(titulo: str, descricao: str) -> int:
+    """adicionar_tarefa seguido da mensagem por operação como era registrada antes."""
+    task_id = model.adicionar_tarefa(titulo, descricao)
+    model.logger.info(f"Tarefa adicionada com ID: {task_id}")
+    return task_id
+
+def medir_logs(total: int) -> dict:
+    """Custo do log em `total` inserções individuais, em cada modo de MODOS_LOG e sem log."""
+    resultado = {'tarefas': total}
+    modos = {'sem_log': (logging.CRITICAL, False, False), **MODOS_LOG}
+    for modo, (nivel, fila, antigo) in modos.items():
+        with banco_temporario(0) as caminho:
+            inserir = _inserir_com_log_antigo if antigo else model.adicionar_tarefa
+            with _modo_log(nivel, fila, caminho + ".log"):
+                inicio = time.perf_counter()
+                for titulo, descricao in _tarefas_sinteticas(total):
+                    inserir(titulo, descricao)
+                duracao = time.perf_counter() - inicio
+            resultado[modo] = {'segundos': round(duracao, 3),
+                               'us_por_insercao': round(duracao / total * 1e6, 2)}
+    base = resultado['sem_log']['segundos']
+    for modo in MODOS_LOG:
+        resultado[modo]['sobrecusto'] = round(resultado[modo]['segundos'] / base - 1, 3)
+    return resultado
+
+def _escritas_cliente(total: int, quantidade: int, semente: int) -> List[tuple]:
+    """Escritas de um cliente: alternância de status e inserções, meio a meio."""
+    aleatorio = random.Random(semente)
+    escritas = []
+    for i in range(quantidade):
+        if i % 2:
+            escritas.append((controller.adicionar_tarefa, f"Carga {semente}-{i}", ""))
+        else:
+            status = aleatorio.choice((controller.Status.PENDENTE, controller.Status.CONCLUIDA))
+            escritas.append((controller.atualizar_status, aleatorio.randint(1, total), status))
+    return escritas
+
+def _medir_escritas(total: int, clientes: int, operacoes: int, em_grupo: bool) -> dict:
+    """Executa as escritas de `clientes` threads e mede vazão, latência e commits."""
+    latencias: List[float] = []
+    lock = threading.Lock()
+
+    def cliente(semente: int) -> None:
+        proprias = []
+        for funcao, *args in _escritas_cliente(total, operacoes, semente):
+            inicio = time.perf_counter()
+            if em_grupo:
+                controller.submeter(funcao, *args).result()
+            else:
+                funcao(*args)
+            proprias.append((time.perf_counter() - inicio) * 1000)
+        with lock:
+            latencias.extend(proprias)
+
+    threads = [threading.Thread(target=cliente, args=(semente,)) for semente in range(clientes)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duracao = time.perf_counter() - inicio
+    # Sem grupo cada escrita do model faz o próprio commit
+    commits = controller.escrita_em_grupo_estatisticas()['commits'] if em_grupo else len(latencias)
+    return {
+        'operacoes': len(latencias),
+        'segundos': round(duracao, 3),
+        'operacoes_por_s': round(len(latencias) / duracao, 1),
+        'commits': commits,
+        'commits_por_s': round(commits / duracao, 1),
+        'p50_ms': round(_percentil(latencias, 0.50), 3),
+        'p99_ms': round(_percentil(latencias, 0.99), 3),
+    }
+
+def medir_grupo(total: int, clientes: int, operacoes: int, perfil: str) -> dict:
+    """Compara escritas concorrentes com um commit por operação e com escrita em grupo."""
+    resultado = {'tarefas': total, 'clientes': clientes, 'perfil': perfil,
+                 'janela_ms': config.GROUP_COMMIT_CONFIG['window_ms'],
+                 'max_ops': config.GROUP_COMMIT_CONFIG['max_ops']}
+    perfil_original = config.DATABASE_CONFIG['storage_profile']
+    config.DATABASE_CONFIG['storage_profile'] = perfil
+    try:
+        for modo, em_grupo in (('direto', False), ('grupo', True)):
+            with banco_temporario(total):
+                if em_grupo:
+                    controller.configurar_escrita_em_grupo(True)
+                try:
+                    resultado[modo] = _medir_escritas(total, clientes, operacoes, em_grupo)
+                finally:
+                    controller.configurar_escrita_em_grupo(False)
+    finally:
+        config.DATABASE_CONFIG['storage_profile'] = perfil_original
+    resultado['ganho_vazao'] = round(resultado['grupo']['operacoes_por_s'] /
+                                     resultado['direto']['operacoes_por_s'], 2)
+    return resultado
+
+def medir_residente(total: int, operacoes: int, semente: int = 42) -> dict:
+    """Latência das operações do model com o banco em disco e carregado em memória."""
+    resultado = {'tarefas': total}
+    memoria_original = model.MEMORIA
+    try:
+        for modo, memoria in (('disco', False), ('memoria', True)):
+            with banco_temporario(total):
+                model.fechar_conexoes()
+                model.MEMORIA = memoria
+                # A primeira conexão aberta é a que copia o arquivo para a memória
+                inicio = time.perf_counter()
+                model.versao_schema()
+                abertura = time.perf_counter() - inicio
+                argumentos = _argumentos(total, operacoes, semente)
+                for op in ('obter', 'listar_profunda', 'buscar'):
+                    for args in argumentos[op][:10]:
+                        OPERACOES['model'][op](*args)
+                resultado[modo] = {op: _medir(funcao, argumentos[op])
+                                   for op, funcao in OPERACOES['model'].items()}
+                resultado[modo]['abertura_ms'] = round(abertura * 1000, 1)
+                if memoria:
+                    inicio = time.perf_counter()
+                    model.salvar_snapshot()
+                    resultado[modo]['snapshot_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+                model.fechar_conexoes()
+                model.MEMORIA = memoria_original
+    finally:
+        model.MEMORIA = memoria_original
+    resultado['ganho_p50'] = {op: round(resultado['disco'][op]['p50_ms'] / resultado['memoria'][op]['p50_ms'], 2)
+                              for op in OPERACOES['model'] if resultado['memoria'][op]['p50_ms']}
+    return resultado
+
+# Meta de latência da busca (p50) no banco de 1M tarefas
+META_BUSCA_MS = 10.0
+
+def _consultas_busca(total: int, quantidade: int, semente: int) -> Dict[str, List[tuple]]:
+    """Consultas de cada tipo: prefixos indexados, palavras inteiras, duas palavras e números."""
+    aleatorio = random.Random(semente)
+    return {
+        'prefixo_curto': [(aleatorio.choice(PALAVRAS)[:aleatorio.choice((2, 3))],) for _ in range(quantidade)],
+        'palavra': [(aleatorio.choice(PALAVRAS),) for _ in range(quantidade)],
+        'duas_palavras': [(" ".join(aleatorio.sample(PALAVRAS, 2)),) for _ in range(quantidade)],
+        'numero': [(str(aleatorio.randint(1, total)),) for _ in range(quantidade)],
+    }
+
+def medir_busca(total: int, operacoes: int, dados: Optional[str], semente: int = 42) -> dict:
+    """Latência de model.buscar_tarefas por tipo de consulta, comparada à meta de 10 ms.
+
+    Cada palavra do vocabulário sintético aparece em cerca de um quarto das
+    tarefas, o pior caso para as listas do índice.
+    """
+    resultado = {'tarefas': total, 'meta_p50_ms': META_BUSCA_MS}
+    with banco_temporario(total, dados=dados):
+        consultas = _consultas_busca(total, operacoes, semente)
+        for argumentos in consultas.values():
+            for args in argumentos[:10]:
+                model.buscar_tarefas(*args)
+        for tipo, argumentos in consultas.items():
+            resultado[tipo] = _medir(model.buscar_tarefas, argumentos)
+            resultado[tipo]['dentro_da_meta'] = resultado[tipo]['p50_ms'] <= META_BUSCA_MS
+    return resultado
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do sistema de tarefas")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    memoria = comandos.add_parser("memoria", help="memória por 100k tarefas listadas")
+    memoria.add_argument("--tarefas", type=int, default=100000)
+
+    inicio = comandos.add_parser("inicio", help="importação e tempo até a primeira pintura")
+    inicio.add_argument("--tarefas", type=int, default=10000)
+    inicio.add_argument("--repeticoes", type=int, default=5)
+
+    servidor = comandos.add_parser("servidor", help="latência e vazão do servidor HTTP")
+    servidor.add_argument("--tarefas", type=int, default=10000)
+    servidor.add_argument("--conexoes", type=int, default=16)
+    servidor.add_argument("--requisicoes", type=int, default=500, help="requisições por conexão")
+    servidor.add_argument("--pipeline", type=int, default=1, help="requisições enviadas sem esperar resposta")
+
+    suite = comandos.add_parser("suite", help="vazão e latência das operações do model e do controller")
+    suite.add_argument("--tamanhos", type=int, nargs="+", default=list(TAMANHOS_PADRAO),
+                       help="tarefas de cada banco sintético")
+    suite.add_argument("--operacoes", type=int, default=500, help="chamadas medidas por operação")
+    suite.add_argument("--rodadas", type=int, default=3, help="repetições, das quais vale a mediana")
+    suite.add_argument("--semente", type=int, default=42)
+    suite.add_argument("--dados", help="diretório onde os bancos gerados são guardados e reaproveitados")
+    suite.add_argument("--salvar", help="grava o resultado em JSON, para servir de base")
+    suite.add_argument("--comparar", help="resultado JSON usado como base de comparação")
+    suite.add_argument("--tolerancia", type=float, default=0.25,
+                       help="variação aceita antes de apontar regressão (0.25 = 25%%)")
+
+    log = comandos.add_parser("logs", help="custo do log por operação em inserções individuais")
+    log.add_argument("--tarefas", type=int, default=100000)
+
+    grupo = comandos.add_parser("grupo", help="escritas concorrentes com e sem escrita em grupo")
+    grupo.add_argument("--tarefas", type=int, default=10000)
+    grupo.add_argument("--clientes", type=int, default=16, help="threads escrevendo ao mesmo tempo")
+    grupo.add_argument("--operacoes", type=int, default=200, help="escritas por cliente")
+    grupo.add_argument("--perfil", choices=list(config.STORAGE_PROFILES), default="safe",
+                       help="perfil de armazenamento (safe faz fsync a cada commit)")
+
+    residente = comandos.add_parser("residente", help="latência com o banco em disco e em memória")
+    residente.add_argument("--tarefas", type=int, default=100000)
+    residente.add_argument("--operacoes", type=int, default=500, help="chamadas medidas por operação")
+
+    busca = comandos.add_parser("busca", help="latência da busca textual por tipo de consulta")
+    busca.add_argument("--tarefas", type=int, default=1000000)
+    busca.add_argument("--operacoes", type=int, default=200, help="buscas medidas por tipo de consulta")
+    busca.add_argument("--dados", help="diretório onde o banco gerado é guardado e reaproveitado")
+
+    args = parser.parse_args()
+    logs.configurar_logs(logging.WARNING)
+
+    if args.comando == "memoria":
+        resultado = medir_memoria(args.tarefas)
+    elif args.comando == "inicio":
+        resultado = medir_inicio(args.tarefas, args.repeticoes)
+    elif args.comando == "servidor":
+        resultado = medir_servidor(args.tarefas, args.conexoes, args.requisicoes, args.pipeline)
+    elif args.comando == "logs":
+        resultado = medir_logs(args.tarefas)
+    elif args.comando == "grupo":
+        resultado = medir_grupo(args.tarefas, args.clientes, args.operacoes, args.perfil)
+    elif args.comando == "residente":
+        resultado = medir_residente(args.tarefas, args.operacoes)
+    elif args.comando == "busca":
+        resultado = medir_busca(args.tarefas, args.operacoes, args.dados)
+    elif args.comando == "suite":
+        resultado = executar_suite(args.tamanhos, args.operacoes, args.rodadas, args.semente, args.dados)
+        if args.salvar:
+            with open(args.salvar, "w", encoding="utf-8") as arquivo:
+                json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as arquivo:
+                resultado['comparacao'], resultado['regressoes'] = comparar(
+                    resultado, json.load(arquivo), args.tolerancia)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    return 1 if resultado.get('regressoes') else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Interface de linha de comando do sistema de tarefas.
+Não importa tkinter: pode ser usada em scripts e servidores sem display.
+
+Uso:
+    python -m cli [--banco ARQUIVO] add "Título" [-d "Descrição"]
+    python -m cli list [--status pendente] [--limite 20] [--formato texto|jsonl|csv] [--arquivadas]
+    python -m cli done ID [ID ...]
+    python -m cli rm ID [ID ...]
+    python -m cli import ARQUIVO [--formato jsonl|csv]
+    python -m cli export ARQUIVO [--formato jsonl|csv] [--status concluida] [--arquivadas]
+    python -m cli archive [--dias 30]
+
+Use "-" como ARQUIVO para ler da entrada padrão ou escrever na saída padrão.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from typing import IO, Iterable, Iterator, List, Optional
+
+import config
+import controller
+import logs
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_CSV = ['id', 'titulo', 'descricao', 'status', 'data_criacao', 'data_atualizacao', 'versao']
+
+@contextmanager
+def _abrir(caminho: str, modo: str) -> Iterator[IO]:
+    """Abre um arquivo de texto, tratando "-" como stdin/stdout."""
+    if caminho == "-":
+        yield sys.stdin if "r" in modo else sys.stdout
+        return
+    with open(caminho, modo, encoding="utf-8", newline="") as arquivo:
+        yield arquivo
+
+def _formato(caminho: str, formato: Optional[str]) -> str:
+    """Formato explícito ou deduzido pela extensão do arquivo."""
+    if formato:
+        return formato
+    return "csv" if caminho.lower().endswith(".csv") else "jsonl"
+
+def _ler_registros(arquivo: IO, formato: str) -> Iterator[dict]:
+    """Lê registros de tarefa um a um, sem carregar o arquivo inteiro."""
+    if formato == "csv":
+        yield from csv.DictReader(arquivo)
+        return
+    for numero, linha in enumerate(arquivo, start=1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield json.loads(linha)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Linha {numero} não é um JSON válido: {e}")
+
+def _escrever_registros(tarefas: Iterable[controller.Tarefa], arquivo: IO, formato: str) -> int:
+    """Escreve as tarefas em JSONL, CSV ou texto, uma por vez."""
+    total = 0
+    if formato == "csv":
+        escritor = csv.DictWriter(arquivo, fieldnames=CAMPOS_CSV)
+        escritor.writeheader()
+        for tarefa in tarefas:
+            escritor.writerow(tarefa.como_dict())
+            total += 1
+    elif formato == "jsonl":
+        for tarefa in tarefas:
+            arquivo.write(json.dumps(tarefa.como_dict(), ensure_ascii=False) + "\n")
+            total += 1
+    else:
+        for tarefa in tarefas:
+            arquivo.write(f"{tarefa.id:>6}  [{tarefa.status.rotulo:<9}]  {tarefa.titulo}"
+                          f"{' - ' + tarefa.descricao if tarefa.descricao else ''}\n")
+            total += 1
+    return total
+
+def importar(registros: Iterable[dict], tamanho_lote: int) -> int:
+    """Importa registros em transações de `tamanho_lote` tarefas, em memória constante."""
+    registros = iter(registros)
+    total = 0
+    while True:
+        bloco = list(islice(registros, tamanho_lote))
+        if not bloco:
+            return total
+        # Cada bloco é um único INSERT, já com o status de cada tarefa
+        ids = controller.adicionar_tarefas_em_lote(
+            [(registro.get('titulo') or "", registro.get('descricao') or "", registro.get('status'))
+             for registro in bloco],
+            tamanho_lote)
+        total += len(ids)
+
+def _cmd_add(args) -> int:
+    print(controller.adicionar_tarefa(args.titulo, args.descricao))
+    return 0
+
+def _cmd_list(args) -> int:
+    tarefas = controller.iterar(status=args.status, incluir_arquivadas=args.arquivadas)
+    if args.limite:
+        tarefas = islice(tarefas, args.limite)
+    _escrever_registros(tarefas, sys.stdout, args.formato)
+    return 0
+
+def _nao_encontradas(ids: List[int]) -> int:
+    """Avisa na saída de erro os IDs sem tarefa e retorna o código de saída."""
+    if not ids:
+        return 0
+    print(f"Tarefa(s) não encontrada(s): {', '.join(map(str, ids))}", file=sys.stderr)
+    return 1
+
+def _cmd_done(args) -> int:
+    ids = list(dict.fromkeys(args.ids))
+    afetadas = controller.atualizar_status_em_lote(ids, controller.Status.CONCLUIDA)
+    print(f"{afetadas} tarefa(s) concluída(s)")
+    if afetadas == len(ids):
+        return 0
+    # As que não mudaram podem já estar concluídas
+    return _nao_encontradas([id for id in ids if controller.buscar_tarefa(id) is None])
+
+def _cmd_rm(args) -> int:
+    ids = list(dict.fromkeys(args.ids))
+    afetadas = controller.deletar_em_lote(ids)
+    print(f"{afetadas} tarefa(s) excluída(s)")
+    if afetadas == len(ids):
+        return 0
+    return _nao_encontradas([id for id in ids if controller.buscar_tarefa(id) is None])
+
+def _cmd_import(args) -> int:
+    with _abrir(args.arquivo, "r") as arquivo:
+        total = importar(_ler_registros(arquivo, _formato(args.arquivo, args.formato)), args.lote)
+    print(f"{total} tarefa(s) importada(s)", file=sys.stderr)
+    return 0
+
+def _cmd_export(args) -> int:
+    with _abrir(args.arquivo, "w") as arquivo:
+        total = _escrever_registros(controller.iterar(args.lote, args.status, args.arquivadas), arquivo,
+                                    _formato(args.arquivo, args.formato))
+    print(f"{total} tarefa(s) exportada(s)", file=sys.stderr)
+    return 0
+
+def _cmd_archive(args) -> int:
+    print(f"{controller.arquivar_concluidas(args.dias)} tarefa(s) arquivada(s)")
+    return 0
+
+def criar_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Gerencia tarefas sem interface gráfica")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra os logs de operação")
+    parser.add_argument("--banco", help="arquivo do banco SQLite (padrão: database.db)")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    lote_padrao = config.DATABASE_CONFIG['batch_size']
+    status = list(config.VALID_STATUSES)
+
+    add = comandos.add_parser("add", help="adiciona uma tarefa")
+    add.add_argument("titulo")
+    add.add_argument("-d", "--descricao", default="")
+    add.set_defaults(funcao=_cmd_add)
+
+    listar = comandos.add_parser("list", help="lista as tarefas, das mais recentes para as mais antigas")
+    listar.add_argument("--status", choices=status)
+    listar.add_argument("--limite", type=int)
+    listar.add_argument("--formato", choices=["texto", "jsonl", "csv"], default="texto")
+    listar.add_argument("--arquivadas", action="store_true", help="inclui as tarefas arquivadas")
+    listar.set_defaults(funcao=_cmd_list)
+
+    done = comandos.add_parser("done", help="marca tarefas como concluídas")
+    done.add_argument("ids", type=int, nargs="+")
+    done.set_defaults(funcao=_cmd_done)
+
+    rm = comandos.add_parser("rm", help="exclui tarefas")
+    rm.add_argument("ids", type=int, nargs="+")
+    rm.set_defaults(funcao=_cmd_rm)
+
+    importar_ = comandos.add_parser("import", help="importa tarefas de JSONL ou CSV")
+    importar_.add_argument("arquivo")
+    importar_.add_argument("--formato", choices=["jsonl", "csv"])
+    importar_.add_argument("--lote", type=int, default=lote_padrao, help="tarefas por transação")
+    importar_.set_defaults(funcao=_cmd_import)
+
+    exportar = comandos.add_parser("export", help="exporta tarefas para JSONL ou CSV")
+    exportar.add_argument("arquivo")
+    exportar.add_argument("--formato", choices=["jsonl", "csv"])
+    exportar.add_argument("--status", choices=status)
+    exportar.add_argument("--lote", type=int, default=lote_padrao, help="linhas lidas por vez")
+    exportar.add_argument("--arquivadas", action="store_true", help="inclui as tarefas arquivadas")
+    exportar.set_defaults(funcao=_cmd_export)
+
+    arquivar = comandos.add_parser("archive", help="arquiva as tarefas concluídas antigas")
+    arquivar.add_argument("--dias", type=int, default=config.ARCHIVE_CONFIG['age_days'],
+                          help="idade mínima, em dias sem alteração")
+    arquivar.set_defaults(funcao=_cmd_archive)
+
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal da linha de comando."""
+    args = criar_parser().parse_args(argv)
+    logs.configurar_logs(logging.DEBUG if args.verbose else logging.WARNING)
+    if args.banco:
+        controller.usar_banco(args.banco)
+    try:
+        controller.inicializar()
+        return args.funcao(args)
+    except ValueError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        logger.error("Erro ao executar '%s': %s", args.comando, e)
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+    finally:
+        controller.finalizar()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,7 +20,8 @@ FONTS = {
     'title': ('Segoe UI', 18, 'bold'),
     'label': ('Segoe UI', 12),
     'entry': ('Segoe UI', 12),
-    'button': ('Segoe UI', 12, 'bold')
+    'button': ('Segoe UI', 12, 'bold'),
+    'mono': ('Consolas', 10)
 }
 
 # Configurações da janela
@@ -34,20 +35,160 @@ WINDOW_CONFIG = {
 # Configurações da tabela
 TABLE_CONFIG = {
     'height': 8,
+    'buffer': 8,
+    'max_pages': 3,
     'columns': {
         'ID': 40,
         'Título': 150,
         'Descrição': 200,
         'Status': 100
+    },
+    # Cabeçalhos que ordenam a lista ao clicar e a coluna de model.ORDENACOES de cada um
+    'sort_columns': {
+        'ID': 'id',
+        'Título': 'titulo',
+        'Status': 'status'
     }
 }
 
+# Configurações da busca textual
+SEARCH_CONFIG = {
+    'limit': 50,
+    # Correspondências mais recentes ordenadas por relevância em cada busca
+    'candidates': 200,
+    'debounce_ms': 250
+}
+
 # Configurações de entrada
 INPUT_CONFIG = {
     'width': 30,
     'relief': 'flat'
 }
 
+# Configurações do banco de dados
+DATABASE_CONFIG = {
+    'pool_size': 4,
+    'pool_timeout': 5.0,
+    'page_size': 100,
+    'batch_size': 500,
+    'storage_profile': 'balanced'
+}
+
+# Cache de leitura do controller
+CACHE_CONFIG = {
+    'enabled': True,
+    'max_tasks': 1024,
+    'max_pages': 64
+}
+
+# Modo em memória: o banco é carregado em uma conexão :memory: na abertura e
+# gravado de volta no arquivo a cada snapshot_interval_s segundos (se mudou) e
+# no encerramento. max_loss_s é a janela máxima de alterações sem snapshot
+# tolerada antes de ser registrada como erro. Só um processo pode usar o arquivo.
+MEMORY_CONFIG = {
+    'enabled': False,
+    'snapshot_interval_s': 5,
+    'max_loss_s': 30,
+    'pages_per_step': 256,
+    # Recomeços do snapshot incremental (causados por commits entre os passos)
+    # antes de copiar o banco inteiro de uma vez
+    'max_restarts': 3
+}
+
+# Perfis de armazenamento do SQLite, aplicados a cada conexão aberta.
+# safe: fsync a cada commit; balanced: WAL com fsync só no checkpoint
+# (um commit pode se perder em queda de energia, sem corromper o banco);
+# fast: sem fsync, para cargas descartáveis ou importações.
+STORAGE_PROFILES = {
+    'safe': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,
+        'mmap_size': 0,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,
+        'mmap_size': 67108864,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 2000
+    }
+}
+
+# Configurações do executor de operações em segundo plano
+EXECUTOR_CONFIG = {
+    'readers': 2,
+    'poll_ms': 50
+}
+
+# Configurações de log (logs.py); a escrita acontece numa thread própria
+LOGGING_CONFIG = {
+    'level': 'INFO',
+    'format': '%(asctime)s %(levelname)s %(name)s: %(message)s',
+    'file': None
+}
+
+# Instrumentação do model e do controller (metricas.py)
+METRICS_CONFIG = {
+    'enabled': False,
+    'dump_path': None,
+    'dump_interval_s': 60
+}
+
+# Escrita em grupo (escrita_em_grupo.py): escritas enviadas por controller.submeter
+# dentro de window_ms, ou até max_ops, são confirmadas com um único commit.
+# enabled liga o escritor em controller.inicializar (interface e linha de
+# comando); as ações da interface passam a ser enviadas por submeter.
+# Com window_ms 0 o grupo reúne o que chegou enquanto o anterior era gravado;
+# em discos com fsync lento, alguns ms a mais formam grupos maiores.
+GROUP_COMMIT_CONFIG = {
+    'enabled': False,
+    'window_ms': 0,
+    'max_ops': 256
+}
+
+# Arquivamento das tarefas concluídas (tarefas_arquivo): as que não são
+# alteradas há age_days dias saem da tabela principal, em lotes de batch
+# tarefas com pause_ms entre eles, a cada interval_s segundos
+ARCHIVE_CONFIG = {
+    'enabled': True,
+    'age_days': 30,
+    'batch': 500,
+    'pause_ms': 50,
+    'interval_s': 3600
+}
+
+# Configurações do registro de mudanças (tarefas_changelog)
+CHANGELOG_CONFIG = {
+    'poll_ms': 1000,
+    'batch': 500,
+    'max_entries': 10000,
+    'prune_interval_s': 300
+}
+
+# Configurações do servidor HTTP/JSON (servidor.py)
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'workers': 4,
+    'max_pending': 64,
+    'keepalive_timeout': 15.0,
+    'max_body': 4 * 1024 * 1024,
+    # Maior `limite` aceito em /tarefas e /busca
+    'max_limit': 1000
+}
+
 # Status válidos para tarefas
 VALID_STATUSES = ['pendente', 'concluida', 'concluída']
 
@@ -56,9 +197,14 @@ MESSAGES = {
     'empty_title': 'Título não pode estar vazio!',
     'select_task': 'Selecione uma tarefa para realizar esta ação!',
     'confirm_delete': 'Tem certeza que deseja excluir esta tarefa?',
+    'confirm_delete_many': 'Tem certeza que deseja excluir as {n} tarefas selecionadas?',
     'task_added': 'Tarefa adicionada com sucesso!',
     'task_updated': 'Tarefa atualizada com sucesso!',
+    'edit_conflict': 'Esta tarefa foi alterada por outro usuário. Os dados atuais foram recarregados; revise e salve novamente.',
     'task_deleted': 'Tarefa excluída com sucesso!',
     'task_completed': 'Tarefa marcada como concluída!',
-    'error_generic': 'Ocorreu um erro inesperado. Tente novamente.'
+    'tasks_completed': '{n} tarefas marcadas como concluídas!',
+    'tasks_deleted': '{n} tarefas excluídas com sucesso!',
+    'error_generic': 'Ocorreu um erro inesperado. Tente novamente.',
+    'status_count': 'Pendentes: {pendentes}  |  Concluídas: {concluidas}'
 }
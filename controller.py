@@ -1,85 +1,685 @@
 import model
+import config
+import metricas as instrumentacao
+from model import (ConflitoVersao, OP_ARQUIVADA, OP_ATUALIZADA, OP_INSERIDA, OP_REMOVIDA, ORDENACOES,  # reexportados para a view
+                   Status, Tarefa)
+import atexit
 import logging
-from typing import List, Tuple, Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, List, Tuple, Optional, Iterator, Iterable, NamedTuple, Union
+
+from escrita_em_grupo import EscritorEmGrupo
 
 logger = logging.getLogger(__name__)
 
+class CacheTarefas:
+    """Cache read-through de tarefas por ID e de páginas da listagem.
+
+    As escritas feitas pelo controller invalidam só o que podem ter mudado.
+    Como a paginação é por chave, na ordem padrão (mais recentes primeiro)
+    uma inserção só afeta primeiras páginas e uma edição só afeta as páginas
+    que contêm a tarefa. Nas demais ordenações uma tarefa nova ou editada
+    pode cair em qualquer página, e elas são descartadas a cada escrita.
+    """
+
+    def __init__(self, max_tarefas: int, max_paginas: int, ativo: bool = True):
+        self.max_tarefas = max_tarefas
+        self.max_paginas = max_paginas
+        self.ativo = ativo
+        self.acertos = 0
+        self.falhas = 0
+        self._tarefas: OrderedDict = OrderedDict()
+        self._paginas: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Incrementada a cada invalidação: leituras iniciadas antes dela não são guardadas
+        self._geracao = 0
+
+    @property
+    def geracao(self) -> int:
+        return self._geracao
+
+    def _obter(self, dados: OrderedDict, chave):
+        with self._lock:
+            if chave in dados:
+                dados.move_to_end(chave)
+                self.acertos += 1
+                return dados[chave]
+            self.falhas += 1
+            return None
+
+    def _guardar(self, dados: OrderedDict, chave, valor, maximo: int, geracao: int) -> None:
+        with self._lock:
+            if geracao != self._geracao:
+                return
+            dados[chave] = valor
+            dados.move_to_end(chave)
+            while len(dados) > maximo:
+                dados.popitem(last=False)
+
+    def obter_tarefa(self, id: int) -> Optional[model.Tarefa]:
+        return self._obter(self._tarefas, id)
+
+    def guardar_tarefa(self, id: int, tarefa: model.Tarefa, geracao: int) -> None:
+        self._guardar(self._tarefas, id, tarefa, self.max_tarefas, geracao)
+
+    def obter_pagina(self, chave: Tuple) -> Optional[Tuple]:
+        return self._obter(self._paginas, chave)
+
+    def guardar_pagina(self, chave: Tuple, pagina: Tuple, geracao: int) -> None:
+        self._guardar(self._paginas, chave, pagina, self.max_paginas, geracao)
+
+    def invalidar(self, ids: Iterable[int] = (), primeiras_paginas: bool = False,
+                  status: Optional[model.Status] = None) -> None:
+        """Descarta as tarefas `ids`, as páginas que as contêm e, se pedido,
+        as primeiras páginas e as páginas filtradas por `status`."""
+        ids = set(ids)
+        with self._lock:
+            self._geracao += 1
+            for id in ids:
+                self._tarefas.pop(id, None)
+            for chave in list(self._paginas):
+                _, apos, status_pagina, _, ordenar_por, decrescente = chave
+                linhas = self._paginas[chave][0]
+                if (not (decrescente and ordenar_por in ('data_criacao', 'id'))
+                        or (primeiras_paginas and apos is None)
+                        or (status is not None and status_pagina == status)
+                        or any(tarefa.id in ids for tarefa in linhas)):
+                    del self._paginas[chave]
+
+    def limpar(self) -> None:
+        with self._lock:
+            self._geracao += 1
+            self._tarefas.clear()
+            self._paginas.clear()
+
+    def estatisticas(self) -> dict:
+        with self._lock:
+            return {
+                'ativo': self.ativo,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'tarefas': len(self._tarefas),
+                'paginas': len(self._paginas),
+            }
+
+_cache = CacheTarefas(config.CACHE_CONFIG['max_tasks'], config.CACHE_CONFIG['max_pages'],
+                      config.CACHE_CONFIG['enabled'])
+
+def configurar_cache(ativo: bool) -> None:
+    """Liga ou desliga o cache do controller, descartando o conteúdo atual."""
+    _cache.ativo = ativo
+    _cache.limpar()
+
+def cache_estatisticas() -> dict:
+    """Retorna acertos, falhas e ocupação do cache do controller."""
+    return _cache.estatisticas()
+
+def configurar_metricas(ativo: bool) -> None:
+    """Liga ou desliga a instrumentação do model e do controller."""
+    instrumentacao.ativar(ativo)
+
+def zerar_metricas() -> None:
+    """Descarta os contadores da instrumentação."""
+    instrumentacao.zerar()
+
+def metricas() -> dict:
+    """Snapshot da instrumentação: chamadas, latências, SQL e linhas por função,
+    o cache, a escrita em grupo e os snapshots do modo em memória."""
+    return {**instrumentacao.snapshot(), 'cache': _cache.estatisticas(),
+            'escrita_em_grupo': escrita_em_grupo_estatisticas(),
+            'memoria': model.estatisticas_memoria()}
+
+_local = threading.local()
+
+def _apos_commit(funcao: Callable, *args, **kwargs) -> None:
+    """Executa `funcao` agora ou, dentro de uma escrita em grupo, depois do commit.
+
+    Usada nas invalidações do cache: se acontecessem antes do commit, uma
+    leitura concorrente poderia guardar de novo a linha antiga.
+    """
+    adiadas = getattr(_local, 'apos_commit', None)
+    if adiadas is None:
+        funcao(*args, **kwargs)
+    else:
+        adiadas.append(partial(funcao, *args, **kwargs))
+
+@contextmanager
+def _transacao_em_grupo():
+    """Transação do model para um grupo de escritas, com as invalidações do cache adiadas."""
+    _local.apos_commit = adiadas = []
+    try:
+        with model.transacao_em_grupo() as transacao:
+            yield transacao
+    finally:
+        _local.apos_commit = None
+    for funcao in adiadas:
+        funcao()
+
+_escritor: Optional[EscritorEmGrupo] = None
+_escritor_lock = threading.Lock()
+
+def configurar_escrita_em_grupo(ativo: bool, janela_ms: Optional[float] = None,
+                                max_operacoes: Optional[int] = None) -> None:
+    """Liga ou desliga a escrita em grupo das chamadas feitas por submeter().
+
+    Desligar (ou religar com outros parâmetros) espera as escritas pendentes
+    serem confirmadas.
+    """
+    global _escritor
+    with _escritor_lock:
+        anterior = _escritor
+        _escritor = None
+        if ativo:
+            if janela_ms is None:
+                janela_ms = config.GROUP_COMMIT_CONFIG['window_ms']
+            _escritor = EscritorEmGrupo(_transacao_em_grupo, janela_ms,
+                                        max_operacoes or config.GROUP_COMMIT_CONFIG['max_ops'])
+    if anterior is not None:
+        anterior.fechar()
+    logger.info("Escrita em grupo %s", 'ligada' if ativo else 'desligada')
+
+def _encerrar_escrita_em_grupo() -> None:
+    """Confirma as escritas em grupo pendentes e para o escritor."""
+    if _escritor is not None:
+        configurar_escrita_em_grupo(False)
+
+# Registrado depois do fechamento do pool (model), então executa antes dele
+atexit.register(_encerrar_escrita_em_grupo)
+
+def escrita_em_grupo_ativa() -> bool:
+    """Indica se submeter() está agrupando as escritas."""
+    return _escritor is not None
+
+def escrita_em_grupo_estatisticas() -> dict:
+    """Operações e commits do escritor em grupo atual, totais e por segundo."""
+    escritor = _escritor
+    return escritor.estatisticas() if escritor is not None else {'ativo': False}
+
+def submeter(funcao: Callable, *args, **kwargs) -> Future:
+    """Agenda uma escrita do controller (adicionar_tarefa, atualizar_campos...).
+
+    Com a escrita em grupo ligada, a chamada entra no próximo grupo e o
+    Future é resolvido depois do commit; desligada, ela é executada agora,
+    na thread de quem chamou.
+    """
+    with _escritor_lock:
+        if _escritor is not None:
+            return _escritor.submeter(funcao, *args, **kwargs)
+    futuro = Future()
+    futuro.set_running_or_notify_cancel()
+    try:
+        futuro.set_result(funcao(*args, **kwargs))
+    except Exception as e:
+        futuro.set_exception(e)
+    return futuro
+
+class Mudanca(NamedTuple):
+    """Evento de mudança de uma tarefa, aplicado incrementalmente pela view."""
+    op: str
+    id: int
+    tarefa: Optional[model.Tarefa] = None
+
+@instrumentacao.instrumentar
+def mudanca(op: str, id: int) -> Mudanca:
+    """Monta o evento de mudança de uma tarefa com a linha atual do banco."""
+    if op == OP_REMOVIDA:
+        return Mudanca(OP_REMOVIDA, id)
+    tarefa = buscar_tarefa(id)
+    if tarefa is None:
+        # Removida por outro cliente entre a escrita e a leitura
+        return Mudanca(OP_REMOVIDA, id)
+    return Mudanca(op, id, tarefa)
+
+@instrumentacao.instrumentar
+def mudancas(op: str, ids: Iterable[int]) -> List[Mudanca]:
+    """Monta os eventos de mudança de várias tarefas com uma única consulta."""
+    ids = list(ids)
+    if op == OP_REMOVIDA:
+        return [Mudanca(OP_REMOVIDA, id) for id in ids]
+    try:
+        tarefas = {tarefa.id: tarefa for tarefa in model.buscar_tarefas_por_ids(ids)}
+    except Exception as e:
+        logger.error("Erro ao montar mudanças de %s tarefas: %s", len(ids), e)
+        raise
+    return [Mudanca(op, id, tarefas[id]) if id in tarefas else Mudanca(OP_REMOVIDA, id)
+            for id in ids]
+
+@instrumentacao.instrumentar
+def ultima_mudanca() -> int:
+    """Número de sequência da última mudança, ponto de partida de mudancas_desde."""
+    try:
+        return model.ultima_mudanca()
+    except Exception as e:
+        logger.error("Erro ao ler a última mudança: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def mudancas_desde(seq: int, limite: Optional[int] = None) -> Tuple[int, Optional[List[Mudanca]]]:
+    """Mudanças feitas por qualquer cliente do banco depois de `seq`.
+
+    Retorna o novo número de sequência e um evento por tarefa alterada, com
+    a linha atual, na ordem da primeira mudança. Se o histórico não está
+    mais disponível ou há mais de `limite` mudanças pendentes, retorna None
+    no lugar dos eventos e a view deve recarregar. O cache é invalidado
+    pelas mudanças recebidas, inclusive as de outros processos.
+    """
+    limite = limite or config.CHANGELOG_CONFIG['batch']
+    try:
+        entradas = model.listar_mudancas(seq, limite + 1)
+        if entradas is None or len(entradas) > limite:
+            _cache.limpar()
+            return model.ultima_mudanca(), None
+        if not entradas:
+            return seq, []
+        # Uma tarefa alterada várias vezes vira um único evento com a linha atual
+        ids = dict.fromkeys(id for _, _, id in entradas)
+        inseridas = {id for _, op, id in entradas if op == OP_INSERIDA}
+        # Arquivar é a última mudança possível de uma tarefa: ela sai da tabela de vez
+        arquivadas = {id for _, op, id in entradas if op == OP_ARQUIVADA}
+        eventos = [Mudanca(OP_ARQUIVADA, m.id) if m.id in arquivadas
+                   else Mudanca(OP_INSERIDA, m.id, m.tarefa) if m.tarefa is not None and m.id in inseridas
+                   else m
+                   for m in mudancas(OP_ATUALIZADA, ids)]
+        _cache.invalidar(ids, primeiras_paginas=bool(inseridas))
+        for status in {m.tarefa.status for m in eventos if m.tarefa is not None}:
+            _cache.invalidar(status=status)
+        return entradas[-1][0], eventos
+    except Exception as e:
+        logger.error("Erro ao ler mudanças desde %s: %s", seq, e)
+        raise
+
+@instrumentacao.instrumentar
+def podar_mudancas() -> int:
+    """Remove as entradas antigas do changelog, conforme CHANGELOG_CONFIG."""
+    try:
+        return model.podar_mudancas(config.CHANGELOG_CONFIG['max_entries'])
+    except Exception as e:
+        logger.error("Erro ao podar o changelog: %s", e)
+        raise
+
+@instrumentacao.instrumentar
 def inicializar() -> None:
     """Inicializa o banco de dados."""
     try:
         model.criar_tabela()
+        model.podar_mudancas(config.CHANGELOG_CONFIG['max_entries'])
+        if config.GROUP_COMMIT_CONFIG['enabled'] and not escrita_em_grupo_ativa():
+            configurar_escrita_em_grupo(True)
+        if config.METRICS_CONFIG['dump_path']:
+            instrumentacao.iniciar_despejo(config.METRICS_CONFIG['dump_path'],
+                                           config.METRICS_CONFIG['dump_interval_s'])
+        if logger.isEnabledFor(logging.INFO):
+            # Lê os PRAGMAs do banco: só vale a consulta se a mensagem for registrada
+            logger.info("Armazenamento com perfil '%s': %s", config.DATABASE_CONFIG['storage_profile'],
+                        model.configuracoes_armazenamento())
         logger.info("Sistema inicializado com sucesso")
     except Exception as e:
-        logger.error(f"Erro ao inicializar sistema: {e}")
+        logger.error("Erro ao inicializar sistema: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def arquivar_concluidas(dias: Optional[int] = None, parar: Optional[threading.Event] = None) -> int:
+    """Move para o arquivo as tarefas concluídas há mais de `dias` dias.
+
+    Trabalha em lotes de ARCHIVE_CONFIG['batch'], cada um na sua transação
+    e com uma pausa entre eles para não segurar as outras escritas. Para
+    antes do fim se `parar` for sinalizado. Retorna quantas foram movidas.
+    """
+    cfg = config.ARCHIVE_CONFIG
+    dias = cfg['age_days'] if dias is None else dias
+    if dias < 0:
+        raise ValueError("Idade para arquivamento não pode ser negativa")
+    parar = parar or threading.Event()
+    total = 0
+    apos_id: Optional[int] = 0
+    try:
+        while apos_id is not None and not parar.is_set():
+            ids, apos_id = model.arquivar_concluidas(dias, cfg['batch'], apos_id)
+            if ids:
+                _cache.invalidar(ids, status=model.Status.CONCLUIDA)
+                total += len(ids)
+            if apos_id is not None:
+                parar.wait(cfg['pause_ms'] / 1000)
+        if total:
+            logger.info("%s tarefas concluídas há mais de %s dias arquivadas", total, dias)
+        return total
+    except Exception as e:
+        logger.error("Erro ao arquivar tarefas concluídas: %s", e)
         raise
 
+_parar_arquivamento = threading.Event()
+_arquivamento: Optional[threading.Thread] = None
+
+def iniciar_arquivamento(intervalo_s: Optional[float] = None) -> None:
+    """Arquiva as concluídas antigas agora e a cada `intervalo_s` segundos, numa thread de fundo."""
+    global _arquivamento
+    parar_arquivamento()
+    _parar_arquivamento.clear()
+    intervalo_s = intervalo_s or config.ARCHIVE_CONFIG['interval_s']
+
+    def executar():
+        while not _parar_arquivamento.is_set():
+            try:
+                arquivar_concluidas(parar=_parar_arquivamento)
+            except Exception:
+                pass  # já registrado; tenta de novo no próximo intervalo
+            _parar_arquivamento.wait(intervalo_s)
+
+    _arquivamento = threading.Thread(target=executar, name="arquivamento", daemon=True)
+    _arquivamento.start()
+
+def parar_arquivamento() -> None:
+    """Interrompe o arquivamento periódico, esperando o lote em andamento."""
+    global _arquivamento
+    if _arquivamento is not None:
+        _parar_arquivamento.set()
+        _arquivamento.join()
+        _arquivamento = None
+
+def usar_banco(caminho: str) -> None:
+    """Aponta o sistema para outro arquivo de banco, fechando as conexões atuais."""
+    if escrita_em_grupo_ativa():
+        configurar_escrita_em_grupo(True)
+    model.fechar_conexoes()
+    model.DB_NAME = caminho
+    _cache.limpar()
+
+def usar_memoria(ativo: bool) -> None:
+    """Liga ou desliga o modo em memória (MEMORY_CONFIG) para o banco atual.
+
+    Ligado, o banco é carregado em memória na próxima operação e gravado de
+    volta no arquivo periodicamente; desligar grava o snapshot pendente.
+    """
+    if escrita_em_grupo_ativa():
+        configurar_escrita_em_grupo(True)
+    model.fechar_conexoes()
+    model.MEMORIA = ativo
+    _cache.limpar()
+
+def salvar_snapshot() -> bool:
+    """No modo em memória, grava agora as alterações no arquivo do banco."""
+    try:
+        return model.salvar_snapshot()
+    except Exception as e:
+        logger.error("Erro ao gravar snapshot do banco: %s", e)
+        raise
+
+def finalizar() -> None:
+    """Libera os recursos do banco de dados no encerramento."""
+    try:
+        parar_arquivamento()
+        # Confirma as escritas em grupo pendentes antes de fechar as conexões
+        _encerrar_escrita_em_grupo()
+        instrumentacao.parar_despejo(config.METRICS_CONFIG['dump_path'])
+        model.fechar_conexoes()
+    except Exception as e:
+        logger.error("Erro ao finalizar sistema: %s", e)
+
+@instrumentacao.instrumentar
 def adicionar_tarefa(titulo: str, descricao: str = "") -> int:
     """Adiciona uma nova tarefa."""
     try:
         task_id = model.adicionar_tarefa(titulo, descricao)
-        logger.info(f"Tarefa adicionada via controller: ID {task_id}")
+        _apos_commit(_cache.invalidar, primeiras_paginas=True)
+        logger.debug("Tarefa adicionada via controller: ID %s", task_id)
         return task_id
     except ValueError as e:
-        logger.warning(f"Validação falhou ao adicionar tarefa: {e}")
+        logger.warning("Validação falhou ao adicionar tarefa: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Erro inesperado ao adicionar tarefa: {e}")
+        logger.error("Erro inesperado ao adicionar tarefa: %s", e)
         raise
     
-def listar() -> List[Tuple]:
-    """Lista todas as tarefas."""
+@instrumentacao.instrumentar
+def listar(status: Optional[Union[model.Status, str]] = None,
+           incluir_arquivadas: bool = False) -> List[model.Tarefa]:
+    """Lista todas as tarefas, opcionalmente filtradas por status.
+
+    As tarefas arquivadas só entram com `incluir_arquivadas`.
+    """
+    try:
+        return model.listar_tarefas(status, incluir_arquivadas)
+    except Exception as e:
+        logger.error("Erro ao listar tarefas: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def listar_pagina(limite: Optional[int] = None, apos: Optional[model.CursorPagina] = None,
+                  status: Optional[Union[model.Status, str]] = None, incluir_arquivadas: bool = False,
+                  ordenar_por: str = 'data_criacao', decrescente: bool = True
+                  ) -> Tuple[List[model.Tarefa], Optional[model.CursorPagina]]:
+    """Lista uma página de tarefas e retorna o cursor da próxima.
+
+    As tarefas arquivadas só entram com `incluir_arquivadas`. A ordenação
+    é feita no banco, por uma das colunas de model.ORDENACOES.
+    """
+    try:
+        if status is not None:
+            status = model.Status.de_valor(status)
+        if not _cache.ativo:
+            return model.listar_tarefas_pagina(limite, apos, status, incluir_arquivadas,
+                                               ordenar_por, decrescente)
+        chave = (limite, apos, status, incluir_arquivadas, ordenar_por, decrescente)
+        pagina = _cache.obter_pagina(chave)
+        if pagina is None:
+            geracao = _cache.geracao
+            pagina = model.listar_tarefas_pagina(limite, apos, status, incluir_arquivadas,
+                                                 ordenar_por, decrescente)
+            _cache.guardar_pagina(chave, pagina, geracao)
+        return pagina
+    except ValueError as e:
+        logger.warning("Parâmetros inválidos ao listar página: %s", e)
+        raise
+    except Exception as e:
+        logger.error("Erro ao listar página de tarefas: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def iterar(tamanho_lote: Optional[int] = None, status: Optional[Union[model.Status, str]] = None,
+           incluir_arquivadas: bool = False) -> Iterator[model.Tarefa]:
+    """Percorre todas as tarefas em lotes, sem carregar a tabela inteira."""
+    try:
+        yield from model.iterar_tarefas(tamanho_lote, status, incluir_arquivadas)
+    except Exception as e:
+        logger.error("Erro ao iterar tarefas: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def buscar_tarefas(texto: str, limite: Optional[int] = None) -> List[model.Tarefa]:
+    """Busca tarefas por texto no título e na descrição, ordenadas por relevância."""
+    try:
+        return model.buscar_tarefas(texto, limite)
+    except Exception as e:
+        logger.error("Erro ao buscar tarefas por '%s': %s", texto, e)
+        raise
+
+@instrumentacao.instrumentar
+def contar_por_status() -> dict:
+    """Retorna o total de tarefas por status, sem varrer a tabela."""
     try:
-        return model.listar_tarefas()
+        return model.contar_por_status()
     except Exception as e:
-        logger.error(f"Erro ao listar tarefas: {e}")
+        logger.error("Erro ao contar tarefas por status: %s", e)
         raise
 
+def _alterar(operacao: Callable, id: int, *args, **kwargs):
+    """Executa uma alteração do model sobre a tarefa `id`.
+
+    Se ela não está em tarefas mas está arquivada, é desarquivada e a
+    alteração é repetida: editar ou concluir uma tarefa arquivada a devolve
+    à listagem.
+    """
+    resultado = operacao(id, *args, **kwargs)
+    if not resultado and _desarquivar([id]):
+        resultado = operacao(id, *args, **kwargs)
+    return resultado
+
+def _desarquivar(ids: List[int], exceto_status: Optional[model.Status] = None) -> List[int]:
+    devolvidas = model.desarquivar_tarefas(ids, exceto_status=exceto_status)
+    if devolvidas:
+        # Voltam na posição da data de criação, que pode cair em qualquer página
+        _apos_commit(_cache.limpar)
+    return devolvidas
+
+@instrumentacao.instrumentar
+def desarquivar(ids: Iterable[int]) -> List[int]:
+    """Devolve à listagem as tarefas arquivadas `ids` e retorna as devolvidas."""
+    try:
+        return _desarquivar(list(ids))
+    except Exception as e:
+        logger.error("Erro ao desarquivar tarefas: %s", e)
+        raise
+
+@instrumentacao.instrumentar
 def concluir(id: int) -> bool:
     """Marca uma tarefa como concluída."""
     try:
-        return model.atualizar_status_tarefa(id, "concluida")
+        sucesso = _alterar(model.atualizar_status_tarefa, id, model.Status.CONCLUIDA)
+        _apos_commit(_cache.invalidar, [id], status=model.Status.CONCLUIDA)
+        return sucesso
     except ValueError as e:
-        logger.warning(f"Status inválido ao concluir tarefa {id}: {e}")
+        logger.warning("Status inválido ao concluir tarefa %s: %s", id, e)
         raise
     except Exception as e:
-        logger.error(f"Erro ao concluir tarefa {id}: {e}")
+        logger.error("Erro ao concluir tarefa %s: %s", id, e)
         raise
     
+@instrumentacao.instrumentar
 def editar_tarefa(id: int, novo_titulo: str, nova_descricao: str = "") -> bool:
     """Edita uma tarefa existente."""
     try:
-        return model.atualizar_tarefa(id, novo_titulo, nova_descricao)
+        sucesso = _alterar(model.atualizar_tarefa, id, novo_titulo, nova_descricao)
+        _apos_commit(_cache.invalidar, [id])
+        return sucesso
     except ValueError as e:
-        logger.warning(f"Validação falhou ao editar tarefa {id}: {e}")
+        logger.warning("Validação falhou ao editar tarefa %s: %s", id, e)
         raise
     except Exception as e:
-        logger.error(f"Erro ao editar tarefa {id}: {e}")
+        logger.error("Erro ao editar tarefa %s: %s", id, e)
         raise
 
-def atualizar_status(id: int, status: str) -> bool:
+@instrumentacao.instrumentar
+def atualizar_status(id: int, status: Union[model.Status, str]) -> bool:
     """Atualiza o status de uma tarefa."""
     try:
-        return model.atualizar_status_tarefa(id, status)
+        sucesso = _alterar(model.atualizar_status_tarefa, id, status)
+        _apos_commit(_cache.invalidar, [id], status=model.Status.de_valor(status))
+        return sucesso
+    except ValueError as e:
+        logger.warning("Status inválido ao atualizar tarefa %s: %s", id, e)
+        raise
+    except Exception as e:
+        logger.error("Erro ao atualizar status da tarefa %s: %s", id, e)
+        raise
+
+@instrumentacao.instrumentar
+def atualizar_campos(id: int, versao: Optional[int] = None, **campos) -> Optional[model.Tarefa]:
+    """Atualiza título, descrição e/ou status de uma tarefa em uma única transação.
+
+    Com `versao` (a lida junto com a tarefa), levanta ConflitoVersao se outro
+    cliente alterou a tarefa nesse meio tempo. Retorna a tarefa atualizada,
+    ou None se ela não existe.
+    """
+    try:
+        tarefa = _alterar(model.atualizar_campos, id, versao, **campos)
+        status = model.Status.de_valor(campos['status']) if 'status' in campos else None
+
+        def atualizar_cache():
+            _cache.invalidar([id], status=status)
+            if tarefa is not None and _cache.ativo:
+                _cache.guardar_tarefa(id, tarefa, _cache.geracao)
+
+        _apos_commit(atualizar_cache)
+        return tarefa
+    except ConflitoVersao as e:
+        _cache.invalidar([id])
+        logger.warning("%s", e)
+        raise
     except ValueError as e:
-        logger.warning(f"Status inválido ao atualizar tarefa {id}: {e}")
+        logger.warning("Validação falhou ao atualizar tarefa %s: %s", id, e)
         raise
     except Exception as e:
-        logger.error(f"Erro ao atualizar status da tarefa {id}: {e}")
+        logger.error("Erro ao atualizar campos da tarefa %s: %s", id, e)
         raise
 
+@instrumentacao.instrumentar
 def deletar(id: int) -> bool:
     """Deleta uma tarefa."""
     try:
-        return model.deletar_tarefa(id)
+        sucesso = model.deletar_tarefa(id)
+        _apos_commit(_cache.invalidar, [id])
+        return sucesso
     except Exception as e:
-        logger.error(f"Erro ao deletar tarefa {id}: {e}")
+        logger.error("Erro ao deletar tarefa %s: %s", id, e)
         raise
 
-def buscar_tarefa(id: int) -> Optional[Tuple]:
+@instrumentacao.instrumentar
+def buscar_tarefa(id: int) -> Optional[model.Tarefa]:
     """Busca uma tarefa específica por ID."""
     try:
-        return model.buscar_tarefa_por_id(id)
+        if not _cache.ativo:
+            return model.buscar_tarefa_por_id(id)
+        tarefa = _cache.obter_tarefa(id)
+        if tarefa is None:
+            geracao = _cache.geracao
+            tarefa = model.buscar_tarefa_por_id(id)
+            if tarefa is not None:
+                _cache.guardar_tarefa(id, tarefa, geracao)
+        return tarefa
     except Exception as e:
-        logger.error(f"Erro ao buscar tarefa {id}: {e}")
+        logger.error("Erro ao buscar tarefa %s: %s", id, e)
         raise
 
+@instrumentacao.instrumentar
+def adicionar_tarefas_em_lote(tarefas: Iterable[model.NovaTarefa],
+                              tamanho_lote: Optional[int] = None) -> List[int]:
+    """Adiciona várias tarefas em uma transação e retorna os IDs gerados."""
+    try:
+        ids = model.adicionar_tarefas_em_lote(tarefas, tamanho_lote)
+        _apos_commit(_cache.invalidar, primeiras_paginas=True)
+        logger.debug("%s tarefas adicionadas em lote via controller", len(ids))
+        return ids
+    except ValueError as e:
+        logger.warning("Validação falhou ao adicionar tarefas em lote: %s", e)
+        raise
+    except Exception as e:
+        logger.error("Erro inesperado ao adicionar tarefas em lote: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def atualizar_status_em_lote(ids: Iterable[int], status: Union[model.Status, str],
+                             tamanho_lote: Optional[int] = None) -> int:
+    """Atualiza o status de várias tarefas e retorna quantas mudaram."""
+    ids = list(dict.fromkeys(ids))
+    try:
+        status = model.Status.de_valor(status)
+        afetadas = model.atualizar_status_em_lote(ids, status, tamanho_lote)
+        if afetadas < len(ids):
+            # Arquivadas que já têm o status ficam no arquivo: não há o que mudar nelas
+            devolvidas = _desarquivar(ids, exceto_status=status)
+            if devolvidas:
+                afetadas += model.atualizar_status_em_lote(devolvidas, status, tamanho_lote)
+        _apos_commit(_cache.invalidar, ids, status=status)
+        return afetadas
+    except ValueError as e:
+        logger.warning("Status inválido ao atualizar tarefas em lote: %s", e)
+        raise
+    except Exception as e:
+        logger.error("Erro ao atualizar status em lote: %s", e)
+        raise
+
+@instrumentacao.instrumentar
+def deletar_em_lote(ids: Iterable[int], tamanho_lote: Optional[int] = None) -> int:
+    """Deleta várias tarefas e retorna quantas foram removidas."""
+    ids = list(ids)
+    try:
+        afetadas = model.deletar_em_lote(ids, tamanho_lote)
+        _apos_commit(_cache.invalidar, ids)
+        return afetadas
+    except Exception as e:
+        logger.error("Erro ao deletar tarefas em lote: %s", e)
+        raise
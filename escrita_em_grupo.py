@@ -0,0 +1,133 @@
+"""
+Escrita em grupo (group commit) das mutações enviadas ao controller.
+
+As escritas submetidas dentro de uma janela curta, ou até um número máximo
+de operações, são aplicadas em uma única transação: o grupo inteiro paga um
+só commit (e um só fsync) em vez de um por operação. Cada chamada recebe um
+Future resolvido com o próprio resultado ou erro depois do commit do grupo;
+uma operação que falha é desfeita pelo seu SAVEPOINT sem afetar as demais.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, ContextManager, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (futuro, função, args, kwargs) de uma escrita aguardando o próximo grupo
+Pedido = Tuple[Future, Callable, tuple, dict]
+
+class EscritorEmGrupo:
+    """Thread que junta as escritas recebidas em grupos e os confirma de uma vez.
+
+    `abrir_transacao` retorna o context manager da transação do grupo, com um
+    método executar(funcao, *args, **kwargs) que roda cada operação.
+    """
+
+    def __init__(self, abrir_transacao: Callable[[], ContextManager], janela_ms: float,
+                 max_operacoes: int):
+        self.janela = janela_ms / 1000
+        self.max_operacoes = max_operacoes
+        self._abrir_transacao = abrir_transacao
+        self._fila = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._fechado = False
+        self._inicio = time.perf_counter()
+        self.operacoes = 0
+        self.commits = 0
+        self.erros = 0
+        self.maior_grupo = 0
+        self._thread = threading.Thread(target=self._executar, name="escrita-em-grupo", daemon=True)
+        self._thread.start()
+
+    def submeter(self, funcao: Callable, *args, **kwargs) -> Future:
+        """Agenda `funcao` para o próximo grupo e retorna o Future do seu resultado."""
+        futuro = Future()
+        with self._lock:
+            if self._fechado:
+                raise RuntimeError("Escritor em grupo já foi encerrado")
+            self._fila.put((futuro, funcao, args, kwargs))
+        return futuro
+
+    def fechar(self) -> None:
+        """Para de aceitar escritas e espera as pendentes serem confirmadas."""
+        with self._lock:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._fila.put(None)
+        self._thread.join()
+
+    def _executar(self) -> None:
+        encerrar = False
+        while not encerrar:
+            pedido = self._fila.get()
+            if pedido is None:
+                return
+            grupo = [pedido]
+            limite = time.perf_counter() + self.janela
+            while len(grupo) < self.max_operacoes:
+                restante = limite - time.perf_counter()
+                try:
+                    pedido = self._fila.get(timeout=restante) if restante > 0 else self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if pedido is None:
+                    # Encerramento: confirma o que já chegou antes de sair
+                    encerrar = True
+                    break
+                grupo.append(pedido)
+            self._aplicar(grupo)
+
+    def _aplicar(self, grupo: List[Pedido]) -> None:
+        """Executa o grupo em uma transação e só então resolve os futuros."""
+        grupo = [pedido for pedido in grupo if pedido[0].set_running_or_notify_cancel()]
+        if not grupo:
+            return
+        resultados = []
+        try:
+            with self._abrir_transacao() as transacao:
+                for futuro, funcao, args, kwargs in grupo:
+                    try:
+                        resultados.append((futuro, transacao.executar(funcao, *args, **kwargs), None))
+                    except Exception as e:
+                        resultados.append((futuro, None, e))
+        except Exception as e:
+            logger.error("Erro ao confirmar grupo de %s escritas: %s", len(grupo), e)
+            with self._lock:
+                self.erros += len(grupo)
+            for futuro, *_ in grupo:
+                futuro.set_exception(e)
+            return
+
+        with self._lock:
+            self.commits += 1
+            self.operacoes += len(grupo)
+            self.erros += sum(1 for _, _, erro in resultados if erro is not None)
+            self.maior_grupo = max(self.maior_grupo, len(grupo))
+        logger.debug("Grupo de %s escritas confirmado", len(grupo))
+        for futuro, resultado, erro in resultados:
+            if erro is None:
+                futuro.set_result(resultado)
+            else:
+                futuro.set_exception(erro)
+
+    def estatisticas(self) -> dict:
+        """Operações e commits desde a criação, totais e por segundo."""
+        segundos = time.perf_counter() - self._inicio
+        with self._lock:
+            return {
+                'ativo': not self._fechado,
+                'janela_ms': self.janela * 1000,
+                'max_operacoes': self.max_operacoes,
+                'operacoes': self.operacoes,
+                'commits': self.commits,
+                'erros': self.erros,
+                'maior_grupo': self.maior_grupo,
+                'operacoes_por_commit': round(self.operacoes / self.commits, 2) if self.commits else None,
+                'operacoes_por_s': round(self.operacoes / segundos, 1),
+                'commits_por_s': round(self.commits / segundos, 1),
+            }
@@ -0,0 +1,114 @@
+"""
+Executor de operações de banco fora da thread da interface.
+As escritas passam por uma única thread e as leituras por um pequeno pool;
+os resultados voltam para a thread da interface por uma fila consumida em
+processar_resultados().
+"""
+
+import queue
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class ExecutorBanco:
+    """Executa chamadas ao controller em threads de fundo."""
+
+    def __init__(self, leitores: int = 2):
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-escrita")
+        self._leitores = (ThreadPoolExecutor(max_workers=leitores, thread_name_prefix="db-leitura")
+                          if leitores > 0 else self._escritor)
+        self._resultados = queue.SimpleQueue()
+        # Geração atual de cada chave: resultados de gerações antigas são descartados
+        self._geracoes: Dict[str, int] = {}
+        self._futuros: Dict[str, Future] = {}
+        # Leituras ainda não terminadas, canceladas no encerramento
+        self._leituras: Set[Future] = set()
+        self.pendentes = 0
+
+    def escrever(self, funcao: Callable, *args, ao_concluir: Optional[Callable] = None,
+                 ao_falhar: Optional[Callable] = None, chave: Optional[str] = None) -> Future:
+        """Agenda uma operação de escrita na thread escritora."""
+        return self._submeter(self._escritor, funcao, args, ao_concluir, ao_falhar, chave)
+
+    def ler(self, funcao: Callable, *args, ao_concluir: Optional[Callable] = None,
+            ao_falhar: Optional[Callable] = None, chave: Optional[str] = None) -> Future:
+        """Agenda uma operação de leitura no pool de leitores.
+
+        Uma nova chamada com a mesma `chave` substitui a anterior: se ela
+        ainda não começou é cancelada, e se já terminou seu resultado é ignorado.
+        """
+        return self._submeter(self._leitores, funcao, args, ao_concluir, ao_falhar, chave)
+
+    def _submeter(self, pool: ThreadPoolExecutor, funcao: Callable, args: tuple,
+                  ao_concluir: Optional[Callable], ao_falhar: Optional[Callable],
+                  chave: Optional[str]) -> Future:
+        geracao = None
+        if chave is not None:
+            self.cancelar(chave)
+            geracao = self._geracoes[chave]
+        futuro = pool.submit(funcao, *args)
+        if chave is not None:
+            self._futuros[chave] = futuro
+        if pool is not self._escritor:
+            self._leituras.add(futuro)
+            futuro.add_done_callback(self._leituras.discard)
+        return self._entregar(futuro, chave, geracao, ao_concluir, ao_falhar)
+
+    def acompanhar(self, futuro: Future, ao_concluir: Optional[Callable] = None,
+                   ao_falhar: Optional[Callable] = None) -> Future:
+        """Entrega aos callbacks o resultado de um Future criado fora do executor,
+        como os de controller.submeter."""
+        return self._entregar(futuro, None, None, ao_concluir, ao_falhar)
+
+    def _entregar(self, futuro: Future, chave: Optional[str], geracao: Optional[int],
+                  ao_concluir: Optional[Callable], ao_falhar: Optional[Callable]) -> Future:
+        self.pendentes += 1
+        futuro.add_done_callback(
+            lambda f: self._resultados.put((f, chave, geracao, ao_concluir, ao_falhar)))
+        return futuro
+
+    def cancelar(self, chave: str) -> None:
+        """Cancela ou invalida a operação pendente associada à chave."""
+        self._geracoes[chave] = self._geracoes.get(chave, 0) + 1
+        futuro = self._futuros.pop(chave, None)
+        if futuro is not None:
+            futuro.cancel()
+
+    def processar_resultados(self) -> int:
+        """Entrega os resultados prontos aos callbacks. Deve rodar na thread da interface."""
+        entregues = 0
+        while True:
+            try:
+                futuro, chave, geracao, ao_concluir, ao_falhar = self._resultados.get_nowait()
+            except queue.Empty:
+                return entregues
+            self.pendentes -= 1
+            if futuro.cancelled():
+                continue
+            if chave is not None:
+                if self._geracoes.get(chave) != geracao:
+                    continue
+                self._futuros.pop(chave, None)
+            erro = futuro.exception()
+            try:
+                if erro is not None:
+                    if ao_falhar:
+                        ao_falhar(erro)
+                    else:
+                        logger.error("Erro em operação de fundo: %s", erro)
+                elif ao_concluir:
+                    ao_concluir(futuro.result())
+            except Exception as e:
+                logger.error("Erro ao entregar resultado de operação de fundo: %s", e)
+            entregues += 1
+
+    def encerrar(self) -> None:
+        """Aguarda as escritas pendentes e encerra as threads."""
+        if self._leitores is not self._escritor:
+            # shutdown(cancel_futures=True) só existe a partir do Python 3.9
+            for futuro in list(self._leituras):
+                futuro.cancel()
+            self._leitores.shutdown(wait=False)
+        self._escritor.shutdown(wait=True)
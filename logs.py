@@ -0,0 +1,57 @@
+"""
+Configuração de log dos pontos de entrada (interface, linha de comando,
+servidor e benchmarks).
+
+Os módulos de biblioteca (model, controller, executor...) só obtêm seus
+loggers; quem decide nível e destino é o programa, chamando
+configurar_logs() uma vez. As mensagens passam por uma fila: a thread que
+registra só enfileira o registro, e a formatação e a escrita em stderr ou
+arquivo acontecem na thread do QueueListener.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional, Union
+
+import config
+
+_ouvinte: Optional[logging.handlers.QueueListener] = None
+_handler_fila: Optional[logging.handlers.QueueHandler] = None
+
+def configurar_logs(nivel: Union[int, str, None] = None, arquivo: Optional[str] = None) -> None:
+    """Direciona os logs da raiz para uma fila consumida em segundo plano.
+
+    Chamadas seguintes só ajustam o nível. O ouvinte é encerrado (e a fila
+    esvaziada) no fim do processo.
+    """
+    global _ouvinte, _handler_fila
+    raiz = logging.getLogger()
+    raiz.setLevel(nivel if nivel is not None else config.LOGGING_CONFIG['level'])
+    if _ouvinte is not None:
+        return
+
+    arquivo = arquivo or config.LOGGING_CONFIG['file']
+    destino = (logging.FileHandler(arquivo, encoding="utf-8") if arquivo
+               else logging.StreamHandler(sys.stderr))
+    destino.setFormatter(logging.Formatter(config.LOGGING_CONFIG['format']))
+
+    fila = queue.SimpleQueue()
+    _handler_fila = logging.handlers.QueueHandler(fila)
+    raiz.addHandler(_handler_fila)
+    _ouvinte = logging.handlers.QueueListener(fila, destino, respect_handler_level=True)
+    _ouvinte.start()
+    atexit.register(encerrar_logs)
+
+def encerrar_logs() -> None:
+    """Escreve as mensagens pendentes e para a thread de log."""
+    global _ouvinte, _handler_fila
+    if _ouvinte is None:
+        return
+    _ouvinte.stop()
+    logging.getLogger().removeHandler(_handler_fila)
+    for handler in _ouvinte.handlers:
+        handler.close()
+    _ouvinte = _handler_fila = None
@@ -1,35 +1,210 @@
+import time
+
+# Referência para medir o tempo até a primeira pintura da janela
+_INICIO = time.perf_counter()
+
 import tkinter as tk
 from tkinter import messagebox, ttk
-from ttkthemes import ThemedTk
+import json
 import logging
-from typing import Optional
+import os
+from collections import deque
+from typing import Callable, List, Optional, Tuple
 
 import controller
 import config
+import logs
+from executor import ExecutorBanco
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ListaVirtual:
+    """Janela deslizante de páginas sobre uma Treeview.
+
+    Só mantém materializadas até `max_paginas` páginas da listagem
+    paginada; novas páginas são buscadas conforme o usuário rola e as
+    páginas que saem da janela são descartadas, de modo que o custo de
+    redesenho não depende do total de tarefas.
+
+    `buscar_pagina(limite, apos, ao_concluir, ao_falhar)` deve buscar a
+    página em segundo plano e chamar `ao_concluir((linhas, proximo))` na
+    thread da interface.
+    """
+
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar, buscar_pagina: Callable,
+                 ao_falhar: Callable, tamanho_pagina: int, max_paginas: int):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.buscar_pagina = buscar_pagina
+        self.ao_falhar = ao_falhar
+        self.tamanho_pagina = tamanho_pagina
+        self.max_paginas = max(2, max_paginas)
+        # Cada página guarda o cursor que a gerou, os itens inseridos e o cursor da próxima
+        self._paginas = deque()
+        # Cursores das páginas descartadas no topo, para poder voltar a elas
+        self._anteriores: List = []
+        self._agendado = False
+        # Exibindo resultados de busca: sem paginação nem inserções incrementais
+        self._fixa = False
+        # Listando também as arquivadas: arquivar uma tarefa não a tira da janela
+        self.manter_arquivadas = False
+        # Status exibido pela listagem (None = todos): tarefas que saem dele saem da janela
+        self.filtro_status: Optional[controller.Status] = None
+        # Listagem em que uma tarefa nova vai para o topo (mais recentes ou maior
+        # ID primeiro); nas demais ordenações ela só aparece ao recarregar
+        self.novas_no_topo = True
+
+        self.tree.configure(yscrollcommand=self._ao_rolar)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    def recarregar(self) -> None:
+        """Descarta a janela atual e carrega a primeira página."""
+        self._agendado = True
+        self.buscar_pagina(self.tamanho_pagina, None, self._receber_primeira, self._falhar)
+
+    def _receber_primeira(self, pagina: Tuple) -> None:
+        linhas, proximo = pagina
+        self._fixa = False
+        self._substituir(linhas, proximo)
+        logger.debug("Lista atualizada com %s tarefas na primeira página", len(linhas))
+
+    def mostrar(self, linhas: List[controller.Tarefa]) -> None:
+        """Substitui a janela por uma lista fixa, como o resultado de uma busca."""
+        self._fixa = True
+        self._substituir(linhas, None)
+
+    def _substituir(self, linhas: List[controller.Tarefa], proximo) -> None:
+        self._agendado = False
+        self.tree.delete(*self.tree.get_children())
+        self._paginas.clear()
+        self._anteriores.clear()
+        self._paginas.append((None, self._inserir(linhas, "end"), proximo))
+
+    def _falhar(self, erro: Exception) -> None:
+        self._agendado = False
+        self.ao_falhar(erro)
+
+    @staticmethod
+    def _colunas(tarefa: controller.Tarefa) -> dict:
+        """Valores e tags de um item da Treeview para uma tarefa."""
+        status = tarefa.status.rotulo
+        return {'values': (tarefa.id, tarefa.titulo, tarefa.descricao, status), 'tags': (status,)}
+
+    def _inserir(self, linhas: List[controller.Tarefa], posicao) -> List[str]:
+        """Insere as tarefas na Treeview e retorna os ids dos itens criados."""
+        itens = []
+        for indice, tarefa in enumerate(linhas):
+            item = str(tarefa.id)
+            if self.tree.exists(item):
+                # Já inserida por uma mudança aplicada enquanto a página era buscada
+                self.tree.item(item, **self._colunas(tarefa))
+                continue
+            pos = posicao if posicao == "end" else posicao + indice
+            itens.append(self.tree.insert("", pos, iid=item, **self._colunas(tarefa)))
+        return itens
+
+    def aplicar(self, mudanca: controller.Mudanca) -> None:
+        """Aplica um evento de mudança apenas ao item afetado, sem recarregar a janela."""
+        item = str(mudanca.id)
+        if mudanca.op == controller.OP_ARQUIVADA and self.manter_arquivadas:
+            return
+        fora_do_filtro = (not self._fixa and self.filtro_status is not None and mudanca.tarefa is not None
+                          and mudanca.tarefa.status != self.filtro_status)
+        if mudanca.op in (controller.OP_REMOVIDA, controller.OP_ARQUIVADA) or fora_do_filtro:
+            if self.tree.exists(item):
+                self.tree.delete(item)
+        elif self.tree.exists(item):
+            # Fica na posição atual mesmo se a edição mudou a coluna ordenada
+            self.tree.item(item, **self._colunas(mudanca.tarefa))
+        elif (mudanca.op == controller.OP_INSERIDA and self._paginas and self.novas_no_topo
+              and not self._anteriores and not self._fixa):
+            # Tarefas novas são as mais recentes: só aparecem se a janela está no topo
+            self._paginas[0][1].append(self.tree.insert("", 0, iid=item, **self._colunas(mudanca.tarefa)))
+
+    def _remover(self, itens: List[str]) -> None:
+        """Remove da Treeview os itens de uma página descartada."""
+        existentes = [item for item in itens if self.tree.exists(item)]
+        if existentes:
+            self.tree.delete(*existentes)
+
+    def _ao_rolar(self, primeiro: str, ultimo: str) -> None:
+        """Atualiza a barra de rolagem e busca páginas ao atingir as bordas."""
+        self.scrollbar.set(primeiro, ultimo)
+        if self._agendado or not self._paginas:
+            return
+        if float(ultimo) >= 1.0 and self._paginas[-1][2] is not None:
+            self._agendado = True
+            apos = self._paginas[-1][2]
+            self.buscar_pagina(self.tamanho_pagina, apos,
+                               lambda pagina: self._receber_abaixo(apos, pagina), self._falhar)
+        elif float(primeiro) <= 0.0 and self._anteriores:
+            self._agendado = True
+            self.buscar_pagina(self.tamanho_pagina, self._anteriores[-1],
+                               self._receber_acima, self._falhar)
+
+    def _receber_abaixo(self, apos, pagina: Tuple) -> None:
+        """Acrescenta a próxima página no fim da janela."""
+        linhas, proximo = pagina
+        self._agendado = False
+        self._paginas.append((apos, self._inserir(linhas, "end"), proximo))
+        if len(self._paginas) > self.max_paginas:
+            cursor, itens, _ = self._paginas.popleft()
+            self._anteriores.append(cursor)
+            self._remover(itens)
+            # Compensa as linhas removidas acima para a vista não saltar
+            self.tree.yview_scroll(-len(itens), "units")
+
+    def _receber_acima(self, pagina: Tuple) -> None:
+        """Recoloca a página anterior no topo da janela."""
+        linhas, proximo = pagina
+        self._agendado = False
+        apos = self._anteriores.pop()
+        itens = self._inserir(linhas, 0)
+        self._paginas.appendleft((apos, itens, proximo))
+        if len(self._paginas) > self.max_paginas:
+            self._remover(self._paginas.pop()[1])
+        self.tree.yview_scroll(len(itens), "units")
+
+# (coluna, decrescente) da listagem antes de qualquer cabeçalho ser clicado
+ORDEM_PADRAO = ('data_criacao', True)
+
 class TaskManagerApp:
     """Classe principal da aplicação de gerenciamento de tarefas."""
     
-    def __init__(self):
+    def __init__(self, medir_inicio: bool = False):
         self.root = None
         self.lista_tarefas = None
+        self.lista_virtual = None
         self.entry_titulo = None
         self.entry_descricao = None
+        self.entry_busca = None
+        self._busca_agendada = None
+        self.label_status = None
+        self.label_contagem = None
+        self.incluir_arquivadas = None
+        self.combo_status = None
+        # Coluna e direção da listagem, aplicadas pelo banco
+        self._ordem = ORDEM_PADRAO
+        self.executor = ExecutorBanco(config.EXECUTOR_CONFIG['readers'])
+        # Marcos da inicialização em ms desde _INICIO; com medir_inicio a janela
+        # fecha sozinha após a primeira página e os imprime em JSON
+        self.marcos = {}
+        # Última mudança do changelog já aplicada à lista
+        self._seq = None
+        self._diagnostico = None
+        self._diagnostico_agendado = None
+        self._texto_diagnostico = None
+        self._medir_inicio = medir_inicio
         self._setup_ui()
         
     def _setup_ui(self):
         """Configura a interface do usuário."""
-        # Inicializar BD
-        try:
-            controller.inicializar()
-        except Exception as e:
-            logger.error(f"Erro ao inicializar sistema: {e}")
-            messagebox.showerror("Erro", "Erro ao inicializar o sistema. Verifique os logs.")
-            return
+        # Verificação do schema em segundo plano: a janela é desenhada enquanto o banco abre
+        self.executor.escrever(self._inicializar_banco, ao_concluir=self._banco_pronto,
+                               ao_falhar=self._falha_inicializacao)
+
+        # ttkthemes (e o Pillow que ele carrega) só é importado quando a janela é criada
+        from ttkthemes import ThemedTk
 
         # Janela principal
         self.root = ThemedTk(theme=config.WINDOW_CONFIG['theme'])
@@ -44,19 +219,181 @@ class TaskManagerApp:
         # Título
         tk.Label(frame_main, text=config.WINDOW_CONFIG['title'], 
                 bg=config.COLORS['background'], fg=config.COLORS['text'], 
-                font=config.FONTS['title']).pack(pady=(0, 20))
+                font=config.FONTS['title']).pack(pady=(0, 5))
+
+        # Contador de tarefas por status
+        self.label_contagem = tk.Label(frame_main, text="", bg=config.COLORS['background'],
+                                       fg=config.COLORS['text'], font=config.FONTS['label'])
+        self.label_contagem.pack(pady=(0, 15))
 
         # Campos de entrada
         self._create_input_fields(frame_main)
         
+        # Busca textual
+        self._create_search_field(frame_main)
+
         # Treeview de tarefas
         self._create_task_list(frame_main)
         
         # Botões de ação
         self._create_action_buttons(frame_main)
-        
-        # Carregar lista ao iniciar
+
+        # Indicador de operações em andamento
+        self.label_status = tk.Label(frame_main, text="", bg=config.COLORS['background'],
+                                     fg=config.COLORS['warning'], font=config.FONTS['label'])
+        self.label_status.pack()
+
+        # Resultados das operações de fundo são entregues por polling na thread do Tk
+        self._processar_resultados()
+        self.root.bind('<Map>', self._ao_mapear)
+        # Painel de diagnóstico oculto
+        self.root.bind('<Control-Shift-D>', lambda e: self._alternar_diagnostico())
+
+    def _marcar(self, marco: str):
+        """Registra o instante de um marco da inicialização."""
+        if marco not in self.marcos:
+            self.marcos[marco] = round((time.perf_counter() - _INICIO) * 1000, 1)
+            logger.info("Inicialização: %s em %s ms", marco, self.marcos[marco])
+
+    def _ao_mapear(self, evento):
+        """Marca a primeira pintura, feita no ciclo ocioso seguinte ao mapeamento."""
+        if evento.widget is self.root:
+            self.root.unbind('<Map>')
+            self.root.after_idle(self._marcar, 'primeira_pintura')
+
+    @staticmethod
+    def _inicializar_banco() -> int:
+        """Verifica o schema e retorna o ponto de partida do registro de mudanças."""
+        controller.inicializar()
+        return controller.ultima_mudanca()
+
+    def _banco_pronto(self, seq: int):
+        """Carrega a primeira página e começa a acompanhar o registro de mudanças."""
+        self._marcar('banco_pronto')
+        # A sequência é lida antes da página: nenhuma mudança feita entre as duas se perde
+        self._seq = seq
         self.atualizar_lista()
+        self.root.after(config.CHANGELOG_CONFIG['poll_ms'], self._sincronizar)
+        self.root.after(config.CHANGELOG_CONFIG['prune_interval_s'] * 1000, self._podar_mudancas)
+        if config.ARCHIVE_CONFIG['enabled']:
+            controller.iniciar_arquivamento()
+
+    def _sincronizar(self):
+        """Aplica só as mudanças feitas desde a última verificação, por esta ou outra instância."""
+        def proxima():
+            self.root.after(config.CHANGELOG_CONFIG['poll_ms'], self._sincronizar)
+
+        def aplicar(resultado):
+            self._seq, mudancas = resultado
+            if mudancas is None:
+                # Histórico podado ou mudanças demais: recarrega a janela visível (ou a busca)
+                self.buscar()
+            elif mudancas:
+                for mudanca in mudancas:
+                    self.lista_virtual.aplicar(mudanca)
+                self._atualizar_contagem()
+            proxima()
+
+        def falhar(erro):
+            logger.error("Erro ao sincronizar mudanças: %s", erro)
+            proxima()
+
+        self.executor.ler(controller.mudancas_desde, self._seq, ao_concluir=aplicar, ao_falhar=falhar)
+
+    def _podar_mudancas(self):
+        """Remove periodicamente as entradas antigas do registro de mudanças."""
+        self.executor.escrever(controller.podar_mudancas,
+                               ao_falhar=lambda e: logger.error("Erro ao podar o changelog: %s", e))
+        self.root.after(config.CHANGELOG_CONFIG['prune_interval_s'] * 1000, self._podar_mudancas)
+
+    def _primeira_pagina(self):
+        """Fecha os marcos da inicialização quando a primeira página é exibida."""
+        self._marcar('primeira_pagina')
+        if self._medir_inicio:
+            print(json.dumps(self.marcos), flush=True)
+            self.root.after_idle(self.root.destroy)
+
+    def _falha_inicializacao(self, erro: Exception):
+        """Encerra a aplicação se o banco não puder ser aberto."""
+        logger.error("Erro ao inicializar sistema: %s", erro)
+        messagebox.showerror("Erro", "Erro ao inicializar o sistema. Verifique os logs.")
+        self.root.destroy()
+
+    def _processar_resultados(self):
+        """Entrega os resultados do executor e agenda a próxima verificação."""
+        self.executor.processar_resultados()
+        self.label_status.config(text="Processando..." if self.executor.pendentes else "")
+        self.root.after(config.EXECUTOR_CONFIG['poll_ms'], self._processar_resultados)
+
+    def _falha(self, erro: Exception, acao: str):
+        """Mostra o erro de uma operação de fundo ao usuário."""
+        if isinstance(erro, ValueError):
+            messagebox.showwarning("Aviso", str(erro))
+        else:
+            logger.error("Erro ao %s: %s", acao, erro)
+            messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+
+    def _atualizar_contagem(self):
+        """Atualiza o contador de tarefas por status no cabeçalho."""
+        def mostrar(contagem):
+            self.label_contagem.config(text=config.MESSAGES['status_count'].format(
+                pendentes=contagem.get(controller.Status.PENDENTE, 0),
+                concluidas=contagem.get(controller.Status.CONCLUIDA, 0)))
+
+        self.executor.ler(controller.contar_por_status, ao_concluir=mostrar,
+                          ao_falhar=lambda e: logger.error("Erro ao contar tarefas: %s", e),
+                          chave='contagem')
+
+    def _buscar_pagina(self, limite, apos, ao_concluir, ao_falhar):
+        """Busca uma página da listagem em segundo plano, substituindo buscas antigas."""
+        if 'primeira_pagina' not in self.marcos:
+            receber = ao_concluir
+
+            def ao_concluir(pagina):
+                receber(pagina)
+                self._primeira_pagina()
+        ordenar_por, decrescente = self._ordem
+        self.executor.ler(controller.listar_pagina, limite, apos, self.lista_virtual.filtro_status,
+                          self.incluir_arquivadas.get(), ordenar_por, decrescente,
+                          ao_concluir=ao_concluir, ao_falhar=ao_falhar, chave='pagina')
+
+    def _escrever(self, escrita: Callable[[], object], leitura: Callable[[object], object],
+                  ao_concluir: Callable, ao_falhar: Callable):
+        """Executa `escrita` em segundo plano e, depois do commit, entrega
+        `leitura(resultado)` a `ao_concluir`.
+
+        Com a escrita em grupo ligada, a escrita vai direto para o escritor
+        em grupo do controller, sem esperar as anteriores: ações seguidas
+        (como concluir várias tarefas em sequência) dividem o mesmo commit.
+        """
+        if not controller.escrita_em_grupo_ativa():
+            self.executor.escrever(lambda: leitura(escrita()), ao_concluir=ao_concluir, ao_falhar=ao_falhar)
+            return
+        # A leitura só roda depois do commit do grupo, com o cache já invalidado
+        self.executor.acompanhar(
+            controller.submeter(escrita),
+            ao_concluir=lambda resultado: self.executor.ler(leitura, resultado, ao_concluir=ao_concluir,
+                                                           ao_falhar=ao_falhar),
+            ao_falhar=ao_falhar)
+
+    def _escrever_tarefa(self, operacao: Callable[[], object], op: str, task_id: int,
+                         mensagem: str, acao: str, depois: Optional[Callable] = None,
+                         ao_falhar: Optional[Callable[[Exception], None]] = None):
+        """Executa uma escrita sobre uma tarefa em segundo plano e aplica a mudança."""
+        def ler(alterada):
+            return controller.mudanca(op, task_id) if alterada else None
+
+        def concluido(mudanca):
+            if mudanca is None:
+                messagebox.showwarning("Aviso", "Tarefa não encontrada")
+                return
+            self.lista_virtual.aplicar(mudanca)
+            self._atualizar_contagem()
+            if depois:
+                depois()
+            messagebox.showinfo("Sucesso", mensagem)
+
+        self._escrever(operacao, ler, concluido, ao_falhar or (lambda e: self._falha(e, acao)))
 
     def _create_input_fields(self, parent):
         """Cria os campos de entrada."""
@@ -89,6 +426,53 @@ class TaskManagerApp:
                            font=config.FONTS['button'], relief="flat", bd=0)
         btn_add.grid(row=2, column=0, columnspan=2, pady=15)
 
+    def _create_search_field(self, parent):
+        """Cria o campo de busca, consultado enquanto o usuário digita."""
+        frame_busca = tk.Frame(parent, bg=config.COLORS['background'])
+        frame_busca.pack()
+
+        tk.Label(frame_busca, text="Buscar:", bg=config.COLORS['background'],
+                fg=config.COLORS['text'], font=config.FONTS['label']).grid(row=0, column=0, sticky="w")
+
+        self.entry_busca = tk.Entry(frame_busca, width=config.INPUT_CONFIG['width'],
+                                    bg=config.COLORS['secondary'], fg=config.COLORS['text'],
+                                    insertbackground=config.COLORS['text'],
+                                    font=config.FONTS['entry'], relief=config.INPUT_CONFIG['relief'])
+        self.entry_busca.grid(row=0, column=1, padx=10, pady=5)
+        self.entry_busca.bind('<KeyRelease>', lambda e: self._agendar_busca())
+
+        # Filtro de status da listagem, aplicado no banco
+        tk.Label(frame_busca, text="Status:", bg=config.COLORS['background'],
+                fg=config.COLORS['text'], font=config.FONTS['label']).grid(row=0, column=2, sticky="w")
+        self.combo_status = ttk.Combobox(frame_busca, values=['todas', 'pendente', 'concluida'],
+                                         state="readonly", width=10)
+        self.combo_status.set('todas')
+        self.combo_status.grid(row=0, column=3, padx=(10, 0), pady=5)
+        self.combo_status.bind('<<ComboboxSelected>>', lambda e: self._filtrar_status())
+
+    def _filtrar_status(self):
+        """Recarrega a lista só com as tarefas do status escolhido."""
+        valor = self.combo_status.get()
+        self.lista_virtual.filtro_status = None if valor == 'todas' else controller.Status.de_valor(valor)
+        self.buscar()
+
+    def _agendar_busca(self):
+        """Adia a busca até o usuário parar de digitar."""
+        if self._busca_agendada is not None:
+            self.root.after_cancel(self._busca_agendada)
+        self._busca_agendada = self.root.after(config.SEARCH_CONFIG['debounce_ms'], self.buscar)
+
+    def buscar(self):
+        """Mostra as tarefas que correspondem ao texto da busca, ou a lista completa se vazio."""
+        self._busca_agendada = None
+        texto = self.entry_busca.get().strip()
+        if not texto:
+            self.atualizar_lista()
+            return
+        # Mesma chave da paginação: a busca substitui carregamentos pendentes e vice-versa
+        self.executor.ler(controller.buscar_tarefas, texto, ao_concluir=self.lista_virtual.mostrar,
+                          ao_falhar=lambda e: self._falha(e, "buscar tarefas"), chave='pagina')
+
     def _create_task_list(self, parent):
         """Cria a lista de tarefas."""
         style = ttk.Style()
@@ -97,12 +481,20 @@ class TaskManagerApp:
                        fieldbackground=config.COLORS['secondary'])
         style.map("Treeview", background=[("selected", config.COLORS['accent'])])
 
-        self.lista_tarefas = ttk.Treeview(parent, columns=("ID", "Título", "Descrição", "Status"), 
-                                        show="headings", height=config.TABLE_CONFIG['height'])
+        frame_lista = tk.Frame(parent, bg=config.COLORS['background'])
+        frame_lista.pack(pady=10)
+
+        self.lista_tarefas = ttk.Treeview(frame_lista, columns=("ID", "Título", "Descrição", "Status"), 
+                                        show="headings", height=config.TABLE_CONFIG['height'],
+                                        selectmode="extended")
+        scrollbar = ttk.Scrollbar(frame_lista, orient="vertical")
         
-        # Configurar cabeçalhos e colunas
+        # Configurar cabeçalhos e colunas; os ordenáveis alternam a ordenação ao clicar
         for col, width in config.TABLE_CONFIG['columns'].items():
-            self.lista_tarefas.heading(col, text=col)
+            if col in config.TABLE_CONFIG['sort_columns']:
+                self.lista_tarefas.heading(col, text=col, command=lambda c=col: self._ordenar(c))
+            else:
+                self.lista_tarefas.heading(col, text=col)
             self.lista_tarefas.column(col, width=width)
 
         # Configurar tags de status
@@ -110,7 +502,93 @@ class TaskManagerApp:
         self.lista_tarefas.tag_configure("concluída", foreground=config.COLORS['success'])
         self.lista_tarefas.tag_configure("concluida", foreground=config.COLORS['success'])
 
-        self.lista_tarefas.pack(pady=10)
+        self.lista_tarefas.pack(side="left")
+        scrollbar.pack(side="right", fill="y")
+
+        # Página = linhas visíveis + folga, para a rolagem não esbarrar na borda a cada linha
+        self.lista_virtual = ListaVirtual(
+            self.lista_tarefas, scrollbar, self._buscar_pagina,
+            lambda e: self._falha(e, "atualizar lista"),
+            tamanho_pagina=config.TABLE_CONFIG['height'] + config.TABLE_CONFIG['buffer'],
+            max_paginas=config.TABLE_CONFIG['max_pages'])
+
+    def _ordenar(self, coluna: str):
+        """Ordena a lista pela coluna clicada: crescente, decrescente e, no
+        terceiro clique, de volta à ordem padrão (mais recentes primeiro).
+
+        A ordenação é refeita pelo banco a partir da primeira página, nunca
+        sobre as linhas já carregadas.
+        """
+        ordenar_por = config.TABLE_CONFIG['sort_columns'][coluna]
+        atual, decrescente = self._ordem
+        if ordenar_por != atual:
+            self._ordem = (ordenar_por, False)
+        elif not decrescente:
+            self._ordem = (ordenar_por, True)
+        else:
+            self._ordem = ORDEM_PADRAO
+        self.lista_virtual.novas_no_topo = self._ordem in (ORDEM_PADRAO, ('id', True))
+        for col in config.TABLE_CONFIG['sort_columns']:
+            seta = ""
+            if col == coluna and self._ordem != ORDEM_PADRAO:
+                seta = " ▼" if self._ordem[1] else " ▲"
+            self.lista_tarefas.heading(col, text=col + seta)
+        self.buscar()
+
+    def _alternar_diagnostico(self):
+        """Abre ou fecha o painel de diagnóstico com as métricas do controller (Ctrl+Shift+D)."""
+        if self._diagnostico is not None:
+            self.root.after_cancel(self._diagnostico_agendado)
+            self._diagnostico.destroy()
+            self._diagnostico = None
+            return
+
+        janela = tk.Toplevel(self.root, bg=config.COLORS['background'], padx=10, pady=10)
+        janela.title("Diagnóstico")
+        janela.protocol("WM_DELETE_WINDOW", self._alternar_diagnostico)
+
+        frame_controles = tk.Frame(janela, bg=config.COLORS['background'])
+        frame_controles.pack(fill="x", pady=(0, 5))
+        ativo = tk.BooleanVar(value=controller.metricas()['ativo'])
+        tk.Checkbutton(frame_controles, text="Instrumentação ligada", variable=ativo,
+                       command=lambda: controller.configurar_metricas(ativo.get()),
+                       bg=config.COLORS['background'], fg=config.COLORS['text'],
+                       selectcolor=config.COLORS['secondary'], activebackground=config.COLORS['background'],
+                       font=config.FONTS['label']).pack(side="left")
+        tk.Button(frame_controles, text="Zerar", command=controller.zerar_metricas,
+                  bg=config.COLORS['accent'], fg=config.COLORS['text'],
+                  activebackground=config.COLORS['accent_hover'], relief="flat", bd=0,
+                  font=config.FONTS['button']).pack(side="right")
+
+        self._texto_diagnostico = tk.Text(janela, width=110, height=30, bg=config.COLORS['secondary'],
+                                          fg=config.COLORS['text'], font=config.FONTS['mono'], relief="flat")
+        self._texto_diagnostico.pack(fill="both", expand=True)
+        self._diagnostico = janela
+        self._atualizar_diagnostico()
+
+    def _atualizar_diagnostico(self):
+        """Redesenha o painel de diagnóstico uma vez por segundo enquanto estiver aberto."""
+        if self._diagnostico is None:
+            return
+        dados = controller.metricas()
+        linhas = [f"{'função':<40}{'chamadas':>9}{'erros':>7}{'média ms':>10}{'p50':>8}{'p99':>8}"
+                  f"{'sql':>8}{'linhas':>9}"]
+        for nome, funcao in dados['funcoes'].items():
+            linhas.append(f"{nome:<40}{funcao['chamadas']:>9}{funcao['erros']:>7}{funcao['media_ms']:>10}"
+                          f"{funcao['p50_ms']:>8}{funcao['p99_ms']:>8}{funcao['sql']:>8}{funcao['linhas']:>9}")
+        linhas += [
+            "",
+            f"SQL por tipo: {dados['sql_por_tipo']}",
+            f"Cache: {dados['cache']}",
+            f"Operações em segundo plano pendentes: {self.executor.pendentes}",
+            f"Última mudança aplicada: {self._seq}",
+            f"Inicialização (ms): {self.marcos}",
+        ]
+        if not dados['ativo']:
+            linhas.insert(0, "Instrumentação desligada: os contadores não estão sendo atualizados.\n")
+        self._texto_diagnostico.delete("1.0", "end")
+        self._texto_diagnostico.insert("end", "\n".join(linhas))
+        self._diagnostico_agendado = self.root.after(1000, self._atualizar_diagnostico)
 
     def _create_action_buttons(self, parent):
         """Cria os botões de ação."""
@@ -131,26 +609,23 @@ class TaskManagerApp:
                            font=config.FONTS['button'], relief="flat", bd=0)
             btn.grid(row=0, column=i, padx=5)
 
+        # Tarefas arquivadas ficam fora da listagem, a não ser que pedidas
+        self.incluir_arquivadas = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame_botoes, text="Mostrar arquivadas", variable=self.incluir_arquivadas,
+                       command=self._alternar_arquivadas,
+                       bg=config.COLORS['background'], fg=config.COLORS['text'],
+                       selectcolor=config.COLORS['secondary'], activebackground=config.COLORS['background'],
+                       font=config.FONTS['label']).grid(row=1, column=0, columnspan=len(buttons), pady=(5, 0))
+
+    def _alternar_arquivadas(self):
+        """Recarrega a lista com ou sem as tarefas arquivadas."""
+        self.lista_virtual.manter_arquivadas = self.incluir_arquivadas.get()
+        self.buscar()
+
     def atualizar_lista(self):
         """Atualiza a lista de tarefas na interface."""
-        try:
-            # Limpar lista atual
-            for item in self.lista_tarefas.get_children():
-                self.lista_tarefas.delete(item)
-            
-            # Carregar tarefas do banco
-            tarefas = controller.listar()
-            
-            # Inserir tarefas na lista
-            for tarefa in tarefas:
-                self.lista_tarefas.insert("", "end", 
-                                        values=(tarefa[0], tarefa[1], tarefa[2], tarefa[3]), 
-                                        tags=(tarefa[3],))
-            logger.info(f"Lista atualizada com {len(tarefas)} tarefas")
-            
-        except Exception as e:
-            logger.error(f"Erro ao atualizar lista: {e}")
-            messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+        self.lista_virtual.recarregar()
+        self._atualizar_contagem()
 
     def adicionar_tarefa(self):
         """Adiciona uma nova tarefa."""
@@ -161,18 +636,43 @@ class TaskManagerApp:
             messagebox.showwarning("Aviso", config.MESSAGES['empty_title'])
             return
         
-        try:
-            controller.adicionar_tarefa(titulo, descricao)
+        def ler(task_id):
+            return controller.mudanca(controller.OP_INSERIDA, task_id)
+
+        def concluido(mudanca):
             self.entry_titulo.delete(0, tk.END)
             self.entry_descricao.delete(0, tk.END)
-            self.atualizar_lista()
+            self.lista_virtual.aplicar(mudanca)
+            self._atualizar_contagem()
             messagebox.showinfo("Sucesso", config.MESSAGES['task_added'])
-            
-        except ValueError as e:
-            messagebox.showwarning("Aviso", str(e))
-        except Exception as e:
-            logger.error(f"Erro ao adicionar tarefa: {e}")
-            messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+
+        self._escrever(lambda: controller.adicionar_tarefa(titulo, descricao), ler, concluido,
+                       lambda e: self._falha(e, "adicionar tarefa"))
+
+    def _escrever_lote(self, operacao: Callable[[], int], op: str, task_ids: List[int],
+                       mensagem: str, acao: str):
+        """Executa uma escrita em lote em segundo plano e aplica as mudanças."""
+        def ler(afetadas):
+            return afetadas, controller.mudancas(op, task_ids)
+
+        def concluido(resultado):
+            afetadas, mudancas = resultado
+            for mudanca in mudancas:
+                self.lista_virtual.aplicar(mudanca)
+            self._atualizar_contagem()
+            messagebox.showinfo("Sucesso", mensagem.format(n=afetadas))
+
+        self._escrever(operacao, ler, concluido, lambda e: self._falha(e, acao))
+
+    def _get_selected_task_ids(self) -> List[int]:
+        """Obtém os IDs de todas as tarefas selecionadas."""
+        task_ids = []
+        for item in self.lista_tarefas.selection():
+            try:
+                task_ids.append(int(self.lista_tarefas.item(item, "values")[0]))
+            except (IndexError, ValueError):
+                continue
+        return task_ids
 
     def _get_selected_task_id(self) -> Optional[int]:
         """Obtém o ID da tarefa selecionada."""
@@ -183,23 +683,21 @@ class TaskManagerApp:
             return None
 
     def concluir_tarefa(self):
-        """Marca uma tarefa como concluída."""
-        task_id = self._get_selected_task_id()
-        if not task_id:
+        """Marca as tarefas selecionadas como concluídas."""
+        task_ids = self._get_selected_task_ids()
+        if not task_ids:
             messagebox.showwarning("Aviso", config.MESSAGES['select_task'])
             return
-        
-        try:
-            success = controller.concluir(task_id)
-            if success:
-                self.atualizar_lista()
-                messagebox.showinfo("Sucesso", config.MESSAGES['task_completed'])
-            else:
-                messagebox.showwarning("Aviso", "Tarefa não encontrada")
-                
-        except Exception as e:
-            logger.error(f"Erro ao concluir tarefa: {e}")
-            messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+
+        if len(task_ids) > 1:
+            self._escrever_lote(lambda: controller.atualizar_status_em_lote(task_ids, "concluida"),
+                                controller.OP_ATUALIZADA, task_ids,
+                                config.MESSAGES['tasks_completed'], "concluir tarefas")
+            return
+
+        task_id = task_ids[0]
+        self._escrever_tarefa(lambda: controller.concluir(task_id), controller.OP_ATUALIZADA,
+                              task_id, config.MESSAGES['task_completed'], "concluir tarefa")
 
     def editar_tarefa(self):
         """Abre janela para editar uma tarefa."""
@@ -208,20 +706,17 @@ class TaskManagerApp:
             messagebox.showwarning("Aviso", config.MESSAGES['select_task'])
             return
         
-        try:
-            # Buscar dados da tarefa
-            tarefa = controller.buscar_tarefa(task_id)
+        def abrir(tarefa):
             if not tarefa:
                 messagebox.showwarning("Aviso", "Tarefa não encontrada")
                 return
-            
-            self._open_edit_window(task_id, tarefa[1], tarefa[2], tarefa[3])
-            
-        except Exception as e:
-            logger.error(f"Erro ao buscar tarefa para edição: {e}")
-            messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+            self._open_edit_window(task_id, tarefa)
+
+        # Buscar dados da tarefa
+        self.executor.ler(controller.buscar_tarefa, task_id, ao_concluir=abrir,
+                          ao_falhar=lambda e: self._falha(e, "buscar tarefa para edição"))
 
-    def _open_edit_window(self, task_id: int, titulo_atual: str, descricao_atual: str, status_atual: str):
+    def _open_edit_window(self, task_id: int, tarefa: controller.Tarefa):
         """Abre janela de edição de tarefa."""
         edit_win = tk.Toplevel(self.root)
         edit_win.title("Editar Tarefa")
@@ -242,7 +737,6 @@ class TaskManagerApp:
         entry_titulo_edit = tk.Entry(edit_win, width=30, bg=config.COLORS['secondary'], 
                                    fg=config.COLORS['text'], font=config.FONTS['entry'], relief="flat")
         entry_titulo_edit.grid(row=0, column=1, padx=10, pady=10)
-        entry_titulo_edit.insert(0, titulo_atual)
 
         tk.Label(edit_win, text="Descrição:", bg=config.COLORS['background'], 
                 fg=config.COLORS['text'], font=config.FONTS['label']).grid(row=1, column=0, padx=10, pady=10)
@@ -250,47 +744,70 @@ class TaskManagerApp:
         entry_descricao_edit = tk.Entry(edit_win, width=30, bg=config.COLORS['secondary'], 
                                       fg=config.COLORS['text'], font=config.FONTS['entry'], relief="flat")
         entry_descricao_edit.grid(row=1, column=1, padx=10, pady=10)
-        entry_descricao_edit.insert(0, descricao_atual)
 
         # Campo de Status
         tk.Label(edit_win, text="Status:", bg=config.COLORS['background'], 
                 fg=config.COLORS['text'], font=config.FONTS['label']).grid(row=2, column=0, padx=10, pady=10)
         
         status_values = ['pendente', 'concluida']
-        # normalizar status atual (pode vir com acento)
-        status_norm = 'concluida' if status_atual.lower().startswith('conclu') else 'pendente'
         status_combo = ttk.Combobox(edit_win, values=status_values, state="readonly")
         status_combo.grid(row=2, column=1, padx=10, pady=10, sticky="w")
-        status_combo.set(status_norm)
+
+        # Tarefa como foi lida: base dos campos alterados e versão esperada ao salvar
+        original = {}
+
+        def carregar(atual: controller.Tarefa):
+            original.update(titulo=atual.titulo, descricao=atual.descricao or "",
+                            status=atual.status.rotulo, versao=atual.versao)
+            entry_titulo_edit.delete(0, tk.END)
+            entry_titulo_edit.insert(0, original['titulo'])
+            entry_descricao_edit.delete(0, tk.END)
+            entry_descricao_edit.insert(0, original['descricao'])
+            status_combo.set(original['status'])
+
+        carregar(tarefa)
+
+        def recarregar():
+            """Mostra a versão gravada por outro usuário na janela e na lista."""
+            def aplicar(mudanca):
+                self.lista_virtual.aplicar(mudanca)
+                if mudanca.tarefa is None:
+                    messagebox.showwarning("Aviso", "Tarefa não encontrada")
+                    edit_win.destroy()
+                elif edit_win.winfo_exists():
+                    carregar(mudanca.tarefa)
+
+            self.executor.ler(controller.mudanca, controller.OP_ATUALIZADA, task_id, ao_concluir=aplicar,
+                              ao_falhar=lambda e: self._falha(e, "recarregar tarefa"))
 
         def salvar_edicao():
-            novo_titulo = entry_titulo_edit.get().strip()
-            nova_descricao = entry_descricao_edit.get().strip()
-            novo_status = status_combo.get().strip()
+            editados = {
+                'titulo': entry_titulo_edit.get().strip(),
+                'descricao': entry_descricao_edit.get().strip(),
+                'status': status_combo.get().strip(),
+            }
             
-            if not novo_titulo:
+            if not editados['titulo']:
                 messagebox.showwarning("Aviso", config.MESSAGES['empty_title'])
                 return
-            
-            try:
-                success_main = controller.editar_tarefa(task_id, novo_titulo, nova_descricao)
-                # Atualizar status se mudou
-                success_status = True
-                if novo_status and novo_status != status_norm:
-                    success_status = controller.atualizar_status(task_id, novo_status)
-
-                if success_main and success_status:
-                    self.atualizar_lista()
-                    edit_win.destroy()
-                    messagebox.showinfo("Sucesso", config.MESSAGES['task_updated'])
+
+            # Só grava o que mudou: edições de outros usuários em outros campos são preservadas
+            campos = {campo: valor for campo, valor in editados.items() if valor != original[campo]}
+            if not campos:
+                edit_win.destroy()
+                return
+
+            def falhou(erro):
+                if isinstance(erro, controller.ConflitoVersao):
+                    messagebox.showwarning("Aviso", config.MESSAGES['edit_conflict'])
+                    recarregar()
                 else:
-                    messagebox.showwarning("Aviso", "Tarefa não encontrada")
-                    
-            except ValueError as e:
-                messagebox.showwarning("Aviso", str(e))
-            except Exception as e:
-                logger.error(f"Erro ao editar tarefa: {e}")
-                messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+                    self._falha(erro, "editar tarefa")
+
+            self._escrever_tarefa(lambda: controller.atualizar_campos(task_id, original['versao'], **campos),
+                                  controller.OP_ATUALIZADA, task_id,
+                                  config.MESSAGES['task_updated'], "editar tarefa",
+                                  depois=edit_win.destroy, ao_falhar=falhou)
 
         btn_salvar = tk.Button(edit_win, text="Salvar", command=salvar_edicao, 
                               bg=config.COLORS['accent'], fg=config.COLORS['text'], 
@@ -298,38 +815,43 @@ class TaskManagerApp:
         btn_salvar.grid(row=3, column=0, columnspan=2, pady=(5,15))
 
     def excluir_tarefa(self):
-        """Exclui uma tarefa após confirmação."""
-        task_id = self._get_selected_task_id()
-        if not task_id:
+        """Exclui as tarefas selecionadas após confirmação."""
+        task_ids = self._get_selected_task_ids()
+        if not task_ids:
             messagebox.showwarning("Aviso", config.MESSAGES['select_task'])
             return
+
+        if len(task_ids) > 1:
+            if messagebox.askyesno("Confirmar", config.MESSAGES['confirm_delete_many'].format(n=len(task_ids))):
+                self._escrever_lote(lambda: controller.deletar_em_lote(task_ids),
+                                    controller.OP_REMOVIDA, task_ids,
+                                    config.MESSAGES['tasks_deleted'], "excluir tarefas")
+            return
+
+        task_id = task_ids[0]
         
         # Confirmar exclusão
         if messagebox.askyesno("Confirmar", config.MESSAGES['confirm_delete']):
-            try:
-                success = controller.deletar(task_id)
-                if success:
-                    self.atualizar_lista()
-                    messagebox.showinfo("Sucesso", config.MESSAGES['task_deleted'])
-                else:
-                    messagebox.showwarning("Aviso", "Tarefa não encontrada")
-                    
-            except Exception as e:
-                logger.error(f"Erro ao excluir tarefa: {e}")
-                messagebox.showerror("Erro", config.MESSAGES['error_generic'])
+            self._escrever_tarefa(lambda: controller.deletar(task_id), controller.OP_REMOVIDA,
+                                  task_id, config.MESSAGES['task_deleted'], "excluir tarefa")
 
     def run(self):
         """Inicia a aplicação."""
         if self.root:
-            self.root.mainloop()
+            try:
+                self.root.mainloop()
+            finally:
+                self.executor.encerrar()
+                controller.finalizar()
 
 def main():
     """Função principal da aplicação."""
+    logs.configurar_logs()
     try:
-        app = TaskManagerApp()
+        app = TaskManagerApp(medir_inicio=os.environ.get("TAREFAS_MEDIR_INICIO") == "1")
         app.run()
     except Exception as e:
-        logger.error(f"Erro fatal na aplicação: {e}")
+        logger.error("Erro fatal na aplicação: %s", e)
         messagebox.showerror("Erro Fatal", "Erro crítico na aplicação. Verifique os logs.")
 
 if __name__ == "__main__":
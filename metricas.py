@@ -0,0 +1,257 @@
+"""
+Instrumentação do model e do controller: chamadas, histogramas de latência,
+comandos SQL executados e linhas retornadas por função.
+
+As funções marcadas com @instrumentar só verificam uma flag enquanto a
+instrumentação está desligada. Ligada, cada chamada registra sua latência
+e os comandos SQL executados na mesma thread durante a chamada, capturados
+por sqlite3.Connection.set_trace_callback (ver model.conectar).
+"""
+
+import bisect
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Limites superiores (ms) dos baldes do histograma de latência; o último é aberto
+LIMITES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_ativo = bool(config.METRICS_CONFIG['enabled'])
+_lock = threading.Lock()
+_local = threading.local()
+
+class Histograma:
+    """Histograma de latências em baldes fixos (LIMITES_MS)."""
+
+    __slots__ = ('baldes', 'total', 'soma_ms', 'maximo_ms')
+
+    def __init__(self):
+        self.baldes = [0] * (len(LIMITES_MS) + 1)
+        self.total = 0
+        self.soma_ms = 0.0
+        self.maximo_ms = 0.0
+
+    def observar(self, ms: float) -> None:
+        self.baldes[bisect.bisect_left(LIMITES_MS, ms)] += 1
+        self.total += 1
+        self.soma_ms += ms
+        if ms > self.maximo_ms:
+            self.maximo_ms = ms
+
+    def percentil(self, p: float) -> Optional[float]:
+        """Limite superior do balde que contém o percentil `p` (0 a 1)."""
+        if not self.total:
+            return None
+        alvo = p * self.total
+        acumulado = 0
+        for indice, quantidade in enumerate(self.baldes):
+            acumulado += quantidade
+            if acumulado >= alvo:
+                return LIMITES_MS[indice] if indice < len(LIMITES_MS) else self.maximo_ms
+        return self.maximo_ms
+
+    def como_dict(self) -> dict:
+        baldes = {f"<={limite}": quantidade for limite, quantidade in zip(LIMITES_MS, self.baldes) if quantidade}
+        if self.baldes[-1]:
+            baldes[f">{LIMITES_MS[-1]}"] = self.baldes[-1]
+        return {
+            'media_ms': round(self.soma_ms / self.total, 3) if self.total else None,
+            'p50_ms': self.percentil(0.50),
+            'p99_ms': self.percentil(0.99),
+            'max_ms': round(self.maximo_ms, 3),
+            'baldes': baldes,
+        }
+
+class _Estatistica:
+    """Contadores de uma função instrumentada."""
+
+    __slots__ = ('chamadas', 'erros', 'latencia', 'sql', 'linhas')
+
+    def __init__(self):
+        self.chamadas = 0
+        self.erros = 0
+        self.latencia = Histograma()
+        self.sql = 0
+        self.linhas = 0
+
+_funcoes: Dict[str, _Estatistica] = {}
+_sql_por_tipo: Dict[str, int] = {}
+
+def ativo() -> bool:
+    """Indica se a instrumentação está ligada."""
+    return _ativo
+
+def ativar(ligado: bool = True) -> None:
+    """Liga ou desliga a instrumentação. Os contadores acumulados são mantidos."""
+    global _ativo
+    _ativo = ligado
+    logger.info("Instrumentação %s", 'ligada' if ligado else 'desligada')
+
+def zerar() -> None:
+    """Descarta todos os contadores."""
+    with _lock:
+        _funcoes.clear()
+        _sql_por_tipo.clear()
+
+def _linhas(resultado) -> int:
+    """Linhas de tarefa contidas no resultado de uma função do model ou controller."""
+    if resultado is None or isinstance(resultado, (bool, int, str, dict)):
+        return 0
+    if isinstance(resultado, list):
+        return len(resultado)
+    if isinstance(resultado, tuple):
+        # Página da listagem: (tarefas, cursor) ou (seq, mudanças)
+        return sum(len(parte) for parte in resultado if isinstance(parte, list))
+    return 1
+
+def _registrar(nome: str, inicio: float, sql: int, linhas: int, erro: bool) -> None:
+    ms = (time.perf_counter() - inicio) * 1000
+    with _lock:
+        estatistica = _funcoes.get(nome)
+        if estatistica is None:
+            estatistica = _funcoes[nome] = _Estatistica()
+        estatistica.chamadas += 1
+        estatistica.erros += erro
+        estatistica.sql += sql
+        estatistica.linhas += linhas
+        estatistica.latencia.observar(ms)
+
+def registrar_sql(sql: str) -> None:
+    """Callback de set_trace_callback: conta o comando para as chamadas em curso na thread."""
+    texto = sql.lstrip()
+    if texto.startswith("--"):
+        # Comandos executados por gatilhos chegam como comentários "-- TRIGGER nome"
+        tipo = "GATILHO"
+    else:
+        tipo = texto.split(None, 1)[0].upper() if texto else "?"
+    with _lock:
+        _sql_por_tipo[tipo] = _sql_por_tipo.get(tipo, 0) + 1
+    if tipo != "GATILHO":
+        for chamada in getattr(_local, 'pilha', ()):
+            chamada[1] += 1
+
+def _pilha() -> List[list]:
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+def instrumentar(funcao: Callable) -> Callable:
+    """Decorador que registra chamadas, latência, SQL e linhas de `funcao`.
+
+    Em geradores a latência vai do início até o esgotamento (ou fechamento)
+    e as linhas são os itens produzidos.
+    """
+    nome = f"{funcao.__module__}.{funcao.__qualname__}"
+
+    if inspect.isgeneratorfunction(funcao):
+        @functools.wraps(funcao)
+        def gerador(*args, **kwargs):
+            if not _ativo:
+                yield from funcao(*args, **kwargs)
+                return
+            pilha = _pilha()
+            chamada = [nome, 0]
+            linhas, erro = 0, True
+            inicio = time.perf_counter()
+            iterador = funcao(*args, **kwargs)
+            try:
+                while True:
+                    # Só conta o SQL executado enquanto o próprio gerador está rodando
+                    pilha.append(chamada)
+                    try:
+                        item = next(iterador)
+                    except StopIteration:
+                        break
+                    finally:
+                        pilha.pop()
+                    linhas += 1
+                    yield item
+                erro = False
+            except GeneratorExit:
+                erro = False
+                raise
+            finally:
+                iterador.close()
+                _registrar(nome, inicio, chamada[1], linhas, erro)
+        return gerador
+
+    @functools.wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        if not _ativo:
+            return funcao(*args, **kwargs)
+        pilha = _pilha()
+        chamada = [nome, 0]
+        pilha.append(chamada)
+        inicio = time.perf_counter()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except BaseException:
+            pilha.pop()
+            _registrar(nome, inicio, chamada[1], 0, True)
+            raise
+        pilha.pop()
+        _registrar(nome, inicio, chamada[1], _linhas(resultado), False)
+        return resultado
+
+    return envoltorio
+
+def snapshot() -> dict:
+    """Cópia dos contadores atuais, pronta para serializar em JSON."""
+    with _lock:
+        return {
+            'ativo': _ativo,
+            'instante': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'sql_por_tipo': dict(_sql_por_tipo),
+            'funcoes': {
+                nome: {'chamadas': e.chamadas, 'erros': e.erros, 'sql': e.sql, 'linhas': e.linhas,
+                       **e.latencia.como_dict()}
+                for nome, e in sorted(_funcoes.items())
+            },
+        }
+
+_parar_despejo = threading.Event()
+_despejo: Optional[threading.Thread] = None
+
+def despejar(caminho: str) -> None:
+    """Acrescenta o snapshot atual a `caminho`, uma linha JSON por snapshot."""
+    with open(caminho, "a", encoding="utf-8") as arquivo:
+        arquivo.write(json.dumps(snapshot(), ensure_ascii=False) + "\n")
+
+def iniciar_despejo(caminho: str, intervalo_s: float) -> None:
+    """Despeja o snapshot em `caminho` a cada `intervalo_s` segundos, numa thread de fundo."""
+    global _despejo
+    parar_despejo()
+    _parar_despejo.clear()
+
+    def executar():
+        while not _parar_despejo.wait(intervalo_s):
+            try:
+                despejar(caminho)
+            except OSError as e:
+                logger.error("Erro ao gravar métricas em %s: %s", caminho, e)
+
+    _despejo = threading.Thread(target=executar, name="metricas-despejo", daemon=True)
+    _despejo.start()
+    logger.info("Métricas gravadas em %s a cada %ss", caminho, intervalo_s)
+
+def parar_despejo(caminho: Optional[str] = None) -> None:
+    """Interrompe o despejo periódico; com `caminho`, grava um último snapshot."""
+    global _despejo
+    if _despejo is not None:
+        _parar_despejo.set()
+        _despejo.join()
+        _despejo = None
+    if caminho:
+        try:
+            despejar(caminho)
+        except OSError as e:
+            logger.error("Erro ao gravar métricas em %s: %s", caminho, e)
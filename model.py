@@ -1,65 +1,820 @@
 import sqlite3
 import logging
-from typing import List, Tuple, Optional
-from contextlib import contextmanager
+import os
+import re
+import time
+import queue
+import threading
+import atexit
+from collections import deque
+from enum import IntEnum
+from itertools import islice
+from typing import Callable, List, Tuple, Optional, Iterator, Iterable, Union
+from contextlib import closing, contextmanager
+
+import config
+import metricas
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 DB_NAME = "database.db"
 
+class Status(IntEnum):
+    """Status de uma tarefa, representado por um inteiro pequeno."""
+    PENDENTE = 0
+    CONCLUIDA = 1
+
+    @property
+    def rotulo(self) -> str:
+        """Texto canônico do status, usado no banco e na interface."""
+        return _ROTULOS_STATUS[self]
+
+    @classmethod
+    def de_valor(cls, valor: Union['Status', int, str]) -> 'Status':
+        """Converte um Status, código inteiro ou texto (com ou sem acento) em Status."""
+        if isinstance(valor, str):
+            if valor not in config.VALID_STATUSES:
+                raise ValueError(f"Status inválido. Use um dos seguintes: {config.VALID_STATUSES}")
+            return cls.CONCLUIDA if valor.startswith('conclu') else cls.PENDENTE
+        try:
+            return cls(valor)
+        except ValueError:
+            raise ValueError(f"Status inválido. Use um dos seguintes: {config.VALID_STATUSES}")
+
+_ROTULOS_STATUS = {Status.PENDENTE: 'pendente', Status.CONCLUIDA: 'concluida'}
+
+class Tarefa:
+    """Registro compacto de uma tarefa, com atributos nomeados e sem __dict__."""
+
+    __slots__ = ('id', 'titulo', 'descricao', 'status', 'data_criacao', 'data_atualizacao', 'versao')
+
+    def __init__(self, id: int, titulo: str, descricao: Optional[str], status: Status,
+                 data_criacao: Optional[str], data_atualizacao: Optional[str], versao: int = 1):
+        self.id = id
+        self.titulo = titulo
+        self.descricao = descricao
+        self.status = status
+        self.data_criacao = data_criacao
+        self.data_atualizacao = data_atualizacao
+        self.versao = versao
+
+    def como_dict(self) -> dict:
+        """Representação em dicionário, com o status como texto."""
+        dados = {campo: getattr(self, campo) for campo in self.__slots__}
+        dados['status'] = self.status.rotulo
+        return dados
+
+    def __eq__(self, outra) -> bool:
+        if not isinstance(outra, Tarefa):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outra, campo) for campo in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Tarefa(id={self.id}, titulo={self.titulo!r}, status={self.status.rotulo})"
+
+class ConflitoVersao(Exception):
+    """A tarefa foi alterada por outro cliente depois de ter sido lida."""
+
+    def __init__(self, id: int, esperada: int, atual: int):
+        super().__init__(f"Tarefa {id} foi alterada por outro usuário (versão {atual}, esperada {esperada})")
+        self.id = id
+        self.esperada = esperada
+        self.atual = atual
+
+# Operações registradas em tarefas_changelog
+OP_INSERIDA = 'inserida'
+OP_ATUALIZADA = 'atualizada'
+OP_REMOVIDA = 'removida'
+OP_ARQUIVADA = 'arquivada'
+
+# Colunas lidas para montar uma Tarefa, na ordem esperada por _linha_para_tarefa
+COLUNAS_TAREFA = "id, titulo, descricao, status, data_criacao, data_atualizacao, versao"
+
+def _linha_para_tarefa(cursor: sqlite3.Cursor, linha: tuple) -> Tarefa:
+    """row_factory que converte uma linha de COLUNAS_TAREFA em Tarefa."""
+    return Tarefa(linha[0], linha[1], linha[2], Status(linha[3]), linha[4], linha[5], linha[6])
+
+def _cursor_tarefas(conn: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor cujas linhas são devolvidas como Tarefa."""
+    cursor = conn.cursor()
+    cursor.row_factory = _linha_para_tarefa
+    return cursor
+
+# Ordem em que os PRAGMAs do perfil são aplicados: busy_timeout primeiro para
+# que a troca de journal_mode espere por outros processos em vez de falhar
+ORDEM_PRAGMAS = ['busy_timeout', 'journal_mode', 'synchronous', 'cache_size', 'mmap_size', 'temp_store']
+
+def pragmas_perfil(nome: Optional[str] = None) -> List[str]:
+    """Retorna os PRAGMAs do perfil de armazenamento configurado."""
+    nome = nome or config.DATABASE_CONFIG['storage_profile']
+    if nome not in config.STORAGE_PROFILES:
+        raise ValueError(f"Perfil de armazenamento inválido. Use um dos seguintes: {list(config.STORAGE_PROFILES)}")
+    perfil = config.STORAGE_PROFILES[nome]
+    return [f"PRAGMA {pragma} = {perfil[pragma]}" for pragma in ORDEM_PRAGMAS if pragma in perfil]
+
+class _Conexao(sqlite3.Connection):
+    """Conexão do pool. Dentro de uma transação em grupo, commit e rollback
+    das funções do model não têm efeito: quem confirma é o grupo."""
+
+    em_grupo = False
+
+    def commit(self) -> None:
+        if not self.em_grupo:
+            super().commit()
+
+    def rollback(self) -> None:
+        if not self.em_grupo:
+            super().rollback()
+
+class PoolConexoes:
+    """Pool de conexões SQLite mantidas abertas e reutilizadas entre operações."""
+
+    def __init__(self, db_name: str, tamanho: int, timeout: float):
+        self.db_name = db_name
+        self.tamanho = tamanho
+        self.timeout = timeout
+        self.pragmas = pragmas_perfil()
+        self._livres = queue.LifoQueue()
+        self._todas = []
+        self._lock = threading.Lock()
+        self._fechado = False
+        self.lock_schema = threading.Lock()
+        self.versao_schema: Optional[int] = None
+        # Conexões com a contagem de comandos SQL das métricas ligada
+        self._rastreadas = set()
+
+    def _nova_conexao(self) -> sqlite3.Connection:
+        """Abre uma conexão e aplica os PRAGMAs configurados."""
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, factory=_Conexao)
+        conn.row_factory = sqlite3.Row
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def obter(self) -> sqlite3.Connection:
+        """Retira uma conexão do pool, abrindo uma nova se ainda houver espaço."""
+        if self._fechado:
+            raise sqlite3.ProgrammingError("Pool de conexões já foi fechado")
+        try:
+            return self._livres.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._todas) < self.tamanho:
+                conn = self._nova_conexao()
+                self._todas.append(conn)
+                return conn
+
+        try:
+            return self._livres.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Tempo esgotado aguardando conexão livre no pool")
+
+    def rastrear(self, conn: sqlite3.Connection, ligado: bool) -> None:
+        """Liga ou desliga na conexão a contagem de comandos SQL das métricas."""
+        if ligado != (conn in self._rastreadas):
+            conn.set_trace_callback(metricas.registrar_sql if ligado else None)
+            if ligado:
+                self._rastreadas.add(conn)
+            else:
+                self._rastreadas.discard(conn)
+
+    def devolver(self, conn: sqlite3.Connection) -> None:
+        """Devolve uma conexão ao pool, descartando transações pendentes."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._fechado:
+            conn.close()
+            return
+        self._livres.put(conn)
+
+    def fechar(self) -> None:
+        """Fecha todas as conexões abertas pelo pool."""
+        with self._lock:
+            self._fechado = True
+            conexoes, self._todas = self._todas, []
+        for conn in conexoes:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Erro ao fechar conexão: %s", e)
+
+class _CopiaReiniciada(Exception):
+    """Interrompe um snapshot incremental que o SQLite recomeçou vezes demais."""
+
+class PoolMemoria(PoolConexoes):
+    """Pool de uma única conexão :memory: carregada de `db_name` na abertura.
+
+    Uma thread grava snapshots de volta em `db_name` com a API de backup do
+    SQLite a cada `intervalo_s` segundos, se houve alterações, e um último
+    snapshot é gravado ao fechar. O snapshot copia `paginas_por_passo`
+    páginas por vez e devolve a conexão ao pool entre os passos, para as
+    operações não esperarem a cópia inteira. Com origem em memória, porém,
+    o SQLite recomeça a cópia a cada commit feito entre os passos; depois
+    de `reinicios_maximos` recomeços o snapshot copia o banco inteiro de
+    uma vez, segurando a conexão até o fim.
+
+    A conexão é entregue na ordem dos pedidos, para que escritas seguidas
+    não deixem o snapshot (ou qualquer outra operação) esperando sem fim.
+
+    Só o processo dono do pool deve escrever em `db_name`: cada snapshot
+    substitui o conteúdo do arquivo.
+    """
+
+    def __init__(self, db_name: str, timeout: float, intervalo_s: float, perda_maxima_s: float,
+                 paginas_por_passo: int, reinicios_maximos: int = 3):
+        if intervalo_s > perda_maxima_s:
+            raise ValueError("Intervalo dos snapshots não pode ser maior que a perda máxima")
+        super().__init__(db_name, 1, timeout)
+        self.intervalo_s = intervalo_s
+        self.perda_maxima_s = perda_maxima_s
+        self.paginas_por_passo = paginas_por_passo
+        self.reinicios_maximos = reinicios_maximos
+        # Quem espera a conexão, em ordem de chegada; cada um é acordado pelo seu Event
+        self._espera = deque()
+        self._livre = False
+        self.copias_inteiras = 0
+        # total_changes da conexão no último snapshot gravado
+        self._alteracoes_salvas = 0
+        self._ultimo_salvo = time.monotonic()
+        self._lock_snapshot = threading.Lock()
+        self._perda_excedida = False
+        self.snapshots = 0
+        self.erros = 0
+        self.ultimo_snapshot_ms: Optional[float] = None
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="snapshot-memoria", daemon=True)
+
+    def _nova_conexao(self) -> sqlite3.Connection:
+        """Abre a conexão em memória e copia para ela o conteúdo do arquivo."""
+        conn = sqlite3.connect(":memory:", check_same_thread=False, factory=_Conexao)
+        conn.row_factory = sqlite3.Row
+        if os.path.exists(self.db_name):
+            inicio = time.perf_counter()
+            with closing(sqlite3.connect(self.db_name)) as disco:
+                disco.backup(conn)
+            logger.info("Banco %s carregado em memória em %.1f ms", self.db_name,
+                        (time.perf_counter() - inicio) * 1000)
+        for pragma in self.pragmas:
+            conn.execute(pragma)
+        self._alteracoes_salvas = conn.total_changes
+        if not self._thread.is_alive():
+            self._thread.start()
+        return conn
+
+    def obter(self) -> sqlite3.Connection:
+        """Retira a conexão do pool, esperando a vez atrás de quem pediu antes."""
+        if self._fechado:
+            raise sqlite3.ProgrammingError("Pool de conexões já foi fechado")
+        with self._lock:
+            if not self._todas:
+                self._todas.append(self._nova_conexao())
+                return self._todas[0]
+            if self._livre and not self._espera:
+                self._livre = False
+                return self._todas[0]
+            vez = threading.Event()
+            self._espera.append(vez)
+        if not vez.wait(self.timeout):
+            with self._lock:
+                # A conexão pode ter sido entregue entre o fim da espera e o lock
+                if not vez.is_set():
+                    self._espera.remove(vez)
+                    raise sqlite3.OperationalError("Tempo esgotado aguardando conexão livre no pool")
+        return self._todas[0]
+
+    def devolver(self, conn: sqlite3.Connection) -> None:
+        """Devolve a conexão, entregando-a direto a quem espera há mais tempo."""
+        if conn.in_transaction:
+            conn.rollback()
+        if self._fechado:
+            conn.close()
+            return
+        with self._lock:
+            if self._espera:
+                self._espera.popleft().set()
+            else:
+                self._livre = True
+
+    def salvar(self, paginas_por_passo: Optional[int] = None) -> bool:
+        """Grava um snapshot em `db_name` se houve alterações desde o último.
+
+        Retorna se um snapshot foi gravado.
+        """
+        paginas = paginas_por_passo or self.paginas_por_passo
+        with self._lock_snapshot:
+            conn = self.obter()
+            emprestada = True
+            anterior = None
+            reinicios = 0
+
+            def entre_passos(situacao, restantes, total):
+                # Deixa as operações pendentes usarem a conexão antes do próximo passo
+                nonlocal emprestada, anterior, reinicios
+                if anterior is not None and restantes >= anterior:
+                    reinicios += 1
+                anterior = restantes
+                self.devolver(conn)
+                emprestada = False
+                self.obter()
+                emprestada = True
+                if reinicios > self.reinicios_maximos:
+                    raise _CopiaReiniciada()
+
+            try:
+                if conn.total_changes == self._alteracoes_salvas:
+                    return False
+                inicio = time.perf_counter()
+                with closing(sqlite3.connect(self.db_name, timeout=self.timeout)) as disco:
+                    try:
+                        conn.backup(disco, pages=paginas, progress=entre_passos if paginas > 0 else None)
+                    except _CopiaReiniciada:
+                        # O backup abortado não confirma nada no destino; com a
+                        # conexão retida nenhum commit interrompe a cópia inteira
+                        logger.debug("Snapshot de %s reiniciado %s vezes; copiando de uma vez",
+                                     self.db_name, reinicios)
+                        self.copias_inteiras += 1
+                        conn.backup(disco)
+                self._alteracoes_salvas = conn.total_changes
+            finally:
+                if emprestada:
+                    self.devolver(conn)
+            self._ultimo_salvo = time.monotonic()
+            self._perda_excedida = False
+            self.snapshots += 1
+            self.ultimo_snapshot_ms = round((time.perf_counter() - inicio) * 1000, 3)
+            logger.debug("Snapshot de %s gravado em %s ms", self.db_name, self.ultimo_snapshot_ms)
+            return True
+
+    def _executar(self) -> None:
+        espera = self.intervalo_s
+        while not self._parar.wait(espera):
+            try:
+                self.salvar()
+                espera = self.intervalo_s
+            except sqlite3.Error as e:
+                self.erros += 1
+                logger.error("Erro ao gravar snapshot de %s: %s", self.db_name, e)
+                # Tenta de novo logo, sem esperar o intervalo inteiro
+                espera = min(1.0, self.intervalo_s)
+                if (not self._perda_excedida
+                        and time.monotonic() - self._ultimo_salvo > self.perda_maxima_s):
+                    self._perda_excedida = True
+                    logger.error("Alterações em memória sem snapshot há mais de %ss", self.perda_maxima_s)
+
+    def estatisticas(self) -> dict:
+        return {
+            'banco': self.db_name,
+            'snapshots': self.snapshots,
+            'erros': self.erros,
+            'ultimo_snapshot_ms': self.ultimo_snapshot_ms,
+            'copias_inteiras': self.copias_inteiras,
+            'segundos_desde_snapshot': round(time.monotonic() - self._ultimo_salvo, 1),
+            'perda_maxima_excedida': self._perda_excedida,
+        }
+
+    def fechar(self) -> None:
+        """Grava o último snapshot e fecha a conexão em memória."""
+        self._parar.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self._todas:
+            try:
+                # Sem outras operações a atender, copia tudo de uma vez
+                self.salvar(-1)
+            except sqlite3.Error as e:
+                logger.error("Erro ao gravar o snapshot final de %s: %s", self.db_name, e)
+        super().fechar()
+
+# Com MEMORIA o banco é aberto em memória (PoolMemoria), com snapshots em DB_NAME
+MEMORIA = bool(config.MEMORY_CONFIG['enabled'])
+
+_pool: Optional[PoolConexoes] = None
+_pool_lock = threading.Lock()
+
+def _obter_pool() -> PoolConexoes:
+    """Retorna o pool do banco atual, recriando-o se DB_NAME ou MEMORIA mudou."""
+    global _pool
+    with _pool_lock:
+        if (_pool is None or _pool.db_name != DB_NAME
+                or isinstance(_pool, PoolMemoria) != MEMORIA):
+            if _pool is not None:
+                _pool.fechar()
+            if MEMORIA:
+                _pool = PoolMemoria(DB_NAME,
+                                    config.DATABASE_CONFIG['pool_timeout'],
+                                    config.MEMORY_CONFIG['snapshot_interval_s'],
+                                    config.MEMORY_CONFIG['max_loss_s'],
+                                    config.MEMORY_CONFIG['pages_per_step'],
+                                    config.MEMORY_CONFIG['max_restarts'])
+            else:
+                _pool = PoolConexoes(DB_NAME,
+                                     config.DATABASE_CONFIG['pool_size'],
+                                     config.DATABASE_CONFIG['pool_timeout'])
+        return _pool
+
+def salvar_snapshot() -> bool:
+    """No modo em memória, grava agora um snapshot das alterações em DB_NAME."""
+    pool = _obter_pool()
+    return pool.salvar() if isinstance(pool, PoolMemoria) else False
+
+def estatisticas_memoria() -> Optional[dict]:
+    """Snapshots do modo em memória, ou None se o banco está em disco."""
+    pool = _pool
+    return pool.estatisticas() if isinstance(pool, PoolMemoria) else None
+
+def fechar_conexoes() -> None:
+    """Fecha o pool de conexões. Deve ser chamada no encerramento da aplicação."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.fechar()
+            _pool = None
+            logger.info("Conexões com o banco fechadas")
+
+atexit.register(fechar_conexoes)
+
+_local = threading.local()
+
 @contextmanager
 def conectar():
-    """Context manager para gerenciar conexões com o banco de dados."""
+    """Context manager que empresta uma conexão do pool."""
+    grupo = getattr(_local, 'grupo', None)
+    if grupo is not None:
+        # Dentro de transacao_em_grupo a thread usa sempre a conexão do grupo
+        yield grupo.conn
+        return
+    pool = _obter_pool()
     conn = None
     try:
-        conn = sqlite3.connect(DB_NAME)
-        conn.row_factory = sqlite3.Row 
+        conn = pool.obter()
+        pool.rastrear(conn, metricas.ativo())
+        if pool.versao_schema is None:
+            _garantir_schema(pool, conn)
         yield conn
     except sqlite3.Error as e:
-        logger.error(f"Erro ao conectar com o banco: {e}")
+        logger.error("Erro ao conectar com o banco: %s", e)
         if conn:
             conn.rollback()
         raise
     finally:
         if conn:
-            conn.close()
+            pool.devolver(conn)
+
+class TransacaoEmGrupo:
+    """Transação que agrupa várias escritas do model, cada uma em seu SAVEPOINT.
+
+    A falha de uma operação desfaz só o que ela gravou; as demais seguem e
+    são confirmadas juntas, com um único commit, ao sair de transacao_em_grupo.
+    """
+
+    def __init__(self, conn: _Conexao):
+        self.conn = conn
+        self.operacoes = 0
+
+    def executar(self, funcao: Callable, *args, **kwargs):
+        """Executa `funcao` dentro da transação e retorna seu resultado."""
+        self.conn.execute("SAVEPOINT operacao")
+        try:
+            resultado = funcao(*args, **kwargs)
+        except BaseException:
+            self.conn.execute("ROLLBACK TO operacao")
+            self.conn.execute("RELEASE operacao")
+            raise
+        self.conn.execute("RELEASE operacao")
+        self.operacoes += 1
+        return resultado
+
+@contextmanager
+def transacao_em_grupo() -> Iterator[TransacaoEmGrupo]:
+    """Abre uma transação de escrita compartilhada pelas funções do model
+    chamadas nesta thread, confirmada com um único commit no final."""
+    if getattr(_local, 'grupo', None) is not None:
+        raise sqlite3.ProgrammingError("Transação em grupo já aberta nesta thread")
+    with conectar() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        grupo = TransacaoEmGrupo(conn)
+        conn.em_grupo = True
+        _local.grupo = grupo
+        try:
+            yield grupo
+        except BaseException:
+            conn.em_grupo = False
+            conn.rollback()
+            raise
+        finally:
+            _local.grupo = None
+            conn.em_grupo = False
+        conn.commit()
+
+def _migracao_001_tabela(cursor: sqlite3.Cursor) -> None:
+    """Cria a tabela de tarefas original."""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tarefas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            descricao TEXT,
+            status TEXT DEFAULT 'pendente'
+        )
+    """)
+
+def _migracao_002_datas(cursor: sqlite3.Cursor) -> None:
+    """Adiciona as colunas de data e preenche as linhas antigas."""
+    cursor.execute("PRAGMA table_info(tarefas)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    if 'data_criacao' not in columns:
+        cursor.execute("ALTER TABLE tarefas ADD COLUMN data_criacao TIMESTAMP")
+        logger.info("Coluna data_criacao adicionada")
+
+    if 'data_atualizacao' not in columns:
+        cursor.execute("ALTER TABLE tarefas ADD COLUMN data_atualizacao TIMESTAMP")
+        logger.info("Coluna data_atualizacao adicionada")
+
+    cursor.execute("UPDATE tarefas SET data_criacao = datetime('now') WHERE data_criacao IS NULL")
+    cursor.execute("UPDATE tarefas SET data_atualizacao = datetime('now') WHERE data_atualizacao IS NULL")
+
+def _migracao_003_indices(cursor: sqlite3.Cursor) -> None:
+    """Cria os índices usados pela listagem ordenada e pelos filtros de status."""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tarefas_data_criacao ON tarefas (data_criacao)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tarefas_status ON tarefas (status)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tarefas_status_data ON tarefas (status, data_criacao)")
+
+def _migracao_004_busca(cursor: sqlite3.Cursor) -> None:
+    """Cria o índice FTS5 de título/descrição e os gatilhos que o mantêm em dia."""
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS tarefas_fts USING fts5(
+            titulo, descricao,
+            content='tarefas', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tarefas_fts_ai AFTER INSERT ON tarefas BEGIN
+            INSERT INTO tarefas_fts (rowid, titulo, descricao) VALUES (new.id, new.titulo, new.descricao);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tarefas_fts_ad AFTER DELETE ON tarefas BEGIN
+            INSERT INTO tarefas_fts (tarefas_fts, rowid, titulo, descricao)
+            VALUES ('delete', old.id, old.titulo, old.descricao);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS tarefas_fts_au AFTER UPDATE OF titulo, descricao ON tarefas BEGIN
+            INSERT INTO tarefas_fts (tarefas_fts, rowid, titulo, descricao)
+            VALUES ('delete', old.id, old.titulo, old.descricao);
+            INSERT INTO tarefas_fts (rowid, titulo, descricao) VALUES (new.id, new.titulo, new.descricao);
+        END
+    """)
+    cursor.execute("INSERT INTO tarefas_fts (tarefas_fts) VALUES ('rebuild')")
+
+def _migracao_005_status_inteiro(cursor: sqlite3.Cursor) -> None:
+    """Recria a tabela com status inteiro (0 = pendente, 1 = concluída) e CHECK,
+    e cria a tabela de contagem por status mantida por gatilhos."""
+    sequencia = cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tarefas'").fetchone()
+    cursor.execute("""
+        CREATE TABLE tarefas_nova (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            titulo TEXT NOT NULL,
+            descricao TEXT,
+            status INTEGER NOT NULL DEFAULT 0 CHECK (status IN (0, 1)),
+            data_criacao TIMESTAMP,
+            data_atualizacao TIMESTAMP
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO tarefas_nova (id, titulo, descricao, status, data_criacao, data_atualizacao)
+        SELECT id, titulo, descricao,
+               CASE WHEN status LIKE 'conclu%' THEN 1 ELSE 0 END,
+               data_criacao, data_atualizacao
+        FROM tarefas
+    """)
+    # Remove a tabela antiga junto com seus índices e gatilhos
+    cursor.execute("DROP TABLE tarefas")
+    cursor.execute("ALTER TABLE tarefas_nova RENAME TO tarefas")
+    if sequencia is not None:
+        # Preserva o AUTOINCREMENT: IDs de tarefas já excluídas não podem voltar.
+        # O RENAME já leva a linha de tarefas_nova, se houver; sqlite_sequence
+        # não tem chave única, então só insere quando ela não existe
+        cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'tarefas'",
+                       (sequencia[0],))
+        cursor.execute("INSERT INTO sqlite_sequence (name, seq) SELECT 'tarefas', ? "
+                       "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'tarefas')",
+                       (sequencia[0],))
+
+    cursor.execute("CREATE INDEX idx_tarefas_data_criacao ON tarefas (data_criacao)")
+    cursor.execute("CREATE INDEX idx_tarefas_status ON tarefas (status)")
+    cursor.execute("CREATE INDEX idx_tarefas_status_data ON tarefas (status, data_criacao)")
+
+    # Os IDs foram preservados, então o conteúdo de tarefas_fts continua válido
+    cursor.execute("""
+        CREATE TRIGGER tarefas_fts_ai AFTER INSERT ON tarefas BEGIN
+            INSERT INTO tarefas_fts (rowid, titulo, descricao) VALUES (new.id, new.titulo, new.descricao);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER tarefas_fts_ad AFTER DELETE ON tarefas BEGIN
+            INSERT INTO tarefas_fts (tarefas_fts, rowid, titulo, descricao)
+            VALUES ('delete', old.id, old.titulo, old.descricao);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER tarefas_fts_au AFTER UPDATE OF titulo, descricao ON tarefas BEGIN
+            INSERT INTO tarefas_fts (tarefas_fts, rowid, titulo, descricao)
+            VALUES ('delete', old.id, old.titulo, old.descricao);
+            INSERT INTO tarefas_fts (rowid, titulo, descricao) VALUES (new.id, new.titulo, new.descricao);
+        END
+    """)
+
+    cursor.execute("""
+        CREATE TABLE tarefas_contagem (
+            status INTEGER PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    cursor.execute("INSERT INTO tarefas_contagem (status, total) VALUES (0, 0), (1, 0)")
+    cursor.execute("""
+        UPDATE tarefas_contagem
+        SET total = (SELECT COUNT(*) FROM tarefas WHERE tarefas.status = tarefas_contagem.status)
+    """)
+    cursor.execute("""
+        CREATE TRIGGER tarefas_contagem_ai AFTER INSERT ON tarefas BEGIN
+            UPDATE tarefas_contagem SET total = total + 1 WHERE status = new.status;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER tarefas_contagem_ad AFTER DELETE ON tarefas BEGIN
+            UPDATE tarefas_contagem SET total = total - 1 WHERE status = old.status;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER tarefas_contagem_au AFTER UPDATE OF status ON tarefas
+        WHEN old.status <> new.status BEGIN
+            UPDATE tarefas_contagem SET total = total - 1 WHERE status = old.status;
+            UPDATE tarefas_contagem SET total = total + 1 WHERE status = new.status;
+        END
+    """)
+
+def _migracao_006_changelog(cursor: sqlite3.Cursor) -> None:
+    """Cria tarefas_changelog, o registro de mudanças mantido por gatilhos.
+
+    AUTOINCREMENT garante que `seq` nunca é reutilizado, mesmo depois de a
+    tabela ser podada, e como as escritas são serializadas pelo SQLite os
+    números ficam visíveis em ordem e sem lacunas.
+    """
+    cursor.execute("""
+        CREATE TABLE tarefas_changelog (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            op TEXT NOT NULL,
+            tarefa_id INTEGER NOT NULL
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER tarefas_changelog_ai AFTER INSERT ON tarefas BEGIN
+            INSERT INTO tarefas_changelog (op, tarefa_id) VALUES ('{OP_INSERIDA}', new.id);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER tarefas_changelog_au AFTER UPDATE ON tarefas BEGIN
+            INSERT INTO tarefas_changelog (op, tarefa_id) VALUES ('{OP_ATUALIZADA}', new.id);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER tarefas_changelog_ad AFTER DELETE ON tarefas BEGIN
+            INSERT INTO tarefas_changelog (op, tarefa_id) VALUES ('{OP_REMOVIDA}', old.id);
+        END
+    """)
+
+def _migracao_007_versao(cursor: sqlite3.Cursor) -> None:
+    """Adiciona a coluna versao, incrementada a cada atualização da tarefa."""
+    cursor.execute("ALTER TABLE tarefas ADD COLUMN versao INTEGER NOT NULL DEFAULT 1")
+
+def _migracao_008_arquivo(cursor: sqlite3.Cursor) -> None:
+    """Cria tarefas_arquivo, para onde vão as tarefas concluídas antigas.
+
+    As colunas são as de tarefas mais arquivada_em. Os IDs continuam únicos
+    entre as duas tabelas porque o AUTOINCREMENT de tarefas não os reutiliza.
+    """
+    cursor.execute("""
+        CREATE TABLE tarefas_arquivo (
+            id INTEGER PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            descricao TEXT,
+            status INTEGER NOT NULL,
+            data_criacao TIMESTAMP,
+            data_atualizacao TIMESTAMP,
+            versao INTEGER NOT NULL,
+            arquivada_em TIMESTAMP NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX idx_tarefas_arquivo_data_criacao ON tarefas_arquivo (data_criacao)")
+
+def _migracao_009_indices_ordenacao(cursor: sqlite3.Cursor) -> None:
+    """Cria os índices que sustentam a listagem ordenada por título ou status.
+
+    Junto com o id implícito no fim de cada índice, eles entregam as linhas
+    já na ordem (coluna, id) usada pelo cursor de paginação, com ou sem
+    filtro de status.
+    """
+    cursor.execute("CREATE INDEX idx_tarefas_titulo ON tarefas (titulo)")
+    cursor.execute("CREATE INDEX idx_tarefas_status_titulo ON tarefas (status, titulo)")
+    cursor.execute("CREATE INDEX idx_tarefas_arquivo_titulo ON tarefas_arquivo (titulo)")
+    cursor.execute("CREATE INDEX idx_tarefas_arquivo_status ON tarefas_arquivo (status)")
+
+def _migracao_010_sequencia_unica(cursor: sqlite3.Cursor) -> None:
+    """Remove a linha duplicada de tarefas em sqlite_sequence.
+
+    Bancos migrados pela migração 5 antes da sua correção ficaram com duas
+    linhas; mantém só a de maior seq, para nenhum ID excluído voltar.
+    """
+    cursor.execute("""
+        DELETE FROM sqlite_sequence WHERE name = 'tarefas' AND rowid != (
+            SELECT rowid FROM sqlite_sequence WHERE name = 'tarefas' ORDER BY seq DESC LIMIT 1
+        )
+    """)
+
+# Migrações em ordem de versão. Nunca altere uma migração já publicada:
+# adicione uma nova entrada no final da lista.
+MIGRACOES = [
+    (1, "Cria tabela de tarefas", _migracao_001_tabela),
+    (2, "Adiciona colunas data_criacao e data_atualizacao", _migracao_002_datas),
+    (3, "Cria índices de data_criacao e status", _migracao_003_indices),
+    (4, "Cria índice de busca textual tarefas_fts", _migracao_004_busca),
+    (5, "Converte status para inteiro e cria tarefas_contagem", _migracao_005_status_inteiro),
+    (6, "Cria registro de mudanças tarefas_changelog", _migracao_006_changelog),
+    (7, "Adiciona coluna versao para concorrência otimista", _migracao_007_versao),
+    (8, "Cria tabela de tarefas arquivadas tarefas_arquivo", _migracao_008_arquivo),
+    (9, "Cria índices de ordenação por título e status", _migracao_009_indices_ordenacao),
+    (10, "Remove linha duplicada de tarefas em sqlite_sequence", _migracao_010_sequencia_unica),
+]
 
+def _versao_atual(conn: sqlite3.Connection) -> int:
+    """Retorna a última versão de schema registrada no banco."""
+    return conn.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version").fetchone()[0]
+
+def aplicar_migracoes(conn: sqlite3.Connection) -> int:
+    """Aplica as migrações pendentes e retorna a versão resultante do schema."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            versao INTEGER PRIMARY KEY,
+            descricao TEXT NOT NULL,
+            aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    versao = _versao_atual(conn)
+    if versao >= MIGRACOES[-1][0]:
+        return versao
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Relê a versão com o lock de escrita: outro processo pode ter migrado antes
+        versao = _versao_atual(conn)
+        cursor = conn.cursor()
+        for numero, descricao, migracao in MIGRACOES:
+            if numero <= versao:
+                continue
+            migracao(cursor)
+            cursor.execute("INSERT INTO schema_version (versao, descricao) VALUES (?, ?)",
+                           (numero, descricao))
+            logger.info("Migração %s aplicada: %s", numero, descricao)
+            versao = numero
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return versao
+
+def _garantir_schema(pool: PoolConexoes, conn: sqlite3.Connection) -> None:
+    """Executa as migrações uma única vez por pool e guarda a versão resolvida."""
+    with pool.lock_schema:
+        if pool.versao_schema is None:
+            pool.versao_schema = aplicar_migracoes(conn)
+
+def configuracoes_armazenamento() -> dict:
+    """Lê de uma conexão do pool os valores efetivos dos PRAGMAs de armazenamento."""
+    with conectar() as conn:
+        valores = {pragma: conn.execute(f"PRAGMA {pragma}").fetchone() for pragma in ORDEM_PRAGMAS}
+        # Em memória alguns PRAGMAs (mmap_size) não retornam valor
+        return {pragma: linha[0] if linha else None for pragma, linha in valores.items()}
+
+def versao_schema() -> int:
+    """Retorna a versão do schema resolvida para o banco atual."""
+    with conectar():
+        return _obter_pool().versao_schema
+
+@metricas.instrumentar
 def criar_tabela() -> None:
-    """Cria a tabela de tarefas se ela não existir e atualiza se necessário."""
+    """Garante que o schema do banco está na versão mais recente."""
     try:
-        with conectar() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tarefas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    titulo TEXT NOT NULL,
-                    descricao TEXT,
-                    status TEXT DEFAULT 'pendente'
-                )
-            """)
-            
-            cursor.execute("PRAGMA table_info(tarefas)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'data_criacao' not in columns:
-                cursor.execute("ALTER TABLE tarefas ADD COLUMN data_criacao TIMESTAMP")
-                logger.info("Coluna data_criacao adicionada")
-            
-            if 'data_atualizacao' not in columns:
-                cursor.execute("ALTER TABLE tarefas ADD COLUMN data_atualizacao TIMESTAMP")
-                logger.info("Coluna data_atualizacao adicionada")
-            
-            cursor.execute("UPDATE tarefas SET data_criacao = datetime('now') WHERE data_criacao IS NULL")
-            cursor.execute("UPDATE tarefas SET data_atualizacao = datetime('now') WHERE data_atualizacao IS NULL")
-            
-            conn.commit()
-            logger.info("Tabela de tarefas criada/atualizada com sucesso")
+        versao = versao_schema()
+        logger.info("Schema do banco na versão %s", versao)
     except sqlite3.Error as e:
-        logger.error(f"Erro ao criar/atualizar tabela: {e}")
+        logger.error("Erro ao criar/atualizar tabela: %s", e)
         raise
 
+@metricas.instrumentar
 def adicionar_tarefa(titulo: str, descricao: str = "") -> int:
     """Adiciona uma nova tarefa ao banco de dados."""
     if not titulo or not titulo.strip():
@@ -69,38 +824,154 @@ def adicionar_tarefa(titulo: str, descricao: str = "") -> int:
         with conectar() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "INSERT INTO tarefas (titulo, descricao) VALUES (?, ?)",
+                "INSERT INTO tarefas (titulo, descricao, data_criacao, data_atualizacao) "
+                "VALUES (?, ?, datetime('now'), datetime('now'))",
                 (titulo.strip(), descricao.strip())
             )
             conn.commit()
             task_id = cursor.lastrowid
-            logger.info(f"Tarefa adicionada com ID: {task_id}")
+            logger.debug("Tarefa adicionada com ID: %s", task_id)
             return task_id
     except sqlite3.Error as e:
-        logger.error(f"Erro ao adicionar tarefa: {e}")
+        logger.error("Erro ao adicionar tarefa: %s", e)
         raise
 
-def listar_tarefas() -> List[Tuple]:
-    """Lista todas as tarefas do banco de dados."""
+@metricas.instrumentar
+def listar_tarefas(status: Optional[Union[Status, str]] = None,
+                   incluir_arquivadas: bool = False) -> List[Tarefa]:
+    """Lista as tarefas do banco de dados, opcionalmente filtradas por status."""
+    sql, params = _consulta_listagem(status, None, incluir_arquivadas)
     try:
         with conectar() as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("PRAGMA table_info(tarefas)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'data_criacao' in columns:
-                cursor.execute("SELECT * FROM tarefas ORDER BY data_criacao DESC")
-            else:
-                cursor.execute("SELECT * FROM tarefas ORDER BY id DESC")
-            
+            cursor = _cursor_tarefas(conn)
+            cursor.execute(sql, params)
             tarefas = cursor.fetchall()
-            logger.info(f"Listadas {len(tarefas)} tarefas")
+            logger.debug("Listadas %s tarefas", len(tarefas))
             return tarefas
     except sqlite3.Error as e:
-        logger.error(f"Erro ao listar tarefas: {e}")
+        logger.error("Erro ao listar tarefas: %s", e)
+        raise
+
+# Colunas aceitas em `ordenar_por`. Cada uma tem índice que já entrega as
+# linhas na ordem (coluna, id), com e sem filtro de status (migrações 3 e 9),
+# então trocar a ordenação não ordena a tabela inteira
+ORDENACOES = ('data_criacao', 'id', 'titulo', 'status')
+
+# Cursor de paginação: (valor da coluna de ordenação, id) da última tarefa da página anterior
+CursorPagina = Tuple[Union[str, int], int]
+
+def _validar_ordenacao(ordenar_por: str) -> None:
+    if ordenar_por not in ORDENACOES:
+        raise ValueError(f"Ordenação inválida: {ordenar_por!r} (use {', '.join(ORDENACOES)})")
+
+def _filtro_listagem(status: Optional[Union[Status, str]], apos: Optional[CursorPagina],
+                     ordenar_por: str = 'data_criacao', decrescente: bool = True) -> Tuple[str, List]:
+    """Monta a cláusula WHERE da listagem e seus parâmetros."""
+    condicoes = []
+    params: List = []
+    if status is not None:
+        condicoes.append("status = ?")
+        params.append(int(Status.de_valor(status)))
+    if apos is not None:
+        operador = "<" if decrescente else ">"
+        if ordenar_por == 'id':
+            condicoes.append(f"id {operador} ?")
+            params.append(apos[1])
+        else:
+            condicoes.append(f"({ordenar_por}, id) {operador} (?, ?)")
+            params.extend(apos)
+    where = f"WHERE {' AND '.join(condicoes)} " if condicoes else ""
+    return where, params
+
+def _ordem_listagem(ordenar_por: str, decrescente: bool) -> str:
+    direcao = "DESC" if decrescente else "ASC"
+    if ordenar_por == 'id':
+        return f"ORDER BY id {direcao}"
+    return f"ORDER BY {ordenar_por} {direcao}, id {direcao}"
+
+def _consulta_listagem(status: Optional[Union[Status, str]], apos: Optional[CursorPagina],
+                       incluir_arquivadas: bool, limite: Optional[int] = None,
+                       ordenar_por: str = 'data_criacao', decrescente: bool = True) -> Tuple[str, List]:
+    """Monta o SELECT ordenado da listagem sobre tarefas e, se pedido, tarefas_arquivo."""
+    _validar_ordenacao(ordenar_por)
+    where, params = _filtro_listagem(status, apos, ordenar_por, decrescente)
+    ordem = _ordem_listagem(ordenar_por, decrescente)
+    sufixo = f"{ordem} LIMIT ?" if limite else ordem
+    limites = [limite] if limite else []
+    sql = f"SELECT {COLUNAS_TAREFA} FROM tarefas {where}"
+    # O arquivo só guarda tarefas concluídas
+    if incluir_arquivadas and (status is None or Status.de_valor(status) == Status.CONCLUIDA):
+        # Cada lado é lido em ordem pelo seu índice da coluna de ordenação e o
+        # SQLite só intercala os dois (MERGE), sem ordenar em tabela temporária.
+        # O filtro de status é redundante no arquivo e é omitido para não
+        # levar o planejador ao índice de status, que não segue a ordenação
+        where_arquivo, params_arquivo = _filtro_listagem(None, apos, ordenar_por, decrescente)
+        sql += f"UNION ALL SELECT {COLUNAS_TAREFA} FROM tarefas_arquivo {where_arquivo}"
+        params = params + params_arquivo
+    return sql + sufixo, params + limites
+
+def _cursor_da_tarefa(tarefa: Tarefa, ordenar_por: str) -> CursorPagina:
+    valor = getattr(tarefa, ordenar_por)
+    return (int(valor) if ordenar_por == 'status' else valor), tarefa.id
+
+@metricas.instrumentar
+def listar_tarefas_pagina(limite: Optional[int] = None, apos: Optional[CursorPagina] = None,
+                          status: Optional[Union[Status, str]] = None, incluir_arquivadas: bool = False,
+                          ordenar_por: str = 'data_criacao', decrescente: bool = True
+                          ) -> Tuple[List[Tarefa], Optional[CursorPagina]]:
+    """Lista uma página de tarefas usando paginação por chave (keyset).
+
+    Retorna as tarefas da página e o cursor a ser passado em `apos` para
+    obter a próxima, ou None quando não há mais tarefas. O cursor só vale
+    para a mesma ordenação (`ordenar_por`, uma de ORDENACOES, e
+    `decrescente`) com que foi gerado.
+    """
+    limite = limite or config.DATABASE_CONFIG['page_size']
+    if limite <= 0:
+        raise ValueError("Limite da página deve ser positivo")
+
+    # Busca uma linha a mais só para saber se existe próxima página
+    sql, params = _consulta_listagem(status, apos, incluir_arquivadas, limite + 1,
+                                     ordenar_por, decrescente)
+    try:
+        with conectar() as conn:
+            cursor = _cursor_tarefas(conn)
+            cursor.execute(sql, params)
+            tarefas = cursor.fetchall()
+            proximo = None
+            if len(tarefas) > limite:
+                tarefas = tarefas[:limite]
+                proximo = _cursor_da_tarefa(tarefas[-1], ordenar_por)
+            logger.debug("Listada página com %s tarefas", len(tarefas))
+            return tarefas, proximo
+    except sqlite3.Error as e:
+        logger.error("Erro ao listar página de tarefas: %s", e)
         raise
 
+@metricas.instrumentar
+def iterar_tarefas(tamanho_lote: Optional[int] = None, status: Optional[Union[Status, str]] = None,
+                   incluir_arquivadas: bool = False) -> Iterator[Tarefa]:
+    """Percorre todas as tarefas em lotes de fetchmany, sem materializar a tabela.
+
+    A conexão fica emprestada do pool até o gerador ser esgotado ou fechado.
+    """
+    tamanho_lote = tamanho_lote or config.DATABASE_CONFIG['batch_size']
+    sql, params = _consulta_listagem(status, None, incluir_arquivadas)
+    try:
+        with conectar() as conn:
+            cursor = _cursor_tarefas(conn)
+            cursor.arraysize = tamanho_lote
+            cursor.execute(sql, params)
+            while True:
+                lote = cursor.fetchmany()
+                if not lote:
+                    break
+                yield from lote
+    except sqlite3.Error as e:
+        logger.error("Erro ao iterar tarefas: %s", e)
+        raise
+
+@metricas.instrumentar
 def atualizar_tarefa(id: int, novo_titulo: str, nova_descricao: str = "") -> bool:
     """Atualiza uma tarefa existente."""
     if not novo_titulo or not novo_titulo.strip():
@@ -109,95 +980,492 @@ def atualizar_tarefa(id: int, novo_titulo: str, nova_descricao: str = "") -> boo
     try:
         with conectar() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute("PRAGMA table_info(tarefas)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'data_atualizacao' in columns:
-                cursor.execute(
-                    "UPDATE tarefas SET titulo = ?, descricao = ?, data_atualizacao = datetime('now') WHERE id = ?",
-                    (novo_titulo.strip(), nova_descricao.strip(), id)
-                )
-            else:
-                cursor.execute(
-                    "UPDATE tarefas SET titulo = ?, descricao = ? WHERE id = ?",
-                    (novo_titulo.strip(), nova_descricao.strip(), id)
-                )
-            
+            cursor.execute(
+                "UPDATE tarefas SET titulo = ?, descricao = ?, data_atualizacao = datetime('now'), "
+                "versao = versao + 1 WHERE id = ?",
+                (novo_titulo.strip(), nova_descricao.strip(), id)
+            )
             conn.commit()
             rows_affected = cursor.rowcount
             if rows_affected > 0:
-                logger.info(f"Tarefa {id} atualizada com sucesso")
+                logger.debug("Tarefa %s atualizada com sucesso", id)
                 return True
             else:
-                logger.warning(f"Tarefa {id} não encontrada para atualização")
+                logger.warning("Tarefa %s não encontrada para atualização", id)
                 return False
     except sqlite3.Error as e:
-        logger.error(f"Erro ao atualizar tarefa {id}: {e}")
+        logger.error("Erro ao atualizar tarefa %s: %s", id, e)
         raise
     
-def atualizar_status_tarefa(id: int, status: str) -> bool:
+@metricas.instrumentar
+def atualizar_status_tarefa(id: int, status: Union[Status, str]) -> bool:
     """Atualiza o status de uma tarefa."""
-    valid_statuses = ['pendente', 'concluida', 'concluída']
-    if status not in valid_statuses:
-        raise ValueError(f"Status inválido. Use um dos seguintes: {valid_statuses}")
+    status = Status.de_valor(status)
     
     try:
         with conectar() as conn:
             cursor = conn.cursor()
-            
-            cursor.execute("PRAGMA table_info(tarefas)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'data_atualizacao' in columns:
-                cursor.execute(
-                    "UPDATE tarefas SET status = ?, data_atualizacao = datetime('now') WHERE id = ?",
-                    (status, id)
-                )
-            else:
-                cursor.execute(
-                    "UPDATE tarefas SET status = ? WHERE id = ?",
-                    (status, id)
-                )
-            
+            cursor.execute(
+                "UPDATE tarefas SET status = ?, data_atualizacao = datetime('now'), versao = versao + 1 "
+                "WHERE id = ?",
+                (int(status), id)
+            )
             conn.commit()
             rows_affected = cursor.rowcount
             if rows_affected > 0:
-                logger.info(f"Status da tarefa {id} atualizado para '{status}'")
+                logger.debug("Status da tarefa %s atualizado para '%s'", id, status.rotulo)
                 return True
             else:
-                logger.warning(f"Tarefa {id} não encontrada para atualização de status")
+                logger.warning("Tarefa %s não encontrada para atualização de status", id)
                 return False
     except sqlite3.Error as e:
-        logger.error(f"Erro ao atualizar status da tarefa {id}: {e}")
+        logger.error("Erro ao atualizar status da tarefa %s: %s", id, e)
         raise
 
+# Campos que atualizar_campos aceita, na ordem em que entram no UPDATE
+CAMPOS_EDITAVEIS = ('titulo', 'descricao', 'status')
+
+@metricas.instrumentar
+def atualizar_campos(id: int, versao: Optional[int] = None, **campos) -> Optional[Tarefa]:
+    """Atualiza qualquer subconjunto de título, descrição e status em um único UPDATE.
+
+    Com `versao`, a escrita só acontece se a tarefa ainda estiver nessa
+    versão; caso contrário levanta ConflitoVersao. Retorna a tarefa como
+    ficou gravada, ou None se ela não existe.
+    """
+    desconhecidos = set(campos) - set(CAMPOS_EDITAVEIS)
+    if desconhecidos:
+        raise ValueError(f"Campos inválidos: {sorted(desconhecidos)}. Use: {list(CAMPOS_EDITAVEIS)}")
+    if not campos:
+        raise ValueError("Nenhum campo para atualizar")
+
+    atribuicoes = []
+    params: List = []
+    for campo in CAMPOS_EDITAVEIS:
+        if campo not in campos:
+            continue
+        valor = campos[campo]
+        if campo == 'titulo':
+            if not valor or not valor.strip():
+                raise ValueError("Título não pode estar vazio")
+            valor = valor.strip()
+        elif campo == 'descricao':
+            valor = (valor or "").strip()
+        else:
+            valor = int(Status.de_valor(valor))
+        atribuicoes.append(f"{campo} = ?")
+        params.append(valor)
+
+    where = "id = ?"
+    params.append(id)
+    if versao is not None:
+        where += " AND versao = ?"
+        params.append(versao)
+
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE tarefas SET {', '.join(atribuicoes)}, data_atualizacao = datetime('now'), "
+                f"versao = versao + 1 WHERE {where}",
+                params
+            )
+            # A releitura acontece na mesma transação, antes do commit
+            atualizadas = cursor.rowcount
+            tarefa = _cursor_tarefas(conn).execute(
+                f"SELECT {COLUNAS_TAREFA} FROM tarefas WHERE id = ?", (id,)).fetchone()
+            conn.commit()
+            if atualizadas:
+                logger.debug("Tarefa %s atualizada para a versão %s", id, tarefa.versao)
+                return tarefa
+            if tarefa is None:
+                logger.warning("Tarefa %s não encontrada para atualização", id)
+                return None
+            logger.debug("Conflito ao atualizar tarefa %s: versão %s, esperada %s", id, tarefa.versao, versao)
+            raise ConflitoVersao(id, versao, tarefa.versao)
+    except sqlite3.Error as e:
+        logger.error("Erro ao atualizar campos da tarefa %s: %s", id, e)
+        raise
+
+def _excluir_do_arquivo(conn: sqlite3.Connection, ids: List[int]) -> int:
+    """Exclui de tarefas_arquivo as tarefas `ids` e registra as remoções no changelog."""
+    marcadores = ", ".join("?" * len(ids))
+    arquivadas = [linha[0] for linha in conn.execute(
+        f"SELECT id FROM tarefas_arquivo WHERE id IN ({marcadores})", ids)]
+    if arquivadas:
+        marcadores = ", ".join("?" * len(arquivadas))
+        conn.execute(f"DELETE FROM tarefas_arquivo WHERE id IN ({marcadores})", arquivadas)
+        # tarefas_arquivo não tem gatilhos de changelog
+        conn.executemany("INSERT INTO tarefas_changelog (op, tarefa_id) VALUES (?, ?)",
+                         [(OP_REMOVIDA, id) for id in arquivadas])
+    return len(arquivadas)
+
+@metricas.instrumentar
 def deletar_tarefa(id: int) -> bool:
-    """Deleta uma tarefa do banco de dados."""
+    """Deleta uma tarefa do banco de dados, esteja ela arquivada ou não."""
     try:
         with conectar() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM tarefas WHERE id = ?", (id,))
+            rows_affected = cursor.rowcount or _excluir_do_arquivo(conn, [id])
             conn.commit()
-            rows_affected = cursor.rowcount
             if rows_affected > 0:
-                logger.info(f"Tarefa {id} deletada com sucesso")
+                logger.debug("Tarefa %s deletada com sucesso", id)
                 return True
             else:
-                logger.warning(f"Tarefa {id} não encontrada para exclusão")
+                logger.warning("Tarefa %s não encontrada para exclusão", id)
                 return False
     except sqlite3.Error as e:
-        logger.error(f"Erro ao deletar tarefa {id}: {e}")
+        logger.error("Erro ao deletar tarefa %s: %s", id, e)
         raise
 
-def buscar_tarefa_por_id(id: int) -> Optional[Tuple]:
-    """Busca uma tarefa específica por ID."""
+@metricas.instrumentar
+def buscar_tarefa_por_id(id: int) -> Optional[Tarefa]:
+    """Busca uma tarefa específica por ID, procurando também no arquivo."""
     try:
         with conectar() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM tarefas WHERE id = ?", (id,))
+            cursor = _cursor_tarefas(conn)
+            cursor.execute(f"SELECT {COLUNAS_TAREFA} FROM tarefas WHERE id = ?", (id,))
             tarefa = cursor.fetchone()
+            if tarefa is None:
+                cursor.execute(f"SELECT {COLUNAS_TAREFA} FROM tarefas_arquivo WHERE id = ?", (id,))
+                tarefa = cursor.fetchone()
             return tarefa
     except sqlite3.Error as e:
-        logger.error(f"Erro ao buscar tarefa {id}: {e}")
-        raise
\ No newline at end of file
+        logger.error("Erro ao buscar tarefa %s: %s", id, e)
+        raise
+
+# Pesos de cada ocorrência de um termo por coluna do índice: título pesa mais que descrição
+PESOS_BUSCA = (10.0, 1.0)
+
+def _expressao_busca(texto: str) -> str:
+    """Converte o texto digitado em uma consulta FTS5 com os termos combinados com AND.
+
+    Só o último termo, o que ainda está sendo digitado, é buscado como
+    prefixo, e só a partir de 2 letras: o índice guarda prefixos de 2 e 3
+    letras, e os demais prefixos obrigam o FTS5 a juntar a lista de todas as
+    palavras que começam com eles.
+    """
+    termos = [f'"{termo}"' for termo in re.findall(r"\w+", texto)]
+    if termos and len(termos[-1]) > 3:
+        termos[-1] += "*"
+    return " ".join(termos)
+
+# Ocorrências de um termo em uma coluna, marcadas com char(1) por highlight()
+_OCORRENCIAS = "(length(c.{0}) - length(replace(c.{0}, char(1), '')))"
+
+@metricas.instrumentar
+def buscar_tarefas(texto: str, limite: Optional[int] = None) -> List[Tarefa]:
+    """Busca tarefas pelo título e descrição, das mais relevantes para as menos.
+
+    Só as SEARCH_CONFIG['candidates'] correspondências mais recentes são
+    ordenadas por relevância. O bm25 não serve aqui: ele percorre a lista
+    inteira de cada termo para calcular a frequência, e termos comuns custam
+    dezenas de ms em 1M tarefas. A relevância é o número de ocorrências em
+    cada coluna, com PESOS_BUSCA, e o empate fica com a mais recente.
+    """
+    expressao = _expressao_busca(texto or "")
+    if not expressao:
+        return []
+    limite = limite or config.SEARCH_CONFIG['limit']
+    candidatos = max(limite, config.SEARCH_CONFIG['candidates'])
+    try:
+        with conectar() as conn:
+            cursor = _cursor_tarefas(conn)
+            colunas = ", ".join(f"t.{coluna}" for coluna in COLUNAS_TAREFA.split(", "))
+            cursor.execute(
+                f"SELECT {colunas} FROM ("
+                "SELECT rowid AS id, highlight(tarefas_fts, 0, char(1), '') AS titulo, "
+                "highlight(tarefas_fts, 1, char(1), '') AS descricao "
+                "FROM tarefas_fts WHERE tarefas_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+                ") c JOIN tarefas t ON t.id = c.id "
+                f"ORDER BY {_OCORRENCIAS.format('titulo')} * ? + {_OCORRENCIAS.format('descricao')} * ? DESC, "
+                "t.id DESC LIMIT ?",
+                (expressao, candidatos, *PESOS_BUSCA, limite)
+            )
+            tarefas = cursor.fetchall()
+            logger.debug("Busca por '%s' encontrou %s tarefas", texto, len(tarefas))
+            return tarefas
+    except sqlite3.Error as e:
+        logger.error("Erro ao buscar tarefas por '%s': %s", texto, e)
+        raise
+
+@metricas.instrumentar
+def contar_por_status() -> dict:
+    """Retorna o total de tarefas por Status, lido da tabela de contagem."""
+    try:
+        with conectar() as conn:
+            cursor = conn.execute("SELECT status, total FROM tarefas_contagem")
+            return {Status(status): total for status, total in cursor.fetchall()}
+    except sqlite3.Error as e:
+        logger.error("Erro ao contar tarefas por status: %s", e)
+        raise
+
+@metricas.instrumentar
+def buscar_tarefas_por_ids(ids: Iterable[int]) -> List[Tarefa]:
+    """Busca várias tarefas por ID; IDs inexistentes são ignorados."""
+    tarefas = []
+    try:
+        with conectar() as conn:
+            cursor = _cursor_tarefas(conn)
+            for bloco in _em_blocos(ids, config.DATABASE_CONFIG['batch_size']):
+                marcadores = ", ".join("?" * len(bloco))
+                cursor.execute(f"SELECT {COLUNAS_TAREFA} FROM tarefas WHERE id IN ({marcadores})", bloco)
+                tarefas.extend(cursor.fetchall())
+            return tarefas
+    except sqlite3.Error as e:
+        logger.error("Erro ao buscar tarefas por ID: %s", e)
+        raise
+
+@metricas.instrumentar
+def ultima_mudanca() -> int:
+    """Retorna o número de sequência da última mudança registrada (0 se nenhuma)."""
+    try:
+        with conectar() as conn:
+            linha = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'tarefas_changelog'").fetchone()
+            return linha[0] if linha else 0
+    except sqlite3.Error as e:
+        logger.error("Erro ao ler a última mudança: %s", e)
+        raise
+
+@metricas.instrumentar
+def listar_mudancas(desde: int, limite: int) -> Optional[List[Tuple[int, str, int]]]:
+    """Lista até `limite` mudanças posteriores a `desde` como (seq, op, tarefa_id).
+
+    Retorna None quando o histórico a partir de `desde` não está mais
+    disponível (foi podado, ou `desde` é de outro banco); nesse caso o
+    cliente deve recarregar seus dados.
+    """
+    try:
+        with conectar() as conn:
+            # As duas leituras precisam ver o mesmo instante do banco
+            conn.execute("BEGIN")
+            linha = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'tarefas_changelog'").fetchone()
+            mudancas = conn.execute(
+                "SELECT seq, op, tarefa_id FROM tarefas_changelog WHERE seq > ? ORDER BY seq LIMIT ?",
+                (desde, limite)
+            ).fetchall()
+            conn.commit()
+            ultima = linha[0] if linha else 0
+            if desde > ultima:
+                return None
+            if desde < ultima and (not mudancas or mudancas[0][0] != desde + 1):
+                # A sequência não tem lacunas: um salto indica entradas já podadas
+                return None
+            return [tuple(m) for m in mudancas]
+    except sqlite3.Error as e:
+        logger.error("Erro ao listar mudanças desde %s: %s", desde, e)
+        raise
+
+@metricas.instrumentar
+def podar_mudancas(manter: int) -> int:
+    """Remove as entradas antigas do changelog, mantendo as `manter` mais recentes."""
+    try:
+        with conectar() as conn:
+            cursor = conn.execute(
+                "DELETE FROM tarefas_changelog WHERE seq <= "
+                "(SELECT seq FROM sqlite_sequence WHERE name = 'tarefas_changelog') - ?",
+                (manter,))
+            conn.commit()
+            if cursor.rowcount:
+                logger.debug("%s entradas antigas removidas do changelog", cursor.rowcount)
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error("Erro ao podar o changelog: %s", e)
+        raise
+
+@metricas.instrumentar
+def arquivar_concluidas(dias: int, tamanho_lote: int, apos_id: int = 0) -> Tuple[List[int], Optional[int]]:
+    """Move para tarefas_arquivo as concluídas há mais de `dias` dias em um lote.
+
+    Examina até `tamanho_lote` tarefas concluídas com ID maior que
+    `apos_id`, em uma transação curta, e move as que não são atualizadas
+    desde antes do corte. Retorna os IDs movidos e o `apos_id` do próximo
+    lote, ou None quando não há mais concluídas a examinar. As remoções
+    entram no changelog como OP_ARQUIVADA.
+    """
+    try:
+        with conectar() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            linha = conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'tarefas_changelog'").fetchone()
+            candidatas = conn.execute(
+                "SELECT id, data_atualizacao < datetime('now', ?) FROM tarefas "
+                "WHERE status = ? AND id > ? ORDER BY id LIMIT ?",
+                (f"-{dias} days", int(Status.CONCLUIDA), apos_id, tamanho_lote)
+            ).fetchall()
+            ids = [id for id, antiga in candidatas if antiga]
+            if ids:
+                marcadores = ", ".join("?" * len(ids))
+                conn.execute(
+                    f"INSERT INTO tarefas_arquivo ({COLUNAS_TAREFA}, arquivada_em) "
+                    f"SELECT {COLUNAS_TAREFA}, datetime('now') FROM tarefas WHERE id IN ({marcadores})",
+                    ids)
+                conn.execute(f"DELETE FROM tarefas WHERE id IN ({marcadores})", ids)
+                # Os gatilhos registraram as remoções; o changelog só tem esta transação depois de `linha`
+                conn.execute("UPDATE tarefas_changelog SET op = ? WHERE seq > ?",
+                             (OP_ARQUIVADA, linha[0] if linha else 0))
+            conn.commit()
+            proximo = candidatas[-1][0] if len(candidatas) == tamanho_lote else None
+            if ids:
+                logger.debug("%s tarefas concluídas arquivadas", len(ids))
+            return ids, proximo
+    except sqlite3.Error as e:
+        logger.error("Erro ao arquivar tarefas concluídas: %s", e)
+        raise
+
+@metricas.instrumentar
+def desarquivar_tarefas(ids: Iterable[int], tamanho_lote: Optional[int] = None,
+                        exceto_status: Optional[Status] = None) -> List[int]:
+    """Devolve de tarefas_arquivo para tarefas as tarefas `ids` que estão arquivadas.
+
+    A reinserção passa pelos gatilhos de tarefas: a tarefa volta à busca
+    textual e à contagem e entra no changelog como OP_INSERIDA. Retorna
+    os IDs devolvidos; os que não estão no arquivo, ou que já têm o status
+    `exceto_status`, são ignorados.
+    """
+    tamanho_lote = tamanho_lote or config.DATABASE_CONFIG['batch_size']
+    devolvidas: List[int] = []
+    try:
+        with conectar() as conn:
+            for bloco in _em_blocos(ids, tamanho_lote):
+                marcadores = ", ".join("?" * len(bloco))
+                filtro, params = "", bloco
+                if exceto_status is not None:
+                    filtro, params = " AND status != ?", [*bloco, int(exceto_status)]
+                arquivadas = [linha[0] for linha in conn.execute(
+                    f"SELECT id FROM tarefas_arquivo WHERE id IN ({marcadores}){filtro}", params)]
+                if not arquivadas:
+                    continue
+                marcadores = ", ".join("?" * len(arquivadas))
+                conn.execute(
+                    f"INSERT INTO tarefas ({COLUNAS_TAREFA}) "
+                    f"SELECT {COLUNAS_TAREFA} FROM tarefas_arquivo WHERE id IN ({marcadores})",
+                    arquivadas)
+                conn.execute(f"DELETE FROM tarefas_arquivo WHERE id IN ({marcadores})", arquivadas)
+                devolvidas.extend(arquivadas)
+            conn.commit()
+            if devolvidas:
+                logger.debug("%s tarefas desarquivadas", len(devolvidas))
+            return devolvidas
+    except sqlite3.Error as e:
+        logger.error("Erro ao desarquivar tarefas: %s", e)
+        raise
+
+def _em_blocos(itens: Iterable, tamanho: int) -> Iterator[List]:
+    """Divide um iterável em listas de até `tamanho` itens, sem materializá-lo."""
+    iterador = iter(itens)
+    while True:
+        bloco = list(islice(iterador, tamanho))
+        if not bloco:
+            return
+        yield bloco
+
+# Um título ou uma tupla (título, descrição) ou (título, descrição, status)
+NovaTarefa = Union[str, Tuple[str, ...]]
+
+def _preparar_nova(item: NovaTarefa) -> Tuple[str, str, int]:
+    """Valida e normaliza uma NovaTarefa em (título, descrição, status)."""
+    if isinstance(item, str):
+        titulo, descricao, status = item, "", Status.PENDENTE
+    else:
+        titulo = item[0]
+        descricao = (item[1] if len(item) > 1 else "") or ""
+        status = (item[2] if len(item) > 2 else None) or Status.PENDENTE
+    if not isinstance(titulo, str) or not isinstance(descricao, str):
+        raise ValueError("Título e descrição devem ser texto")
+    if not titulo.strip():
+        raise ValueError("Título não pode estar vazio")
+    return titulo.strip(), descricao.strip(), int(Status.de_valor(status))
+
+@metricas.instrumentar
+def adicionar_tarefas_em_lote(tarefas: Iterable[NovaTarefa],
+                              tamanho_lote: Optional[int] = None) -> List[int]:
+    """Adiciona várias tarefas em uma única transação.
+
+    Aceita títulos ou tuplas (título, descrição[, status]) e insere com
+    executemany em blocos de `tamanho_lote`; cada tarefa já é gravada com o
+    seu status. Se qualquer tarefa for inválida nada é gravado.
+    Retorna os IDs gerados, na ordem de entrada.
+    """
+    tamanho_lote = tamanho_lote or config.DATABASE_CONFIG['batch_size']
+    ids: List[int] = []
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            for bloco in _em_blocos(tarefas, tamanho_lote):
+                linhas = [_preparar_nova(item) for item in bloco]
+                cursor.executemany(
+                    "INSERT INTO tarefas (titulo, descricao, status, data_criacao, data_atualizacao) "
+                    "VALUES (?, ?, ?, datetime('now'), datetime('now'))",
+                    linhas
+                )
+                # Com AUTOINCREMENT e o lock de escrita da transação os IDs do bloco são contíguos
+                ultimo = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids.extend(range(ultimo - len(linhas) + 1, ultimo + 1))
+            conn.commit()
+            logger.debug("%s tarefas adicionadas em lote", len(ids))
+            return ids
+    except sqlite3.Error as e:
+        logger.error("Erro ao adicionar tarefas em lote: %s", e)
+        raise
+
+@metricas.instrumentar
+def atualizar_status_em_lote(ids: Iterable[int], status: Union[Status, str],
+                             tamanho_lote: Optional[int] = None) -> int:
+    """Atualiza o status de várias tarefas em uma transação e retorna quantas mudaram.
+
+    IDs repetidos contam uma vez, e tarefas que já têm o status não são
+    contadas nem ganham nova versão.
+    """
+    status = Status.de_valor(status)
+    tamanho_lote = tamanho_lote or config.DATABASE_CONFIG['batch_size']
+    afetadas = 0
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            for bloco in _em_blocos(dict.fromkeys(ids), tamanho_lote):
+                cursor.executemany(
+                    "UPDATE tarefas SET status = ?, data_atualizacao = datetime('now'), versao = versao + 1 "
+                    "WHERE id = ? AND status != ?",
+                    [(int(status), id, int(status)) for id in bloco]
+                )
+                afetadas += cursor.rowcount
+            conn.commit()
+            logger.debug("Status de %s tarefas atualizado para '%s' em lote", afetadas, status.rotulo)
+            return afetadas
+    except sqlite3.Error as e:
+        logger.error("Erro ao atualizar status em lote: %s", e)
+        raise
+
+@metricas.instrumentar
+def deletar_em_lote(ids: Iterable[int], tamanho_lote: Optional[int] = None) -> int:
+    """Deleta várias tarefas em uma transação e retorna quantas foram removidas.
+
+    Tarefas arquivadas também são excluídas, e IDs repetidos contam uma vez.
+    """
+    tamanho_lote = tamanho_lote or config.DATABASE_CONFIG['batch_size']
+    afetadas = 0
+    try:
+        with conectar() as conn:
+            cursor = conn.cursor()
+            for bloco in _em_blocos(dict.fromkeys(ids), tamanho_lote):
+                cursor.executemany("DELETE FROM tarefas WHERE id = ?", [(id,) for id in bloco])
+                removidas = cursor.rowcount
+                if removidas < len(bloco):
+                    removidas += _excluir_do_arquivo(conn, bloco)
+                afetadas += removidas
+            conn.commit()
+            logger.debug("%s tarefas deletadas em lote", afetadas)
+            return afetadas
+    except sqlite3.Error as e:
+        logger.error("Erro ao deletar tarefas em lote: %s", e)
+        raise
+
+def plano_consulta(sql: str, params: Tuple = ()) -> List[str]:
+    """Retorna o plano de execução (EXPLAIN QUERY PLAN) de uma consulta."""
+    with conectar() as conn:
+        cursor = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [linha['detail'] for linha in cursor.fetchall()]
@@ -0,0 +1,446 @@
+"""
+Servidor HTTP/JSON sobre o controller, para outras ferramentas lerem e
+gravarem tarefas sem a interface gráfica. Usa só a biblioteca padrão.
+
+Uso:
+    python servidor.py [-v] [--banco ARQUIVO] [--host 127.0.0.1] [--porta 8765] [--grupo]
+
+Rotas:
+    GET    /tarefas?limite=&apos=&status=&arquivadas=1&ordem=
+                                           página da listagem e cursor da próxima
+    POST   /tarefas                        {"titulo": ..., "descricao": ...}
+    GET    /tarefas/ID
+    PATCH  /tarefas/ID                     {"titulo"?, "descricao"?, "status"?, "versao"?}
+    DELETE /tarefas/ID
+    GET    /busca?q=&limite=
+    GET    /contagem
+    GET    /metricas                       instrumentação do model e do controller
+    POST   /lote/tarefas                   {"tarefas": [{"titulo": ..., "descricao": ...}, ...]}
+    POST   /lote/status                    {"ids": [...], "status": ...}
+    POST   /lote/excluir                   {"ids": [...]}
+
+As conexões são persistentes (keep-alive do HTTP/1.1) e aceitam pipelining:
+requisições enviadas em sequência na mesma conexão são respondidas na
+ordem de chegada.
+
+A listagem é ordenada por `ordem`: data_criacao, id, titulo ou status,
+crescente, ou decrescente com "-" na frente (padrão: -data_criacao). O
+cursor "proximo" só vale para a mesma ordem.
+
+O `limite` de /tarefas e /busca vai de 1 a SERVER_CONFIG['max_limit'];
+fora disso a resposta é 400.
+
+Um PATCH com "versao" só é aplicado se a tarefa ainda estiver nessa versão
+(a devolvida pelo GET); caso contrário a resposta é 409 com a versão atual.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import config
+import controller
+import logs
+
+logger = logging.getLogger(__name__)
+
+class ErroHttp(Exception):
+    """Erro com código HTTP próprio, devolvido ao cliente como JSON."""
+
+    def __init__(self, codigo: HTTPStatus, mensagem: str):
+        super().__init__(mensagem)
+        self.codigo = codigo
+
+def cursor_para_texto(cursor: Optional[controller.model.CursorPagina]) -> Optional[str]:
+    """Serializa o cursor da listagem como "valor,id" (valor da coluna de ordenação)."""
+    return None if cursor is None else f"{cursor[0]},{cursor[1]}"
+
+def texto_para_cursor(texto: str, ordenar_por: str = 'data_criacao') -> controller.model.CursorPagina:
+    """Inverso de cursor_para_texto, para a listagem ordenada por `ordenar_por`."""
+    valor, _, id = texto.rpartition(",")
+    if not valor or not id.isdigit():
+        raise ValueError("Cursor 'apos' inválido")
+    if ordenar_por in ('id', 'status'):
+        if not valor.isdigit():
+            raise ValueError("Cursor 'apos' inválido")
+        return int(valor), int(id)
+    return valor, int(id)
+
+def _ordenacao(consulta: Dict[str, str]) -> Tuple[str, bool]:
+    """Lê `ordem=coluna` (crescente) ou `ordem=-coluna` (decrescente)."""
+    ordem = consulta.get("ordem") or "-data_criacao"
+    coluna = ordem.lstrip("-")
+    if coluna not in controller.ORDENACOES:
+        raise ValueError(f"Parâmetro 'ordem' deve ser uma de: {', '.join(controller.ORDENACOES)}")
+    return coluna, ordem.startswith("-")
+
+def _inteiro(consulta: Dict[str, str], nome: str) -> Optional[int]:
+    valor = consulta.get(nome)
+    if valor is None:
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{nome}' deve ser um número inteiro")
+
+def _limite(consulta: Dict[str, str]) -> Optional[int]:
+    """Lê `limite`, que precisa estar entre 1 e SERVER_CONFIG['max_limit']."""
+    limite = _inteiro(consulta, "limite")
+    maximo = config.SERVER_CONFIG['max_limit']
+    if limite is not None and not 1 <= limite <= maximo:
+        raise ValueError(f"Parâmetro 'limite' deve estar entre 1 e {maximo}")
+    return limite
+
+def _ids(corpo: dict) -> list:
+    ids = corpo.get("ids")
+    if not isinstance(ids, list) or not all(isinstance(id, int) for id in ids):
+        raise ValueError("Campo 'ids' deve ser uma lista de inteiros")
+    return ids
+
+def _texto(dados: dict, nome: str) -> str:
+    """Campo de texto opcional do corpo; ausente ou null vira ""."""
+    valor = dados.get(nome)
+    if valor is None:
+        return ""
+    if not isinstance(valor, str):
+        raise ValueError(f"Campo '{nome}' deve ser texto")
+    return valor
+
+def _campos_edicao(corpo: dict) -> Tuple[Optional[int], dict]:
+    """Separa a versão esperada e os campos editáveis do corpo de um PATCH.
+
+    Os demais campos (id, datas...) são ignorados, para o cliente poder
+    devolver a tarefa como a recebeu.
+    """
+    versao = corpo.get("versao")
+    if versao is not None and (not isinstance(versao, int) or isinstance(versao, bool)):
+        raise ValueError("Campo 'versao' deve ser um número inteiro")
+    campos = {campo: corpo[campo] for campo in controller.model.CAMPOS_EDITAVEIS if campo in corpo}
+    for campo in ('titulo', 'descricao'):
+        if campo in campos:
+            campos[campo] = _texto(corpo, campo)
+    return versao, campos
+
+class ServidorTarefas:
+    """Servidor asyncio que expõe as operações do controller como JSON.
+
+    As chamadas ao SQLite são bloqueantes e rodam fora do laço de eventos:
+    escritas em uma única thread, como no executor da interface, e leituras
+    em um pool de `trabalhadores` threads. No máximo `max_pendentes`
+    chamadas ficam em andamento ou na fila ao mesmo tempo; as demais
+    conexões aguardam vaga sem ocupar threads.
+    """
+
+    def __init__(self, host: str, porta: int, trabalhadores: int, max_pendentes: int,
+                 timeout_conexao: float, max_corpo: int):
+        self.host = host
+        self.porta = porta
+        self.timeout_conexao = timeout_conexao
+        self.max_corpo = max_corpo
+        self._leitores = ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="http-leitura")
+        self._escritor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="http-escrita")
+        self.max_pendentes = max_pendentes
+        # Criado já dentro do laço de eventos: até o Python 3.9 o semáforo se
+        # prende ao laço atual na criação, e o asyncio.run cria um laço novo
+        self._vagas: Optional[asyncio.Semaphore] = None
+        # Leituras ainda não terminadas, canceladas no encerramento
+        self._leituras: Set[Future] = set()
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._manutencao: Optional[asyncio.Task] = None
+        self._rotas = [
+            ("GET", re.compile(r"/tarefas"), self._listar),
+            ("POST", re.compile(r"/tarefas"), self._adicionar),
+            ("GET", re.compile(r"/tarefas/(\d+)"), self._obter),
+            ("PATCH", re.compile(r"/tarefas/(\d+)"), self._atualizar),
+            ("DELETE", re.compile(r"/tarefas/(\d+)"), self._deletar),
+            ("GET", re.compile(r"/busca"), self._buscar),
+            ("GET", re.compile(r"/contagem"), self._contar),
+            ("GET", re.compile(r"/metricas"), self._metricas),
+            ("POST", re.compile(r"/lote/tarefas"), self._adicionar_lote),
+            ("POST", re.compile(r"/lote/status"), self._status_lote),
+            ("POST", re.compile(r"/lote/excluir"), self._deletar_lote),
+        ]
+
+    def _semaforo(self) -> asyncio.Semaphore:
+        if self._vagas is None:
+            self._vagas = asyncio.Semaphore(self.max_pendentes)
+        return self._vagas
+
+    async def _ler(self, funcao: Callable, *args):
+        """Executa uma leitura bloqueante no pool de leitores."""
+        async with self._semaforo():
+            futuro = self._leitores.submit(funcao, *args)
+            self._leituras.add(futuro)
+            futuro.add_done_callback(self._leituras.discard)
+            return await asyncio.wrap_future(futuro)
+
+    async def _escrever(self, funcao: Callable, *args):
+        """Executa uma escrita bloqueante na thread escritora, ou no próximo
+        grupo quando a escrita em grupo está ligada."""
+        async with self._semaforo():
+            if controller.escrita_em_grupo_ativa():
+                return await asyncio.wrap_future(controller.submeter(funcao, *args))
+            return await asyncio.get_running_loop().run_in_executor(self._escritor, partial(funcao, *args))
+
+    async def iniciar(self) -> None:
+        """Verifica o schema e começa a aceitar conexões."""
+        await asyncio.get_running_loop().run_in_executor(self._escritor, controller.inicializar)
+        if config.ARCHIVE_CONFIG['enabled']:
+            controller.iniciar_arquivamento()
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        self._manutencao = asyncio.create_task(self._acompanhar_mudancas())
+        logger.info("Servidor de tarefas ouvindo em http://%s:%s", self.host, self.porta)
+
+    async def servir(self) -> None:
+        """Atende conexões até ser cancelado."""
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    async def _acompanhar_mudancas(self) -> None:
+        """Lê o changelog periodicamente para o cache do controller não servir
+        tarefas alteradas por outros processos, e poda as entradas antigas."""
+        cfg = config.CHANGELOG_CONFIG
+        loop = asyncio.get_running_loop()
+        seq = await self._ler(controller.ultima_mudanca)
+        ultima_poda = loop.time()
+        while True:
+            await asyncio.sleep(cfg['poll_ms'] / 1000)
+            try:
+                seq, _ = await self._ler(controller.mudancas_desde, seq)
+                if loop.time() - ultima_poda >= cfg['prune_interval_s']:
+                    ultima_poda = loop.time()
+                    await self._escrever(controller.podar_mudancas)
+            except Exception as e:
+                logger.error("Erro ao acompanhar o changelog: %s", e)
+
+    async def encerrar(self) -> None:
+        """Para de aceitar conexões e aguarda as escritas pendentes."""
+        if self._manutencao is not None:
+            self._manutencao.cancel()
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        # shutdown(cancel_futures=True) só existe a partir do Python 3.9
+        for futuro in list(self._leituras):
+            futuro.cancel()
+        self._leitores.shutdown(wait=False)
+        await asyncio.get_running_loop().run_in_executor(None, self._escritor.shutdown)
+
+    # ----- Protocolo -----
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Atende as requisições de uma conexão, uma após a outra."""
+        try:
+            while True:
+                try:
+                    cabecalho = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.timeout_conexao)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    self._responder(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                    {"erro": "Cabeçalho muito grande"}, manter=False)
+                    await writer.drain()
+                    return
+                manter = await self._processar(cabecalho, reader, writer)
+                # Com pipelining, as próximas requisições já podem estar no buffer
+                await writer.drain()
+                if not manter:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _processar(self, cabecalho: bytes, reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> bool:
+        """Lê o corpo, executa a rota e escreve a resposta. Retorna se a conexão continua."""
+        try:
+            linha, *campos = cabecalho.decode("latin-1").split("\r\n")
+            metodo, alvo, versao = linha.split(" ")
+            cabecalhos = {}
+            for campo in filter(None, campos):
+                nome, _, valor = campo.partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+        except ValueError:
+            self._responder(writer, HTTPStatus.BAD_REQUEST, {"erro": "Requisição malformada"}, manter=False)
+            return False
+
+        conexao = cabecalhos.get("connection", "").lower()
+        manter = conexao == "keep-alive" if versao == "HTTP/1.0" else conexao != "close"
+
+        if "transfer-encoding" in cabecalhos:
+            self._responder(writer, HTTPStatus.NOT_IMPLEMENTED,
+                            {"erro": "Transfer-Encoding não suportado; use Content-Length"}, manter=False)
+            return False
+        try:
+            tamanho = int(cabecalhos.get("content-length", 0))
+        except ValueError:
+            tamanho = -1
+        if tamanho < 0 or tamanho > self.max_corpo:
+            self._responder(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            {"erro": "Corpo da requisição inválido ou muito grande"}, manter=False)
+            return False
+        try:
+            corpo = await reader.readexactly(tamanho) if tamanho else b""
+        except asyncio.IncompleteReadError:
+            return False
+
+        codigo, dados = await self._despachar(metodo, alvo, corpo)
+        self._responder(writer, codigo, dados, manter)
+        return manter
+
+    def _responder(self, writer: asyncio.StreamWriter, codigo: HTTPStatus, dados, manter: bool) -> None:
+        corpo = b"" if dados is None else json.dumps(dados, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {codigo.value} {codigo.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + corpo)
+
+    async def _despachar(self, metodo: str, alvo: str, corpo: bytes) -> Tuple[HTTPStatus, object]:
+        """Encontra a rota e converte exceções em respostas de erro."""
+        partes = urlsplit(alvo)
+        caminho = unquote(partes.path).rstrip("/") or "/"
+        consulta = {nome: valores[-1] for nome, valores in parse_qs(partes.query).items()}
+        try:
+            metodos_permitidos = False
+            for metodo_rota, padrao, tratar in self._rotas:
+                encontrado = padrao.fullmatch(caminho)
+                if encontrado is None:
+                    continue
+                if metodo_rota != metodo:
+                    metodos_permitidos = True
+                    continue
+                dados = json.loads(corpo) if corpo else {}
+                if not isinstance(dados, dict):
+                    raise ValueError("Corpo da requisição deve ser um objeto JSON")
+                return await tratar(consulta, dados, *encontrado.groups())
+            if metodos_permitidos:
+                raise ErroHttp(HTTPStatus.METHOD_NOT_ALLOWED, f"Método {metodo} não permitido em {caminho}")
+            raise ErroHttp(HTTPStatus.NOT_FOUND, f"Rota {caminho} não encontrada")
+        except ErroHttp as e:
+            return e.codigo, {"erro": str(e)}
+        except controller.ConflitoVersao as e:
+            return HTTPStatus.CONFLICT, {"erro": str(e), "versao": e.atual}
+        except json.JSONDecodeError as e:
+            return HTTPStatus.BAD_REQUEST, {"erro": f"JSON inválido: {e}"}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"erro": str(e)}
+        except Exception as e:
+            logger.error("Erro ao atender %s %s: %s", metodo, caminho, e)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": config.MESSAGES['error_generic']}
+
+    # ----- Rotas -----
+
+    async def _listar(self, consulta: dict, corpo: dict):
+        apos = consulta.get("apos")
+        ordenar_por, decrescente = _ordenacao(consulta)
+        tarefas, proximo = await self._ler(
+            controller.listar_pagina, _limite(consulta),
+            texto_para_cursor(apos, ordenar_por) if apos else None, consulta.get("status"),
+            consulta.get("arquivadas") in ("1", "true"), ordenar_por, decrescente)
+        return HTTPStatus.OK, {"tarefas": [t.como_dict() for t in tarefas],
+                               "proximo": cursor_para_texto(proximo)}
+
+    async def _adicionar(self, consulta: dict, corpo: dict):
+        id = await self._escrever(controller.adicionar_tarefa, _texto(corpo, "titulo"),
+                                  _texto(corpo, "descricao"))
+        return HTTPStatus.CREATED, {"id": id}
+
+    async def _obter(self, consulta: dict, corpo: dict, id: str):
+        tarefa = await self._ler(controller.buscar_tarefa, int(id))
+        if tarefa is None:
+            raise ErroHttp(HTTPStatus.NOT_FOUND, "Tarefa não encontrada")
+        return HTTPStatus.OK, tarefa.como_dict()
+
+    async def _atualizar(self, consulta: dict, corpo: dict, id: str):
+        versao, campos = _campos_edicao(corpo)
+        tarefa = await self._escrever(partial(controller.atualizar_campos, int(id), versao, **campos))
+        if tarefa is None:
+            raise ErroHttp(HTTPStatus.NOT_FOUND, "Tarefa não encontrada")
+        return HTTPStatus.OK, tarefa.como_dict()
+
+    async def _deletar(self, consulta: dict, corpo: dict, id: str):
+        if not await self._escrever(controller.deletar, int(id)):
+            raise ErroHttp(HTTPStatus.NOT_FOUND, "Tarefa não encontrada")
+        return HTTPStatus.NO_CONTENT, None
+
+    async def _buscar(self, consulta: dict, corpo: dict):
+        tarefas = await self._ler(controller.buscar_tarefas, consulta.get("q", ""),
+                                  _limite(consulta))
+        return HTTPStatus.OK, {"tarefas": [t.como_dict() for t in tarefas]}
+
+    async def _contar(self, consulta: dict, corpo: dict):
+        contagem = await self._ler(controller.contar_por_status)
+        return HTTPStatus.OK, {status.rotulo: total for status, total in contagem.items()}
+
+    async def _metricas(self, consulta: dict, corpo: dict):
+        # Só lê contadores em memória: não precisa sair do laço de eventos
+        return HTTPStatus.OK, controller.metricas()
+
+    async def _adicionar_lote(self, consulta: dict, corpo: dict):
+        tarefas = corpo.get("tarefas")
+        if not isinstance(tarefas, list) or not all(isinstance(t, dict) for t in tarefas):
+            raise ValueError("Campo 'tarefas' deve ser uma lista de objetos")
+        ids = await self._escrever(controller.adicionar_tarefas_em_lote,
+                                   [(_texto(t, "titulo"), _texto(t, "descricao")) for t in tarefas])
+        return HTTPStatus.CREATED, {"ids": ids}
+
+    async def _status_lote(self, consulta: dict, corpo: dict):
+        afetadas = await self._escrever(controller.atualizar_status_em_lote, _ids(corpo),
+                                        corpo.get("status", ""))
+        return HTTPStatus.OK, {"afetadas": afetadas}
+
+    async def _deletar_lote(self, consulta: dict, corpo: dict):
+        afetadas = await self._escrever(controller.deletar_em_lote, _ids(corpo))
+        return HTTPStatus.OK, {"afetadas": afetadas}
+
+def criar_servidor(host: Optional[str] = None, porta: Optional[int] = None) -> ServidorTarefas:
+    """Cria o servidor com os valores de SERVER_CONFIG."""
+    cfg = config.SERVER_CONFIG
+    return ServidorTarefas(host or cfg['host'], cfg['port'] if porta is None else porta,
+                           cfg['workers'], cfg['max_pending'], cfg['keepalive_timeout'],
+                           cfg['max_body'])
+
+async def _executar(servidor: ServidorTarefas) -> None:
+    await servidor.iniciar()
+    print(f"Servidor de tarefas em http://{servidor.host}:{servidor.porta}", flush=True)
+    try:
+        await servidor.servir()
+    finally:
+        await servidor.encerrar()
+
+def main(argv=None) -> int:
+    """Função principal do servidor."""
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON do sistema de tarefas")
+    parser.add_argument("-v", "--verbose", action="store_true", help="mostra os logs de operação")
+    parser.add_argument("--banco", help="arquivo do banco SQLite (padrão: database.db)")
+    parser.add_argument("--host", default=config.SERVER_CONFIG['host'])
+    parser.add_argument("--porta", type=int, default=config.SERVER_CONFIG['port'])
+    parser.add_argument("--grupo", action="store_true",
+                        help="confirma as escritas em grupo (ver GROUP_COMMIT_CONFIG)")
+    args = parser.parse_args(argv)
+    logs.configurar_logs(logging.DEBUG if args.verbose else logging.WARNING)
+    if args.banco:
+        controller.usar_banco(args.banco)
+    if args.grupo:
+        config.GROUP_COMMIT_CONFIG['enabled'] = True
+    try:
+        asyncio.run(_executar(criar_servidor(args.host, args.porta)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        controller.finalizar()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
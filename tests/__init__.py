@@ -0,0 +1,32 @@
+"""
+Testes do sistema de tarefas. Rodam só com a biblioteca padrão:
+
+    python -m unittest
+"""
+
+import logging
+import os
+import tempfile
+import unittest
+
+import controller
+import model
+
+# Avisos esperados (tarefa não encontrada, conflito de versão...) não poluem a saída
+logging.getLogger().addHandler(logging.NullHandler())
+
+class TesteComBanco(unittest.TestCase):
+    """Aponta o controller para um banco novo em um diretório temporário."""
+
+    def setUp(self):
+        self._diretorio = tempfile.TemporaryDirectory()
+        self._banco_original = model.DB_NAME
+        self.banco = os.path.join(self._diretorio.name, "tarefas.db")
+        controller.usar_banco(self.banco)
+        controller.inicializar()
+
+    def tearDown(self):
+        controller.finalizar()
+        model.MEMORIA = False
+        model.DB_NAME = self._banco_original
+        self._diretorio.cleanup()
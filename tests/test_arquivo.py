@@ -0,0 +1,54 @@
+import sqlite3
+from contextlib import closing
+
+import controller
+
+from tests import TesteComBanco
+
+class TesteTarefasArquivadas(TesteComBanco):
+
+    def setUp(self):
+        super().setUp()
+        self.ids = controller.adicionar_tarefas_em_lote([f"tarefa {i}" for i in range(4)])
+        controller.atualizar_status_em_lote(self.ids, controller.Status.CONCLUIDA)
+        with closing(sqlite3.connect(self.banco)) as conn:
+            conn.execute("UPDATE tarefas SET data_atualizacao = datetime('now', '-60 days')")
+            conn.commit()
+        self.assertEqual(controller.arquivar_concluidas(30), 4)
+
+    def _no_arquivo(self) -> set:
+        with closing(sqlite3.connect(self.banco)) as conn:
+            return {linha[0] for linha in conn.execute("SELECT id FROM tarefas_arquivo")}
+
+    def test_busca_por_id_encontra_arquivada(self):
+        tarefa = controller.buscar_tarefa(self.ids[0])
+        self.assertIsNotNone(tarefa)
+        self.assertEqual(tarefa.titulo, "tarefa 0")
+
+    def test_exclui_arquivadas(self):
+        seq = controller.ultima_mudanca()
+        self.assertTrue(controller.deletar(self.ids[0]))
+        self.assertEqual(controller.deletar_em_lote(self.ids[1:3]), 2)
+        self.assertEqual(self._no_arquivo(), {self.ids[3]})
+        self.assertIsNone(controller.buscar_tarefa(self.ids[0]))
+        _, mudancas = controller.mudancas_desde(seq)
+        self.assertEqual([(m.op, m.id) for m in mudancas],
+                         [(controller.OP_REMOVIDA, id) for id in self.ids[:3]])
+
+    def test_editar_arquivada_a_devolve_a_listagem(self):
+        tarefa = controller.buscar_tarefa(self.ids[0])
+        atualizada = controller.atualizar_campos(self.ids[0], tarefa.versao, status="pendente")
+        self.assertEqual(atualizada.status, controller.Status.PENDENTE)
+        self.assertEqual(atualizada.versao, tarefa.versao + 1)
+        self.assertNotIn(self.ids[0], self._no_arquivo())
+        pagina, _ = controller.listar_pagina(10)
+        self.assertEqual([t.id for t in pagina], [self.ids[0]])
+        self.assertEqual(controller.contar_por_status()[controller.Status.PENDENTE], 1)
+
+    def test_reabrir_em_lote_devolve_arquivadas(self):
+        self.assertEqual(controller.atualizar_status_em_lote(self.ids[:2], "pendente"), 2)
+        self.assertEqual(self._no_arquivo(), set(self.ids[2:]))
+
+    def test_concluir_arquivadas_concluidas_nao_as_devolve(self):
+        self.assertEqual(controller.atualizar_status_em_lote(self.ids[:2], "concluida"), 0)
+        self.assertEqual(self._no_arquivo(), set(self.ids))
@@ -0,0 +1,27 @@
+import controller
+import model
+
+from tests import TesteComBanco
+
+class TesteBusca(TesteComBanco):
+
+    def test_titulo_pesa_mais_que_descricao(self):
+        na_descricao = controller.adicionar_tarefa("pagar contas", "levar o relatório")
+        no_titulo = controller.adicionar_tarefa("revisar relatório", "")
+        controller.adicionar_tarefa("outra coisa", "")
+        ids = [tarefa.id for tarefa in controller.buscar_tarefas("relatorio")]
+        self.assertEqual(ids, [no_titulo, na_descricao])
+
+    def test_empate_fica_com_a_mais_recente(self):
+        ids = controller.adicionar_tarefas_em_lote([f"reunião {i}" for i in range(5)])
+        self.assertEqual([tarefa.id for tarefa in controller.buscar_tarefas("reun")], ids[::-1])
+
+    def test_so_o_ultimo_termo_e_prefixo(self):
+        self.assertEqual(model._expressao_busca("casa urgen"), '"casa" "urgen"*')
+        # Uma letra não é expandida: o índice só guarda prefixos de 2 e 3 letras
+        self.assertEqual(model._expressao_busca("c"), '"c"')
+        self.assertEqual(model._expressao_busca("  "), "")
+
+    def test_limite_maior_que_os_candidatos(self):
+        controller.adicionar_tarefas_em_lote([f"tarefa {i}" for i in range(300)])
+        self.assertEqual(len(controller.buscar_tarefas("tarefa", 250)), 250)
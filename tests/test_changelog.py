@@ -0,0 +1,49 @@
+import controller
+
+from tests import TesteComBanco
+
+class TesteMudancasDesde(TesteComBanco):
+
+    def test_eventos_desde_a_sequencia(self):
+        seq = controller.ultima_mudanca()
+        mantida, alterada, removida = controller.adicionar_tarefas_em_lote(["a", "b", "c"])
+        seq, eventos = controller.mudancas_desde(seq)
+        self.assertEqual([(m.op, m.id) for m in eventos],
+                         [(controller.OP_INSERIDA, id) for id in (mantida, alterada, removida)])
+
+        controller.editar_tarefa(alterada, "b1")
+        controller.concluir(alterada)
+        controller.deletar(removida)
+        novo_seq, eventos = controller.mudancas_desde(seq)
+        # Várias mudanças da mesma tarefa viram um evento com a linha atual
+        self.assertEqual([(m.op, m.id) for m in eventos],
+                         [(controller.OP_ATUALIZADA, alterada), (controller.OP_REMOVIDA, removida)])
+        self.assertEqual((eventos[0].tarefa.titulo, eventos[0].tarefa.status),
+                         ("b1", controller.Status.CONCLUIDA))
+        self.assertEqual(novo_seq, controller.ultima_mudanca())
+        self.assertEqual(controller.mudancas_desde(novo_seq), (novo_seq, []))
+
+    def test_inserida_e_alterada_continua_inserida(self):
+        seq = controller.ultima_mudanca()
+        id = controller.adicionar_tarefa("a")
+        controller.concluir(id)
+        _, eventos = controller.mudancas_desde(seq)
+        self.assertEqual([(m.op, m.id) for m in eventos], [(controller.OP_INSERIDA, id)])
+
+    def test_historico_podado_pede_recarga(self):
+        seq = controller.ultima_mudanca()
+        controller.adicionar_tarefas_em_lote([f"t{i}" for i in range(5)])
+        controller.model.podar_mudancas(2)
+        ultima, eventos = controller.mudancas_desde(seq)
+        self.assertIsNone(eventos)
+        self.assertEqual(ultima, controller.ultima_mudanca())
+        # A partir do ponto devolvido o histórico volta a estar completo
+        self.assertEqual(controller.mudancas_desde(ultima), (ultima, []))
+
+    def test_sequencia_de_outro_banco_pede_recarga(self):
+        self.assertIsNone(controller.mudancas_desde(controller.ultima_mudanca() + 100)[1])
+
+    def test_mudancas_demais_pedem_recarga(self):
+        seq = controller.ultima_mudanca()
+        controller.adicionar_tarefas_em_lote([f"t{i}" for i in range(5)])
+        self.assertIsNone(controller.mudancas_desde(seq, limite=3)[1])
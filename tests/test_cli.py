@@ -0,0 +1,55 @@
+import contextlib
+import io
+import json
+import os
+
+import cli
+import controller
+
+from tests import TesteComBanco
+
+class TesteCli(TesteComBanco):
+
+    def _executar(self, *args) -> int:
+        self.saida = io.StringIO()
+        with contextlib.redirect_stdout(self.saida), contextlib.redirect_stderr(io.StringIO()):
+            return cli.main(["--banco", self.banco, *args])
+
+    def _arquivo(self, registros) -> str:
+        caminho = os.path.join(os.path.dirname(self.banco), "tarefas.jsonl")
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            for registro in registros:
+                arquivo.write(json.dumps(registro) + "\n")
+        return caminho
+
+    def test_concluidas_sao_gravadas_com_um_unico_insert(self):
+        seq = controller.ultima_mudanca()
+        caminho = self._arquivo([{"titulo": "a"}, {"titulo": "b", "status": "concluída"}])
+        self.assertEqual(self._executar("import", caminho), 0)
+        controller.usar_banco(self.banco)
+        tarefas = {t.titulo: t for t in controller.listar()}
+        self.assertEqual(tarefas["b"].status, controller.Status.CONCLUIDA)
+        self.assertEqual({t.versao for t in tarefas.values()}, {1})
+        _, eventos = controller.mudancas_desde(seq)
+        self.assertEqual(len(eventos), 2)
+        self.assertEqual(controller.contar_por_status()[controller.Status.CONCLUIDA], 1)
+
+    def test_registros_invalidos_sao_erro_de_validacao(self):
+        for registro in ({"titulo": 5}, {"titulo": "a", "descricao": ["x"]}, {"titulo": "a", "status": "talvez"}):
+            with self.subTest(registro=registro):
+                self.assertEqual(self._executar("import", self._arquivo([{"titulo": "ok"}, registro])), 2)
+        controller.usar_banco(self.banco)
+        self.assertEqual(controller.listar(), [])
+
+    def test_done_com_ids_repetidos_e_ja_concluidos(self):
+        ids = controller.adicionar_tarefas_em_lote(["a", "b"])
+        controller.concluir(ids[1])
+        self.assertEqual(self._executar("done", str(ids[0]), str(ids[0]), str(ids[1])), 0)
+        self.assertEqual(self.saida.getvalue().strip(), "1 tarefa(s) concluída(s)")
+        self.assertEqual(self._executar("done", str(ids[0]), str(ids[1] + 1)), 1)
+
+    def test_rm_com_ids_repetidos(self):
+        ids = controller.adicionar_tarefas_em_lote(["a", "b"])
+        self.assertEqual(self._executar("rm", str(ids[0]), str(ids[0])), 0)
+        self.assertEqual(self.saida.getvalue().strip(), "1 tarefa(s) excluída(s)")
+        self.assertEqual(self._executar("rm", str(ids[0]), str(ids[1])), 1)
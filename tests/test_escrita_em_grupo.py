@@ -0,0 +1,86 @@
+import threading
+from concurrent.futures import wait
+
+import controller
+import executor
+import model
+
+from tests import TesteComBanco
+
+class TesteEscritaEmGrupo(TesteComBanco):
+
+    def setUp(self):
+        super().setUp()
+        # Janela longa: as escritas submetidas juntas caem no mesmo grupo
+        controller.configurar_escrita_em_grupo(True, janela_ms=200, max_operacoes=1000)
+
+    def tearDown(self):
+        controller.configurar_escrita_em_grupo(False)
+        super().tearDown()
+
+    def test_escritas_concorrentes_sao_confirmadas_juntas(self):
+        futuros = []
+        lock = threading.Lock()
+
+        def submeter(inicio):
+            for i in range(inicio, inicio + 25):
+                futuro = controller.submeter(controller.adicionar_tarefa, f"tarefa {i}")
+                with lock:
+                    futuros.append(futuro)
+
+        threads = [threading.Thread(target=submeter, args=(n * 25,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wait(futuros, timeout=10)
+        ids = [futuro.result() for futuro in futuros]
+        self.assertEqual(len(set(ids)), 100)
+
+        estatisticas = controller.escrita_em_grupo_estatisticas()
+        self.assertEqual(estatisticas['operacoes'], 100)
+        self.assertLess(estatisticas['commits'], 100)
+        self.assertEqual(controller.contar_por_status()[controller.Status.PENDENTE], 100)
+
+    def test_falha_desfaz_so_a_propria_operacao(self):
+        id = controller.adicionar_tarefa("existente")
+        versao = controller.buscar_tarefa(id).versao
+        antes = controller.submeter(controller.adicionar_tarefa, "antes")
+        invalida = controller.submeter(controller.adicionar_tarefa, "   ")
+        conflito = controller.submeter(controller.atualizar_campos, id, versao + 5, titulo="x")
+        depois = controller.submeter(controller.atualizar_campos, id, versao, titulo="novo")
+        wait([antes, invalida, conflito, depois], timeout=10)
+
+        self.assertIsInstance(invalida.exception(), ValueError)
+        self.assertIsInstance(conflito.exception(), controller.ConflitoVersao)
+        self.assertEqual(controller.buscar_tarefa(antes.result()).titulo, "antes")
+        self.assertEqual(depois.result().titulo, "novo")
+        self.assertEqual(model.buscar_tarefa_por_id(id).versao, versao + 1)
+
+    def test_desligar_espera_as_pendentes(self):
+        futuros = [controller.submeter(controller.adicionar_tarefa, f"t{i}") for i in range(10)]
+        controller.configurar_escrita_em_grupo(False)
+        self.assertTrue(all(futuro.done() for futuro in futuros))
+        self.assertEqual(controller.contar_por_status()[controller.Status.PENDENTE], 10)
+        # Desligada, submeter executa na hora
+        self.assertTrue(controller.submeter(controller.adicionar_tarefa, "direta").done())
+
+    def test_executor_entrega_resultado_do_grupo(self):
+        # Caminho da interface: a escrita vai pelo grupo e a leitura roda depois do commit
+        banco = executor.ExecutorBanco()
+        entregues = []
+        banco.acompanhar(
+            controller.submeter(controller.adicionar_tarefa, "pela interface"),
+            ao_concluir=lambda id: banco.ler(controller.mudanca, controller.OP_INSERIDA, id,
+                                             ao_concluir=entregues.append))
+        try:
+            for _ in range(200):
+                banco.processar_resultados()
+                if entregues:
+                    break
+                threading.Event().wait(0.01)
+        finally:
+            banco.encerrar()
+        self.assertEqual(entregues[0].tarefa.titulo, "pela interface")
+        self.assertEqual(banco.pendentes, 0)
+        self.assertEqual(controller.escrita_em_grupo_estatisticas()['operacoes'], 1)
@@ -0,0 +1,42 @@
+import controller
+import model
+
+from tests import TesteComBanco
+
+class TestePlanosListagem(TesteComBanco):
+    """A listagem e os filtros de status devem ler na ordem de um índice, sem ordenar."""
+
+    def setUp(self):
+        super().setUp()
+        ids = controller.adicionar_tarefas_em_lote([f"tarefa {i}" for i in range(200)])
+        controller.atualizar_status_em_lote(ids[::3], controller.Status.CONCLUIDA)
+
+    def _plano(self, status, apos, incluir_arquivadas, ordenar_por='data_criacao', decrescente=True):
+        sql, params = model._consulta_listagem(status, apos, incluir_arquivadas, 51,
+                                               ordenar_por, decrescente)
+        return " | ".join(model.plano_consulta(sql, params))
+
+    def test_listagem_usa_indices(self):
+        for status in (None, controller.Status.PENDENTE, controller.Status.CONCLUIDA):
+            for apos in (None, ("2024-01-01 00:00:00", 10)):
+                with self.subTest(status=status, apos=apos):
+                    plano = self._plano(status, apos, False)
+                    self.assertIn("idx_tarefas_", plano)
+                    self.assertNotIn("USE TEMP B-TREE", plano)
+
+    def test_filtro_de_status_usa_indice_composto(self):
+        plano = self._plano(controller.Status.PENDENTE, ("2024-01-01 00:00:00", 10), False)
+        self.assertIn("idx_tarefas_status_data", plano)
+
+    def test_ordenacoes_e_arquivadas_nao_ordenam_em_tabela_temporaria(self):
+        for ordenar_por in model.ORDENACOES:
+            apos = (10, 10) if ordenar_por in ('id', 'status') else ("m", 10)
+            for decrescente in (True, False):
+                for status in (None, controller.Status.PENDENTE, controller.Status.CONCLUIDA):
+                    for incluir_arquivadas in (False, True):
+                        with self.subTest(ordenar_por=ordenar_por, decrescente=decrescente,
+                                          status=status, arquivadas=incluir_arquivadas):
+                            plano = self._plano(status, apos, incluir_arquivadas, ordenar_por, decrescente)
+                            self.assertNotIn("USE TEMP B-TREE", plano)
+                            if ordenar_por != 'id':
+                                self.assertIn("idx_tarefas_", plano)
@@ -0,0 +1,72 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import controller
+import model
+
+from tests import TesteComBanco
+
+class TesteSnapshot(TesteComBanco):
+
+    def setUp(self):
+        super().setUp()
+        controller.adicionar_tarefas_em_lote([(f"disco {i}", "") for i in range(500)])
+        controller.usar_memoria(True)
+        controller.adicionar_tarefas_em_lote([(f"memória {i}", "") for i in range(3000)])
+
+    def _contar_no_arquivo(self) -> int:
+        with closing(sqlite3.connect(self.banco)) as conn:
+            self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], "ok")
+            return conn.execute("SELECT COUNT(*) FROM tarefas").fetchone()[0]
+
+    def test_snapshot_termina_com_escritas_continuas(self):
+        parar = threading.Event()
+
+        def escrever():
+            i = 0
+            while not parar.is_set():
+                controller.adicionar_tarefa(f"durante {i}")
+                i += 1
+
+        escritor = threading.Thread(target=escrever)
+        escritor.start()
+        try:
+            antes = controller.contar_por_status()[controller.Status.PENDENTE]
+            resultado = []
+            snapshot = threading.Thread(target=lambda: resultado.append(model._obter_pool().salvar(4)))
+            snapshot.start()
+            snapshot.join(20)
+            self.assertFalse(snapshot.is_alive(), "snapshot não terminou com escritas contínuas")
+            self.assertEqual(resultado, [True])
+        finally:
+            parar.set()
+            escritor.join()
+        self.assertGreaterEqual(self._contar_no_arquivo(), antes)
+
+        controller.usar_memoria(False)
+        self.assertEqual(self._contar_no_arquivo(),
+                         controller.contar_por_status()[controller.Status.PENDENTE])
+
+    def test_conexao_entregue_em_ordem(self):
+        pool = model._obter_pool()
+        parar = threading.Event()
+
+        def monopolizar():
+            # Devolve e pega de novo sem pausa, como um escritor ocupado
+            while not parar.is_set():
+                pool.devolver(pool.obter())
+
+        threads = [threading.Thread(target=monopolizar) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        try:
+            inicio = time.monotonic()
+            for _ in range(50):
+                pool.devolver(pool.obter())
+            self.assertLess(time.monotonic() - inicio, pool.timeout)
+        finally:
+            parar.set()
+            for thread in threads:
+                thread.join()
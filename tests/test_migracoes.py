@@ -0,0 +1,41 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from contextlib import closing
+
+import model
+
+class TesteMigracoes(unittest.TestCase):
+
+    def setUp(self):
+        self._diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self._diretorio.cleanup)
+        self.caminho = os.path.join(self._diretorio.name, "antigo.db")
+        # Banco no schema original (migração 1), com as tarefas 7 e 8 já excluídas
+        with closing(sqlite3.connect(self.caminho)) as conn:
+            model._migracao_001_tabela(conn.cursor())
+            conn.executemany("INSERT INTO tarefas (titulo) VALUES (?)", [(f"t{i}",) for i in range(8)])
+            conn.execute("DELETE FROM tarefas WHERE id > 6")
+            conn.commit()
+
+    def _sequencia(self, conn: sqlite3.Connection) -> list:
+        return conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tarefas'").fetchall()
+
+    def test_migracao_preserva_sequencia_sem_duplicar(self):
+        with closing(sqlite3.connect(self.caminho)) as conn:
+            self.assertEqual(model.aplicar_migracoes(conn), model.MIGRACOES[-1][0])
+            self.assertEqual(self._sequencia(conn), [(8,)])
+            conn.execute("INSERT INTO tarefas (titulo) VALUES ('nova')")
+            self.assertEqual(conn.execute("SELECT MAX(id) FROM tarefas").fetchone(), (9,))
+            self.assertEqual(self._sequencia(conn), [(9,)])
+
+    def test_remove_linha_duplicada_de_bancos_ja_migrados(self):
+        with closing(sqlite3.connect(self.caminho)) as conn:
+            model.aplicar_migracoes(conn)
+            # Estado deixado pela migração 5 antes da correção
+            conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('tarefas', 12)")
+            conn.execute("DELETE FROM schema_version WHERE versao = 10")
+            conn.commit()
+            model.aplicar_migracoes(conn)
+            self.assertEqual(self._sequencia(conn), [(12,)])
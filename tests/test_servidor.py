@@ -0,0 +1,52 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import config
+import controller
+import servidor
+
+from tests import TesteComBanco
+
+class TesteValidacaoCorpo(TesteComBanco):
+
+    def setUp(self):
+        super().setUp()
+        self.servidor = servidor.criar_servidor(porta=0)
+        self.addCleanup(lambda: asyncio.run(self.servidor.encerrar()))
+
+    def _requisitar(self, metodo: str, alvo: str, corpo: dict):
+        return asyncio.run(self.servidor._despachar(metodo, alvo, json.dumps(corpo).encode()))
+
+    def test_campos_que_nao_sao_texto_geram_400(self):
+        id = controller.adicionar_tarefa("existente")
+        casos = [
+            ("POST", "/tarefas", {"titulo": 5}),
+            ("POST", "/tarefas", {"titulo": "a", "descricao": {"x": 1}}),
+            ("POST", "/lote/tarefas", {"tarefas": [{"titulo": "a"}, {"titulo": ["b"]}]}),
+            ("PATCH", f"/tarefas/{id}", {"titulo": 5}),
+            ("PATCH", f"/tarefas/{id}", {"descricao": 1.5}),
+            ("PATCH", f"/tarefas/{id}", {"status": {"a": 1}}),
+        ]
+        for metodo, alvo, corpo in casos:
+            with self.subTest(metodo=metodo, corpo=corpo):
+                codigo, resposta = self._requisitar(metodo, alvo, corpo)
+                self.assertEqual(codigo, HTTPStatus.BAD_REQUEST, resposta)
+        self.assertEqual([t.titulo for t in controller.listar()], ["existente"])
+
+    def test_descricao_nula_continua_aceita(self):
+        codigo, resposta = self._requisitar("POST", "/tarefas", {"titulo": "a", "descricao": None})
+        self.assertEqual(codigo, HTTPStatus.CREATED)
+        self.assertEqual(controller.buscar_tarefa(resposta["id"]).descricao, "")
+
+    def test_limite_fora_da_faixa_gera_400(self):
+        controller.adicionar_tarefas_em_lote(["tarefa 1", "tarefa 2", "tarefa 3"])
+        maximo = config.SERVER_CONFIG['max_limit']
+        for rota in ("/tarefas?limite={}", "/busca?q=tarefa&limite={}"):
+            for limite in (maximo + 1, 100000000, 0, -1):
+                with self.subTest(rota=rota, limite=limite):
+                    codigo, resposta = self._requisitar("GET", rota.format(limite), {})
+                    self.assertEqual(codigo, HTTPStatus.BAD_REQUEST, resposta)
+            codigo, resposta = self._requisitar("GET", rota.format(maximo), {})
+            self.assertEqual(codigo, HTTPStatus.OK, resposta)
+            self.assertEqual(len(resposta["tarefas"]), 3)
@@ -0,0 +1,49 @@
+import controller
+
+from tests import TesteComBanco
+
+class TesteAtualizarCampos(TesteComBanco):
+
+    def setUp(self):
+        super().setUp()
+        self.id = controller.adicionar_tarefa("título", "descrição")
+        self.tarefa = controller.buscar_tarefa(self.id)
+
+    def test_atualiza_so_os_campos_pedidos(self):
+        atualizada = controller.atualizar_campos(self.id, self.tarefa.versao, status="concluida")
+        self.assertEqual((atualizada.titulo, atualizada.descricao, atualizada.status),
+                         ("título", "descrição", controller.Status.CONCLUIDA))
+        self.assertEqual(atualizada.versao, self.tarefa.versao + 1)
+        self.assertEqual(controller.buscar_tarefa(self.id), atualizada)
+
+    def test_versao_desatualizada_gera_conflito(self):
+        controller.atualizar_campos(self.id, self.tarefa.versao, titulo="primeiro")
+        with self.assertRaises(controller.ConflitoVersao) as erro:
+            controller.atualizar_campos(self.id, self.tarefa.versao, descricao="segundo")
+        self.assertEqual((erro.exception.esperada, erro.exception.atual),
+                         (self.tarefa.versao, self.tarefa.versao + 1))
+        atual = controller.buscar_tarefa(self.id)
+        self.assertEqual((atual.titulo, atual.descricao), ("primeiro", "descrição"))
+
+    def test_sem_versao_sempre_grava(self):
+        controller.atualizar_campos(self.id, titulo="a")
+        self.assertEqual(controller.atualizar_campos(self.id, titulo="b").versao, self.tarefa.versao + 2)
+
+    def test_tarefa_inexistente(self):
+        self.assertIsNone(controller.atualizar_campos(self.id + 1, 1, titulo="x"))
+
+    def test_campos_invalidos(self):
+        for campos in ({}, {'titulo': "  "}, {'prioridade': 1}, {'status': "talvez"}):
+            with self.subTest(campos=campos), self.assertRaises(ValueError):
+                controller.atualizar_campos(self.id, self.tarefa.versao, **campos)
+        self.assertEqual(controller.buscar_tarefa(self.id).versao, self.tarefa.versao)
+
+    def test_lote_conta_so_o_que_mudou(self):
+        outro = controller.adicionar_tarefa("outra")
+        controller.concluir(outro)
+        versao_outro = controller.buscar_tarefa(outro).versao
+        afetadas = controller.atualizar_status_em_lote([self.id, self.id, outro], "concluida")
+        self.assertEqual(afetadas, 1)
+        self.assertEqual(controller.buscar_tarefa(self.id).versao, self.tarefa.versao + 1)
+        self.assertEqual(controller.buscar_tarefa(outro).versao, versao_outro)
+        self.assertEqual(controller.deletar_em_lote([self.id, self.id, outro]), 2)